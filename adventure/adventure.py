@@ -1,17 +1,18 @@
 # -*- coding: utf-8 -*-
 import asyncio
 import contextlib
-import json
 import logging
 import os
 import random
 import re
 import time
-from datetime import date, datetime, timedelta
+from copy import copy
+from datetime import date, datetime
+from functools import partial
 from math import ceil
 from operator import itemgetter
 from types import SimpleNamespace
-from typing import List, Literal, MutableMapping, Optional, Union
+from typing import Dict, List, Literal, MutableMapping, Optional, Sequence, Set, Union
 
 import discord
 from beautifultable import ALIGN_LEFT, BeautifulTable
@@ -31,6 +32,8 @@ from redbot.core.utils.predicates import MessagePredicate, ReactionPredicate
 
 import adventure.charsheet
 from . import bank
+from .bulk import INITIAL_MAX_ROLL, MAX_CHEST_LUCK, chest_rarities, chest_rarity, disassemble, sell_total
+from .cache import AdventureSettlement, CharacterCache, SettingsCache
 from .charsheet import (
     DEV_LIST,
     ORDER,
@@ -54,9 +57,12 @@ from .charsheet import (
     can_equip,
     equip_level,
     has_funds,
+    intern_item_db,
     no_dev_prompt,
     parse_timedelta,
 )
+from .leaderboard import Leaderboards
+from .locks import LockRegistry, current_command
 from .menus import (
     BackpackMenu,
     BaseMenu,
@@ -68,6 +74,11 @@ from .menus import (
     SimpleSource,
     WeeklyScoreboardSource,
 )
+from .migration import MigrationJob
+from .paginator import TablePaginator
+from .roster import MonsterRoster
+from .scheduler import TimerScheduler
+from .themes import AffixTables, is_valid, load_bundle, resolve_theme_files
 
 _ = Translator("Adventure", __file__)
 
@@ -78,6 +89,8 @@ REBIRTH_STEP = 10
 _SCHEMA_VERSION = 4
 _config: Config = None
 TaxesConverter = get_dict_converter(delims=[" ", ",", ";"])
+# Seconds after which an adventure session that never finished is dropped.
+SESSION_TIMEOUT = 6 * 60
 
 
 async def smart_embed(ctx, message, success=None, image=None):
@@ -239,7 +252,10 @@ class Adventure(commands.Cog):
     async def red_delete_data_for_user(
         self, *, requester: Literal["discord", "owner", "user", "user_strict"], user_id: int,
     ):
-        await self.config.user_from_id(user_id).clear()
+        async with self.locks.get(user_id):
+            self._character_cache.invalidate(user_id)
+            self._leaderboards.remove(user_id)
+            await self.config.user_from_id(user_id).clear()
         await bank._config.user_from_id(
             user_id
         ).clear()  # This will only ever touch the separate currency, leaving bot economy to be handled by core.
@@ -319,12 +335,20 @@ class Adventure(commands.Cog):
         self._current_traders = {}
         self._curent_trader_stock = {}
         self._sessions: MutableMapping[int, GameSession] = {}
-        self._react_messaged = []
+        # User ID -> sessions the user has joined. Entries for sessions that have
+        # ended or that the user left are ignored and purged when the session expires.
+        self._participants: Dict[int, Set[GameSession]] = {}
+        self._react_messaged: Set[str] = set()
         self.tasks = {}
-        self.locks: MutableMapping[int, asyncio.Lock] = {}
-        self.gb_task = None
+        self._scheduler = TimerScheduler()
 
         self.config = Config.get_conf(self, 2_710_801_001, force_registration=True)
+        self._character_cache = CharacterCache(self.config)
+        self.locks = LockRegistry(self._character_cache)
+        self._settings = SettingsCache(self.config)
+        self._leaderboards = Leaderboards()
+        self._migration = MigrationJob(self.config, self._character_cache, self.locks)
+        self._character_cache.on_save = self._leaderboards.update
         self._daily_bonus = {}
         self._separate_economy = None
 
@@ -400,14 +424,17 @@ class Adventure(commands.Cog):
             "max_allowed_withdraw": 50000,
             "disallow_withdraw": False,
             "easy_mode": False,
+            "migration": {"version": 0, "last_user": 0, "migrated": 0, "changed": 0, "done": False},
         }
         self.RAISINS: list = None
         self.THREATEE: list = None
         self.TR_GEAR_SET: dict = None
+        self._affixes: AffixTables = None
         self.ATTRIBS: dict = None
         self.MONSTERS: dict = None
         self.AS_MONSTERS: dict = None
         self.MONSTER_NOW: dict = None
+        self._monster_rosters: Dict[str, MonsterRoster] = {}
         self.LOCATIONS: list = None
         self.PETS: dict = None
 
@@ -421,7 +448,9 @@ class Adventure(commands.Cog):
 
     async def cog_before_invoke(self, ctx: commands.Context):
         await self._ready_event.wait()
+        current_command.set(ctx.command.qualified_name)
         if ctx.author.id in self.locks and self.locks[ctx.author.id].locked():
+            self.locks.reject(ctx.author.id)
             raise CheckFailure(f"There's an active lock for this user ({ctx.author.id})")
         return True
 
@@ -437,103 +466,51 @@ class Adventure(commands.Cog):
             _config = self.config
             theme = await self.config.theme()
             self._separate_economy = await self.config.separate_economy()
-            if theme in {"default"}:
-                get_path = bundled_data_path
-            else:
-                get_path = cog_data_path
-
-            as_monster_fp = get_path(self) / f"{theme}" / "as_monsters.json"
-            attribs_fp = get_path(self) / f"{theme}" / "attribs.json"
-            locations_fp = get_path(self) / f"{theme}" / "locations.json"
-            monster_fp = get_path(self) / f"{theme}" / "monsters.json"
-            pets_fp = get_path(self) / f"{theme}" / "pets.json"
-            raisins_fp = get_path(self) / f"{theme}" / "raisins.json"
-            threatee_fp = get_path(self) / f"{theme}" / "threatee.json"
-            tr_set_fp = get_path(self) / f"{theme}" / "tr_set.json"
-            prefixes_fp = get_path(self) / f"{theme}" / "prefixes.json"
-            materials_fp = get_path(self) / f"{theme}" / "materials.json"
-            equipment_fp = get_path(self) / f"{theme}" / "equipment.json"
-            suffixes_fp = get_path(self) / f"{theme}" / "suffixes.json"
-            set_bonuses = get_path(self) / f"{theme}" / "set_bonuses.json"
-            files = {
-                "pets": pets_fp,
-                "attr": attribs_fp,
-                "monster": monster_fp,
-                "location": locations_fp,
-                "raisins": raisins_fp,
-                "threatee": threatee_fp,
-                "set": tr_set_fp,
-                "as_monsters": as_monster_fp,
-                "prefixes": prefixes_fp,
-                "materials": materials_fp,
-                "equipment": equipment_fp,
-                "suffixes": suffixes_fp,
-                "set_bonuses": set_bonuses,
-            }
-            for (name, file) in files.items():
-                if not file.exists():
-                    files[name] = bundled_data_path(self) / "default" / f"{file.name}"
-
-            with files["pets"].open("r") as f:
-                self.PETS = json.load(f)
-            with files["attr"].open("r") as f:
-                self.ATTRIBS = json.load(f)
-            with files["monster"].open("r") as f:
-                self.MONSTERS = json.load(f)
-            with files["as_monsters"].open("r") as f:
-                self.AS_MONSTERS = json.load(f)
-            with files["location"].open("r") as f:
-                self.LOCATIONS = json.load(f)
-            with files["raisins"].open("r") as f:
-                self.RAISINS = json.load(f)
-            with files["threatee"].open("r") as f:
-                self.THREATEE = json.load(f)
-            with files["set"].open("r") as f:
-                self.TR_GEAR_SET = json.load(f)
-            with files["prefixes"].open("r") as f:
-                self.PREFIXES = json.load(f)
-            with files["materials"].open("r") as f:
-                self.MATERIALS = json.load(f)
-            with files["equipment"].open("r") as f:
-                self.EQUIPMENT = json.load(f)
-            with files["suffixes"].open("r") as f:
-                self.SUFFIXES = json.load(f)
-            with files["set_bonuses"].open("r") as f:
-                self.SET_BONUSES = json.load(f)
-
-            if not all(
-                i
-                for i in [
-                    len(self.PETS) > 0,
-                    len(self.ATTRIBS) > 0,
-                    len(self.MONSTERS) > 0,
-                    len(self.LOCATIONS) > 0,
-                    len(self.RAISINS) > 0,
-                    len(self.THREATEE) > 0,
-                    len(self.TR_GEAR_SET) > 0,
-                    len(self.PREFIXES) > 0,
-                    len(self.MATERIALS) > 0,
-                    len(self.EQUIPMENT) > 0,
-                    len(self.SUFFIXES) > 0,
-                    len(self.SET_BONUSES) > 0,
-                ]
-            ):
+            if not await self._load_theme(theme):
                 log.critical(f"{theme} theme is invalid, resetting it to the default theme.")
                 await self.config.theme.set("default")
+                self._settings.forget("theme")
                 await self.initialize()
                 return
-            adventure.charsheet.TR_GEAR_SET = self.TR_GEAR_SET
-            adventure.charsheet.PETS = self.PETS
             adventure.charsheet.REBIRTH_LVL = REBIRTH_LVL
             adventure.charsheet.REBIRTH_STEP = REBIRTH_STEP
-            adventure.charsheet.SET_BONUSES = self.SET_BONUSES
             await self._migrate_config(from_version=await self.config.schema_version(), to_version=_SCHEMA_VERSION)
             self._daily_bonus = await self.config.daily_bonus.all()
+            if not self._leaderboards.ready:
+                await self._leaderboards.build(await self.config.all_users())
+            self._migration.start(self._leaderboards.user_ids())
         except Exception as err:
             log.exception("There was an error starting up the cog", exc_info=err)
         else:
             self._ready_event.set()
-            self.gb_task = self.bot.loop.create_task(self._garbage_collection())
+            self._scheduler.start()
+            self._character_cache.start()
+
+    async def _load_theme(self, theme: str) -> bool:
+        """Load a theme's data, from its compiled bundle when the bundle is current.
+
+        Files the theme doesn't provide come from the default theme. Returns False and
+        keeps the current theme loaded if the theme is invalid.
+        """
+        theme_path = (bundled_data_path(self) if theme in {"default"} else cog_data_path(self)) / theme
+        files = resolve_theme_files(theme_path, bundled_data_path(self) / "default")
+        bundle_path = cog_data_path(self) / "theme_bundles" / f"{theme}.json"
+        data, cached, elapsed = await self.bot.loop.run_in_executor(None, load_bundle, files, bundle_path)
+        if not is_valid(data):
+            return False
+        for (name, value) in data.items():
+            setattr(self, name, value)
+        self.TR_GEAR_SET = intern_item_db(self.TR_GEAR_SET)
+        self._affixes = AffixTables(self.PREFIXES, self.MATERIALS, self.EQUIPMENT, self.SUFFIXES, self.TR_GEAR_SET)
+        self._monster_rosters = {}
+        adventure.charsheet.TR_GEAR_SET = self.TR_GEAR_SET
+        adventure.charsheet.PETS = self.PETS
+        adventure.charsheet.SET_BONUSES = self.SET_BONUSES
+        adventure.charsheet.gear_stats.cache_clear()
+        log.info(
+            "Loaded the %s theme in %.1fms (%s)", theme, elapsed * 1000, "warm bundle" if cached else "cold, compiled"
+        )
+        return True
 
     async def cleanup_tasks(self):
         await self._ready_event.wait()
@@ -544,6 +521,7 @@ class Adventure(commands.Cog):
                     to_delete.append(msg_id)
             for task in to_delete:
                 del self.tasks[task]
+            self.locks.evict()
             await asyncio.sleep(300)
 
     async def _migrate_config(self, from_version: int, to_version: int) -> None:
@@ -680,17 +658,10 @@ class Adventure(commands.Cog):
 
     def in_adventure(self, ctx=None, user=None):
         author = user or ctx.author
-        sessions = self._sessions
-        if not sessions:
-            return False
-        participants_ids = set(
-            [
-                p.id
-                for _loop, session in self._sessions.items()
-                for p in [*session.fight, *session.magic, *session.pray, *session.talk, *session.run,]
-            ]
+        return any(
+            session.action_of(author) is not None and self._sessions.get(session.guild.id) is session
+            for session in self._participants.get(author.id, ())
         )
-        return bool(author.id in participants_ids)
 
     async def allow_in_dm(self, ctx):
         """Checks if the bank is global and allows the command in dm."""
@@ -699,9 +670,21 @@ class Adventure(commands.Cog):
         return bool(ctx.guild is None and await bank.is_global())
 
     def get_lock(self, member: discord.User):
-        if member.id not in self.locks:
-            self.locks[member.id] = asyncio.Lock()
-        return self.locks[member.id]
+        return self.locks.get(member.id)
+
+    async def get_character(self, user: discord.User, projected: bool = False) -> Character:
+        """Load a character sheet, served from the write-behind cache when possible.
+
+        Pass ``projected=True`` when the backpack and loadouts aren't needed; only
+        the rest of the sheet is read and saving it writes back just that part.
+        """
+        if projected:
+            return await self._character_cache.load_projected(user, self._daily_bonus)
+        return await self._character_cache.load(user, self._daily_bonus)
+
+    async def save_character(self, user: discord.User, character: Character) -> None:
+        """Save a character sheet; it is written to Config on the next cache flush."""
+        await self._character_cache.save(user, character)
 
     @staticmethod
     def escape(t: str) -> str:
@@ -718,75 +701,70 @@ class Adventure(commands.Cog):
 
     async def _genitem(self, rarity: str = None, slot: str = None):
         """Generate an item."""
+        return (await self._genitems(rarity, 1, slot))[0]
+
+    async def _genitems(self, rarity: str, amount: int, slot: str = None) -> List[Item]:
+        """Generate ``amount`` items of one rarity, drawing from the theme's affix tables."""
+        if amount <= 0:
+            return []
+        tables = self._affixes
         if rarity == "set":
-            items = list(self.TR_GEAR_SET.items())
-            items = (
-                [
-                    i
-                    for i in items
-                    if i[1]["slot"] == [slot] or (slot == "two handed" and i[1]["slot"] == ["left", "right"])
-                ]
-                if slot
-                else items
-            )
-            item_name, item_data = random.choice(items)
-            return Item.from_json({item_name: item_data})
+            items = tables.set_items_for(slot)
+            return [Item.from_json({item_name: item_data}) for (item_name, item_data) in random.choices(items, k=amount)]
 
-        RARE_INDEX = RARITIES.index("rare")
-        EPIC_INDEX = RARITIES.index("epic")
         PREFIX_CHANCE = {"rare": 0.5, "epic": 0.75, "legendary": 0.9, "ascended": 1.0, "set": 0}
         SUFFIX_CHANCE = {"epic": 0.5, "legendary": 0.75, "ascended": 0.5}
 
         if rarity not in RARITIES:
             rarity = "normal"
-        if slot is None:
-            slot = random.choice(ORDER)
-        name = ""
-        stats = {"att": 0, "cha": 0, "int": 0, "dex": 0, "luck": 0}
-
-        def add_stats(word_stats):
-            """Add stats in word's dict to local stats dict."""
-            for stat in stats.keys():
-                if stat in word_stats:
-                    stats[stat] += word_stats[stat]
-
-        # only rare and above should have prefix with PREFIX_CHANCE
-        if RARITIES.index(rarity) >= RARE_INDEX and random.random() <= PREFIX_CHANCE[rarity]:
-            #  log.debug(f"Prefix %: {PREFIX_CHANCE[rarity]}")
-            prefix, prefix_stats = random.choice(list(self.PREFIXES.items()))
-            name += f"{prefix} "
-            add_stats(prefix_stats)
-
-        material, material_stat = random.choice(list(self.MATERIALS[rarity].items()))
-        name += f"{material} "
-        for stat in stats.keys():
-            stats[stat] += material_stat
-
-        equipment, equipment_stats = random.choice(list(self.EQUIPMENT[slot].items()))
-        name += f"{equipment}"
-        add_stats(equipment_stats)
-
-        # only epic and above should have suffix with SUFFIX_CHANCE
-        if RARITIES.index(rarity) >= EPIC_INDEX and random.random() <= SUFFIX_CHANCE[rarity]:
-            #  log.debug(f"Suffix %: {SUFFIX_CHANCE[rarity]}")
-            suffix, suffix_stats = random.choice(list(self.SUFFIXES.items()))
-            of_keyword = "of" if "the" not in suffix_stats else "of the"
-            name += f" {of_keyword} {suffix}"
-            add_stats(suffix_stats)
-
-        slot_list = [slot] if slot != "two handed" else ["left", "right"]
-        return Item(
-            name=name,
-            slot=slot_list,
-            rarity=rarity,
-            att=stats["att"],
-            int=stats["int"],
-            cha=stats["cha"],
-            dex=stats["dex"],
-            luck=stats["luck"],
-            owned=1,
-            parts=1,
-        )
+        has_prefix = RARITIES.index(rarity) >= RARITIES.index("rare")
+        has_suffix = RARITIES.index(rarity) >= RARITIES.index("epic")
+        prefixes = tables.prefixes
+        suffixes = tables.suffixes
+        materials = tables.materials[rarity]
+        equipment = tables.equipment
+        slots = [slot] * amount if slot is not None else random.choices(ORDER, k=amount)
+
+        items = []
+        async for item_slot in AsyncIter(slots, steps=100):
+            name = ""
+            stats = {"att": 0, "cha": 0, "int": 0, "dex": 0, "luck": 0}
+            words = []
+            if has_prefix and random.random() <= PREFIX_CHANCE[rarity]:
+                prefix, prefix_stats = random.choice(prefixes)
+                name += f"{prefix} "
+                words.append(prefix_stats)
+            material, material_stat = random.choice(materials)
+            name += f"{material} "
+            for stat in stats:
+                stats[stat] += material_stat
+            equipment_name, equipment_stats = random.choice(equipment[item_slot])
+            name += f"{equipment_name}"
+            words.append(equipment_stats)
+            if has_suffix and random.random() <= SUFFIX_CHANCE[rarity]:
+                suffix, suffix_stats = random.choice(suffixes)
+                of_keyword = "of" if "the" not in suffix_stats else "of the"
+                name += f" {of_keyword} {suffix}"
+                words.append(suffix_stats)
+            for word_stats in words:
+                for stat in stats:
+                    if stat in word_stats:
+                        stats[stat] += word_stats[stat]
+            items.append(
+                Item(
+                    name=name,
+                    slot=[item_slot] if item_slot != "two handed" else ["left", "right"],
+                    rarity=rarity,
+                    att=stats["att"],
+                    int=stats["int"],
+                    cha=stats["cha"],
+                    dex=stats["dex"],
+                    luck=stats["luck"],
+                    owned=1,
+                    parts=1,
+                )
+            )
+        return items
 
     @commands.command()
     @commands.is_owner()
@@ -805,13 +783,13 @@ class Adventure(commands.Cog):
             return await smart_embed(ctx, _("Invalid slot; choose one of {list}.").format(list=humanize_list(ORDER)))
         async with self.get_lock(user):
             try:
-                c = await Character.from_json(self.config, user, self._daily_bonus)
+                c = await self.get_character(user)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
             for _loop_counter in range(num):
                 await c.add_to_backpack(await self._genitem(rarity, slot))
-            await self.config.user(ctx.author).set(await c.to_json(self.config))
+            await self.save_character(ctx.author, c)
         await ctx.invoke(self._backpack)
 
     @commands.command()
@@ -822,8 +800,9 @@ class Adventure(commands.Cog):
 
         Note this overrides your current data.
         """
+        await self._character_cache.flush(user_id)
         user_data = await self.config.user_from_id(user_id).all()
-        await self.config.user(ctx.author).set(user_data)
+        self._character_cache.set_data(ctx.author.id, user_data)
         await ctx.tick()
 
     @commands.command(name="ebackpack")
@@ -848,7 +827,7 @@ class Adventure(commands.Cog):
             return await smart_embed(ctx, _("This command is not available in DM's on this bot."))
         if not ctx.invoked_subcommand:
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -898,7 +877,7 @@ class Adventure(commands.Cog):
         if not await self.allow_in_dm(ctx):
             return await smart_embed(ctx, _("This command is not available in DM's on this bot."))
         try:
-            c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+            c = await self.get_character(ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             return
@@ -931,7 +910,7 @@ class Adventure(commands.Cog):
         query.pop("degrade", None)  # Disallow selling by degrade levels
         async with self.get_lock(ctx.author):
             try:
-                character = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                character = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -972,29 +951,19 @@ class Adventure(commands.Cog):
                 index = min(RARITIES.index(item.rarity), 4)
                 disassembled.add(item.name)
                 owned = item.owned
-                async for _loop_counter in AsyncIter(range(0, owned), steps=100):
-                    if character.heroclass["name"] != "Tinkerer":
-                        roll = random.randint(0, 5)
-                        chests = 1
-                    else:
-                        roll = random.randint(0, 3)
-                        chests = random.randint(1, 2)
-                    if roll != 0:
-                        item.owned -= 1
-                        if item.owned <= 0 and item.name in character.backpack:
-                            del character.backpack[item.name]
-                        failed += 1
-                    else:
-                        item.owned -= 1
-                        if item.owned <= 0 and item.name in character.backpack:
-                            del character.backpack[item.name]
-                        character.treasure[index] += chests
-                        success += 1
+                if owned > 0:
+                    (succeeded, chests) = disassemble(owned, character.heroclass["name"] == "Tinkerer")
+                    item.owned -= owned
+                    if item.name in character.backpack:
+                        del character.backpack[item.name]
+                    character.treasure[index] += chests
+                    success += succeeded
+                    failed += owned - succeeded
         if (not failed) and (not success):
             return await smart_embed(ctx, _("No items matched your query.").format(),)
         else:
 
-            await self.config.user(ctx.author).set(await character.to_json(self.config))
+            await self.save_character(ctx.author, character)
             return await smart_embed(
                 ctx,
                 _("You attempted to disassemble multiple items: {succ} were successful and {fail} failed.").format(
@@ -1019,7 +988,7 @@ class Adventure(commands.Cog):
         query.pop("degrade", None)  # Disallow selling by degrade levels
         async with self.get_lock(ctx.author):
             try:
-                character = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                character = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -1048,10 +1017,10 @@ class Adventure(commands.Cog):
                     async for item_name, item in AsyncIter(slot_group, steps=100):
                         old_owned = item.owned
                         item_price = 0
-                        async for _loop_counter in AsyncIter(range(0, old_owned), steps=100):
-                            item.owned -= 1
-                            item_price += self._sell(character, item)
-                            if item.owned <= 0 and item.name in character.backpack:
+                        if old_owned > 0:
+                            item_price = self._sell(character, item, amount=old_owned)
+                            item.owned -= old_owned
+                            if item.name in character.backpack:
                                 del character.backpack[item.name]
                         item_price = max(item_price, 0)
                         msg += _("{old_item} sold for {price}.\n").format(
@@ -1065,7 +1034,7 @@ class Adventure(commands.Cog):
                         await bank.set_balance(ctx.author, e.max_balance)
                 character.last_known_currency = await bank.get_balance(ctx.author)
                 character.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await character.to_json(self.config))
+                await self.save_character(ctx.author, character)
             if total_price == 0:
                 return await smart_embed(ctx, _("No items matched your query.").format(),)
             if msg:
@@ -1110,7 +1079,7 @@ class Adventure(commands.Cog):
             return await smart_embed(ctx, _("This command is not available in DM's on this bot."))
         if not ctx.invoked_subcommand:
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -1148,7 +1117,7 @@ class Adventure(commands.Cog):
             )
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -1185,7 +1154,7 @@ class Adventure(commands.Cog):
                     )
                 await ctx.send(equip_msg)
                 c = await c.equip_item(equip, True, self.is_dev(ctx.author))  # FIXME:
-                await self.config.user(ctx.author).set(await c.to_json(self.config))
+                await self.save_character(ctx.author, c)
 
     @_backpack.command(name="eset", cooldown_after_parsing=True)
     @commands.cooldown(rate=1, per=600, type=commands.BucketType.user)
@@ -1204,7 +1173,7 @@ class Adventure(commands.Cog):
             )
         async with self.get_lock(ctx.author):
             try:
-                character = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                character = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 ctx.command.reset_cooldown(ctx)
@@ -1218,7 +1187,7 @@ class Adventure(commands.Cog):
                 )
             for piece in pieces:
                 character = await character.equip_item(piece, from_backpack=True)
-            await self.config.user(ctx.author).set(await character.to_json(self.config))
+            await self.save_character(ctx.author, character)
             await smart_embed(
                 ctx,
                 _("I've equipped all pieces of `{set_name}` that you are able to equip.").format(set_name=set_name),
@@ -1257,7 +1226,7 @@ class Adventure(commands.Cog):
                     return
 
             try:
-                character = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                character = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -1286,7 +1255,7 @@ class Adventure(commands.Cog):
                         item.owned -= 1
                         if item.owned <= 0:
                             del character.backpack[item.name]
-                        await self.config.user(ctx.author).set(await character.to_json(self.config))
+                        await self.save_character(ctx.author, character)
                         return await smart_embed(
                             ctx,
                             _("Your attempt at disassembling `{}` failed and it has been destroyed.").format(item.name),
@@ -1296,7 +1265,7 @@ class Adventure(commands.Cog):
                         if item.owned <= 0:
                             del character.backpack[item.name]
                         character.treasure[index] += chests
-                        await self.config.user(ctx.author).set(await character.to_json(self.config))
+                        await self.save_character(ctx.author, character)
                         return await smart_embed(
                             ctx,
                             _("Your attempt at disassembling `{}` was successful and you have received {} {}.").format(
@@ -1306,25 +1275,15 @@ class Adventure(commands.Cog):
                 elif op == "all":
                     disassembled.add(item.name)
                     owned = item.owned
-                    async for _loop_counter in AsyncIter(range(0, owned), steps=100):
-                        if character.heroclass["name"] != "Tinkerer":
-                            roll = random.randint(0, 5)
-                            chests = 1
-                        else:
-                            roll = random.randint(0, 3)
-                            chests = random.randint(1, 2)
-                        if roll != 0:
-                            item.owned -= 1
-                            if item.owned <= 0 and item.name in character.backpack:
-                                del character.backpack[item.name]
-                            failed += 1
-                        else:
-                            item.owned -= 1
-                            if item.owned <= 0 and item.name in character.backpack:
-                                del character.backpack[item.name]
-                            character.treasure[index] += chests
-                            success += 1
-            await self.config.user(ctx.author).set(await character.to_json(self.config))
+                    if owned > 0:
+                        (succeeded, chests) = disassemble(owned, character.heroclass["name"] == "Tinkerer")
+                        item.owned -= owned
+                        if item.name in character.backpack:
+                            del character.backpack[item.name]
+                        character.treasure[index] += chests
+                        success += succeeded
+                        failed += owned - succeeded
+            await self.save_character(ctx.author, character)
             return await smart_embed(
                 ctx,
                 _("You attempted to disassemble multiple items: {succ} were successful and {fail} failed.").format(
@@ -1388,7 +1347,7 @@ class Adventure(commands.Cog):
 
             msg = ""
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -1406,11 +1365,10 @@ class Adventure(commands.Cog):
                             continue
                     item_price = 0
                     old_owned = item.owned
-                    async for _loop_counter in AsyncIter(range(0, old_owned), steps=100):
-                        item.owned -= 1
-                        item_price += self._sell(c, item)
-                        if item.owned <= 0:
-                            del c.backpack[item.name]
+                    if old_owned > 0:
+                        item_price = self._sell(c, item, amount=old_owned)
+                        item.owned -= old_owned
+                        del c.backpack[item.name]
                     item_price = max(item_price, 0)
                     msg += _("{old_item} sold for {price}.\n").format(
                         old_item=str(old_owned) + " " + str(item), price=humanize_number(item_price),
@@ -1423,7 +1381,7 @@ class Adventure(commands.Cog):
                         await bank.set_balance(ctx.author, e.max_balance)
                 c.last_known_currency = await bank.get_balance(ctx.author)
                 c.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await c.to_json(self.config))
+                await self.save_character(ctx.author, c)
         msg_list = []
         new_msg = _("{author} sold all their{rarity} items for {price}.\n\n{items}").format(
             author=self.escape(ctx.author.display_name),
@@ -1460,7 +1418,7 @@ class Adventure(commands.Cog):
         lock = self.get_lock(ctx.author)
         await lock.acquire()
         try:
-            c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+            c = await self.get_character(ctx.author)
         except Exception as exc:
             ctx.command.reset_cooldown(ctx)
             log.exception("Error with the new character sheet", exc_info=exc)
@@ -1531,15 +1489,10 @@ class Adventure(commands.Cog):
                 ctx.command.reset_cooldown(ctx)
                 price = 0
                 old_owned = item.owned
-                count = 0
-                for _loop_counter in range(0, item.owned):
-                    item.owned -= 1
-                    price += price_shown
-                    if item.owned <= 0:
-                        del character.backpack[item.name]
-                    if not count % 10:
-                        await asyncio.sleep(0.1)
-                    count += 1
+                if old_owned > 0:
+                    price = price_shown * old_owned
+                    item.owned -= old_owned
+                    del character.backpack[item.name]
                 msg += _("**{author}** sold all their {old_item} for {price} {currency_name}.\n").format(
                     author=self.escape(ctx.author.display_name),
                     old_item=box(str(item) + " - " + str(old_owned), lang="css"),
@@ -1560,13 +1513,9 @@ class Adventure(commands.Cog):
                     return await smart_embed(ctx, _("You already only own one of those items."))
                 price = 0
                 old_owned = item.owned
-                count = 0
-                for _loop_counter in range(1, item.owned):
-                    item.owned -= 1
-                    price += price_shown
-                if not count % 10:
-                    await asyncio.sleep(0.1)
-                count += 1
+                if old_owned > 1:
+                    price = price_shown * (old_owned - 1)
+                    item.owned = 1
                 if price != 0:
                     msg += _("**{author}** sold all but one of their {old_item} for {price} {currency_name}.\n").format(
                         author=self.escape(ctx.author.display_name),
@@ -1590,7 +1539,7 @@ class Adventure(commands.Cog):
         if msg:
             character.last_known_currency = await bank.get_balance(ctx.author)
             character.last_currency_check = time.time()
-            await self.config.user(ctx.author).set(await character.to_json(self.config))
+            await self.save_character(ctx.author, character)
             pages = [page for page in pagify(msg, delims=["\n"], page_length=1900)]
             await BaseMenu(
                 source=SimpleSource(pages), delete_message_after=True, clear_reactions_after=True, timeout=60,
@@ -1618,12 +1567,12 @@ class Adventure(commands.Cog):
                 ),
             )
         try:
-            c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+            c = await self.get_character(ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             return
         try:
-            buy_user = await Character.from_json(self.config, buyer, self._daily_bonus)
+            buy_user = await self.get_character(buyer)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             return
@@ -1710,61 +1659,81 @@ class Adventure(commands.Cog):
                 except asyncio.TimeoutError:
                     await self._clear_react(trade_msg)
                     return
-                if pred.result:  # buyer reacted with Yes.
-                    with contextlib.suppress(discord.errors.NotFound):
-                        if await bank.can_spend(buyer, asking):
-                            if buy_user.rebirths + 1 < c.rebirths:
-                                return await smart_embed(
-                                    ctx,
-                                    _(
-                                        "You can only trade with people that are the same "
-                                        "rebirth level, one rebirth level less than you, "
-                                        "or a higher rebirth level than yours."
-                                    ),
-                                )
-                            try:
-                                await bank.transfer_credits(buyer, ctx.author, asking)
-                            except BalanceTooHigh as e:
-                                await bank.withdraw_credits(buyer, asking)
-                                await bank.set_balance(ctx.author, e.max_balance)
-                            c.backpack[item.name].owned -= 1
-                            newly_owned = c.backpack[item.name].owned
-                            if c.backpack[item.name].owned <= 0:
-                                del c.backpack[item.name]
-                            async with self.get_lock(buyer):
-                                if item.name in buy_user.backpack:
-                                    buy_user.backpack[item.name].owned += 1
-                                else:
-                                    item.owned = 1
-                                    buy_user.backpack[item.name] = item
-                                await self.config.user(buyer).set(await buy_user.to_json(self.config))
-                                item.owned = newly_owned
-                                await self.config.user(ctx.author).set(await c.to_json(self.config))
-
-                            await trade_msg.edit(
-                                content=(
-                                    box(
-                                        _("\n{author} traded {item} to {buyer} for {asking} {currency_name}.").format(
-                                            author=self.escape(ctx.author.display_name),
-                                            item=item,
-                                            buyer=self.escape(buyer.display_name),
-                                            asking=asking,
-                                            currency_name=currency_name,
-                                        ),
-                                        lang="css",
-                                    )
-                                )
+            if not pred.result:
+                with contextlib.suppress(discord.HTTPException):
+                    await trade_msg.delete()
+                return
+            # The buyer isn't locked while deciding, so both sheets are loaded again once both
+            # locks are held; taking them in a fixed order can't deadlock.
+            async with self.locks.acquire_many((ctx.author.id, buyer.id)):
+                with contextlib.suppress(discord.errors.NotFound):
+                    try:
+                        c = await self.get_character(ctx.author)
+                        buy_user = await self.get_character(buyer)
+                    except Exception as exc:
+                        log.exception("Error with the new character sheet", exc_info=exc)
+                        return
+                    if item.name not in c.backpack:
+                        return await trade_msg.edit(
+                            content=_("**{author}** no longer has {item}.").format(
+                                author=self.escape(ctx.author.display_name), item=item
                             )
-                            await self._clear_react(trade_msg)
-                        else:
-                            await trade_msg.edit(
-                                content=_("**{buyer}**, you do not have enough {currency_name}.").format(
-                                    buyer=self.escape(buyer.display_name), currency_name=currency_name,
-                                )
+                        )
+                    if buy_user.is_backpack_full(is_dev=self.is_dev(buyer)):
+                        return await trade_msg.edit(
+                            content=_("**{author}**'s backpack is currently full.").format(
+                                author=self.escape(buyer.display_name)
                             )
-                else:
-                    with contextlib.suppress(discord.HTTPException):
-                        await trade_msg.delete()
+                        )
+                    if buy_user.rebirths + 1 < c.rebirths:
+                        return await smart_embed(
+                            ctx,
+                            _(
+                                "You can only trade with people that are the same "
+                                "rebirth level, one rebirth level less than you, "
+                                "or a higher rebirth level than yours."
+                            ),
+                        )
+                    if not await bank.can_spend(buyer, asking):
+                        return await trade_msg.edit(
+                            content=_("**{buyer}**, you do not have enough {currency_name}.").format(
+                                buyer=self.escape(buyer.display_name), currency_name=currency_name,
+                            )
+                        )
+                    try:
+                        await bank.transfer_credits(buyer, ctx.author, asking)
+                    except BalanceTooHigh as e:
+                        await bank.withdraw_credits(buyer, asking)
+                        await bank.set_balance(ctx.author, e.max_balance)
+                    item = c.backpack[item.name]
+                    item.owned -= 1
+                    newly_owned = item.owned
+                    if item.owned <= 0:
+                        del c.backpack[item.name]
+                    if item.name in buy_user.backpack:
+                        buy_user.backpack[item.name].owned += 1
+                    else:
+                        item.owned = 1
+                        buy_user.backpack[item.name] = item
+                    await self.save_character(buyer, buy_user)
+                    item.owned = newly_owned
+                    await self.save_character(ctx.author, c)
+
+                    await trade_msg.edit(
+                        content=(
+                            box(
+                                _("\n{author} traded {item} to {buyer} for {asking} {currency_name}.").format(
+                                    author=self.escape(ctx.author.display_name),
+                                    item=item,
+                                    buyer=self.escape(buyer.display_name),
+                                    asking=asking,
+                                    currency_name=currency_name,
+                                ),
+                                lang="css",
+                            )
+                        )
+                    )
+                    await self._clear_react(trade_msg)
 
     @commands.command()
     @commands.bot_has_permissions(add_reactions=True)
@@ -1777,7 +1746,7 @@ class Adventure(commands.Cog):
             return await smart_embed(ctx, _("This command is not available in DM's on this bot."))
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -1843,7 +1812,7 @@ class Adventure(commands.Cog):
                     return await self._clear_react(open_msg)
 
                 try:
-                    c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                    c = await self.get_character(ctx.author)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     return
@@ -1870,7 +1839,7 @@ class Adventure(commands.Cog):
                     ),
                     embed=None,
                 )
-                await self.config.user(ctx.author).set(await c.rebirth())
+                self._character_cache.set_data(ctx.author.id, await c.rebirth())
 
     @commands.command()
     @commands.bot_has_permissions(add_reactions=True)
@@ -1898,7 +1867,7 @@ class Adventure(commands.Cog):
         for target in targets:
             async with self.get_lock(target):
                 try:
-                    c = await Character.from_json(self.config, target, self._daily_bonus)
+                    c = await self.get_character(target)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     continue
@@ -1910,7 +1879,7 @@ class Adventure(commands.Cog):
                     withdraw = bal
                     await bank.set_balance(target, 0)
                 character_data = await c.rebirth(dev_val=rebirth_level)
-                await self.config.user(target).set(character_data)
+                self._character_cache.set_data(target.id, character_data)
                 await ctx.send(
                     content=(
                         box(
@@ -1935,7 +1904,7 @@ class Adventure(commands.Cog):
         for target in targets:
             async with self.get_lock(target):
                 try:
-                    c = await Character.from_json(self.config, target, self._daily_bonus)
+                    c = await self.get_character(target)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     continue
@@ -1943,7 +1912,7 @@ class Adventure(commands.Cog):
                 c.heroclass["cooldown"] = 0
                 if "catch_cooldown" in c.heroclass:
                     c.heroclass["catch_cooldown"] = 0
-                await self.config.user(target).set(await c.to_json(self.config))
+                await self.save_character(target, c)
         await ctx.tick()
 
     @commands.group(aliases=["loadouts"])
@@ -1958,7 +1927,7 @@ class Adventure(commands.Cog):
         name = name.lower()
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -1977,7 +1946,7 @@ class Adventure(commands.Cog):
                     return
             loadout = await Character.save_loadout(c)
             c.loadouts[name] = loadout
-            await self.config.user(ctx.author).set(await c.to_json(self.config))
+            await self.save_character(ctx.author, c)
             await smart_embed(
                 ctx,
                 _("**{author}**, your current equipment has been saved to {name}.").format(
@@ -1993,7 +1962,7 @@ class Adventure(commands.Cog):
         async with self.get_lock(ctx.author):
             name = name.lower()
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -2006,7 +1975,7 @@ class Adventure(commands.Cog):
                 )
             else:
                 del c.loadouts[name]
-                await self.config.user(ctx.author).set(await c.to_json(self.config))
+                await self.save_character(ctx.author, c)
                 await smart_embed(
                     ctx,
                     _("**{author}**, loadout {name} has been deleted.").format(
@@ -2021,7 +1990,7 @@ class Adventure(commands.Cog):
         if not await self.allow_in_dm(ctx):
             return await smart_embed(ctx, _("This command is not available in DM's on this bot."))
         try:
-            c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+            c = await self.get_character(ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             return
@@ -2043,9 +2012,10 @@ class Adventure(commands.Cog):
             msg_list = []
             index = 0
             count = 0
-            for (l_name, loadout) in c.loadouts.items():
+            for l_name in c.loadouts:
                 if name and name.lower() == l_name:
                     index = count
+                loadout = {slot: item.to_json() if item else {} for (slot, item) in c.loadout_items(l_name).items()}
                 stats = await self._build_loadout_display({"items": loadout}, rebirths=c.rebirths, index=count + 1)
                 msg = _("{name} Loadout for {author}\n\n{stats}").format(
                     name=l_name, author=self.escape(ctx.author.display_name), stats=stats
@@ -2072,7 +2042,7 @@ class Adventure(commands.Cog):
         name = name.lower()
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 ctx.command.reset_cooldown(ctx)
@@ -2087,9 +2057,9 @@ class Adventure(commands.Cog):
                 )
             else:
                 c = await c.equip_loadout(name)
-                await self.config.user(ctx.author).set(await c.to_json(self.config))
+                await self.save_character(ctx.author, c)
                 try:
-                    c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                    c = await self.get_character(ctx.author)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     ctx.command.reset_cooldown(ctx)
@@ -2170,6 +2140,38 @@ class Adventure(commands.Cog):
                 lock.release()
         await ctx.tick()
 
+    @adventureset_locks.command(name="stats")
+    @commands.is_owner()
+    async def adventureset_locks_stats(self, ctx: commands.Context, limit: int = 10):
+        """[Owner] Show the most contended locks and the commands waiting on them."""
+        stats = self.locks.stats()
+        msg = _("Locks: {locks} ({held} held) | Created: {created} | Evicted: {evicted}\n").format(**stats)
+        hottest = self.locks.hottest(limit)
+        if hottest:
+            msg += _("\nHottest users:\n")
+            for (user_id, contended, wait) in hottest:
+                user = self.bot.get_user(user_id)
+                msg += _("{user}: {contended} contended, {wait:.2f}s waited\n").format(
+                    user=user or user_id, contended=contended, wait=wait
+                )
+        commands_by_wait = sorted(self.locks.commands.items(), key=lambda i: (i[1].wait, i[1].rejected), reverse=True)
+        if commands_by_wait:
+            msg += _("\nCommands:\n")
+            for (name, command) in commands_by_wait[:limit]:
+                msg += _(
+                    "{name}: {acquired} taken, {contended} contended, {rejected} turned away, "
+                    "{wait:.2f}s waited ({max_wait:.2f}s worst)\n"
+                ).format(
+                    name=name,
+                    acquired=command.acquired,
+                    contended=command.contended,
+                    rejected=command.rejected,
+                    wait=command.wait,
+                    max_wait=command.max_wait,
+                )
+        for page in pagify(msg, delims=["\n"], page_length=1900):
+            await ctx.send(box(page, lang="ini"))
+
     @adventureset.command(name="dailybonus")
     @commands.is_owner()
     async def adventureset_daily_bonus(self, ctx: commands.Context, day: DayConverter, percentage: PercentageConverter):
@@ -2193,16 +2195,20 @@ class Adventure(commands.Cog):
             del self._sessions[ctx.guild.id]
         await ctx.tick()
 
-    async def _garbage_collection(self):
-        await self.bot.wait_until_red_ready()
-        delta = timedelta(minutes=6)
-        with contextlib.suppress(asyncio.CancelledError):
-            while True:
-                async for guild_id, session in AsyncIter(self._sessions.copy(), steps=100):
-                    if session.start_time + delta > datetime.now():
-                        if guild_id in self._sessions:
-                            del self._sessions[guild_id]
-                await asyncio.sleep(5)
+    def _expire_session(self, guild_id: int, session: GameSession) -> None:
+        """Drop a session that is still around long after it should have finished."""
+        if self._sessions.get(guild_id) is session:
+            log.debug("Expiring the stale adventure session in %s", guild_id)
+            del self._sessions[guild_id]
+        for user_id in list(session.actions):
+            self._forget_participant(user_id, session)
+
+    def _forget_participant(self, user_id: int, session: GameSession) -> None:
+        joined = self._participants.get(user_id)
+        if joined is not None:
+            joined.discard(session)
+            if not joined:
+                del self._participants[user_id]
 
     @adventureset.command()
     @commands.is_owner()
@@ -2210,6 +2216,7 @@ class Adventure(commands.Cog):
         """[Owner] Set whether or not adventurers are restricted to one adventure at a time."""
         toggle = await self.config.restrict()
         await self.config.restrict.set(not toggle)
+        self._settings.forget("restrict")
         await smart_embed(ctx, _("Adventurers restricted to one adventure at a time: {}").format(not toggle))
 
     @adventureset.command()
@@ -2221,6 +2228,7 @@ class Adventure(commands.Cog):
         """
         toggle = await self.config.easy_mode()
         await self.config.easy_mode.set(not toggle)
+        self._settings.forget("easy_mode")
         await smart_embed(ctx, _("Adventure easy mode is now **{}**.").format("Enabled" if not toggle else "Disabled"))
 
     @adventureset.command()
@@ -2345,6 +2353,65 @@ class Adventure(commands.Cog):
         """Display the version of adventure being used."""
         await ctx.send(box(_("Adventure version: {}").format(self.__version__)))
 
+    @adventureset.command(name="cachestats")
+    @commands.is_owner()
+    async def cache_stats(self, ctx: commands.Context):
+        """[Owner] Show character cache statistics."""
+        stats = self._character_cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups if lookups else 0
+        settings = self._settings.stats()
+        msg = _(
+            "Cached sheets: {cached} ({dirty} waiting to be written)\n"
+            "Hits: {hits} | Misses: {misses} | Hit rate: {hit_rate:.1%} | Projected reads: {projected}\n"
+            "Saves: {saves} | Flushes: {flushes} | Config writes: {writes} ({partial_writes} partial)\n"
+            "Settings: {settings_saved} reads saved, {settings_reads} read from Config"
+        ).format(hit_rate=hit_rate, settings_saved=settings["saved"], settings_reads=settings["reads"], **stats)
+        await ctx.send(box(msg, lang="ini"))
+
+    @adventureset.command(name="migration")
+    @commands.is_owner()
+    async def migration_status(self, ctx: commands.Context, restart: bool = False):
+        """[Owner] Show the progress of the character sheet migration.
+
+        The migration runs in the background when the cog loads. Pass `True` to walk every user again.
+        """
+        if restart:
+            if self._migration.running:
+                return await smart_embed(ctx, _("The migration is already running."))
+            self._migration.start(self._leaderboards.user_ids(), restart=True)
+        stats = self._migration.stats()
+        if stats["running"]:
+            state = _("Running")
+        elif stats["finished"]:
+            state = _("Finished")
+        else:
+            state = _("Stopped")
+        remaining = stats["total"] - stats["migrated"]
+        eta = remaining / stats["throughput"] if stats["throughput"] else 0
+        msg = _(
+            "Migration: {state}\n"
+            "Users: {migrated}/{total} ({changed} rewritten)\n"
+            "Throughput: {throughput:.0f} users/s | Elapsed: {elapsed:.1f}s | Remaining: ~{eta:.0f}s"
+        ).format(state=state, eta=eta, **stats)
+        await ctx.send(box(msg, lang="ini"))
+
+    @adventureset.command(name="timerstats")
+    @commands.is_owner()
+    async def timer_stats(self, ctx: commands.Context):
+        """[Owner] Show countdown and session timer statistics."""
+        stats = self._scheduler.stats()
+        msg = _(
+            "Pending timers: {pending} | Fired: {fired}\n"
+            "Scheduler lag: {avg_lag:.1f}ms average, {max_lag:.1f}ms worst"
+        ).format(
+            pending=stats["pending"],
+            fired=stats["fired"],
+            avg_lag=stats["avg_lag"] * 1000,
+            max_lag=stats["max_lag"] * 1000,
+        )
+        await ctx.send(box(msg, lang="ini"))
+
     @adventureset.command()
     @commands.admin_or_permissions(administrator=True)
     async def god(self, ctx: commands.Context, *, name):
@@ -2406,7 +2473,10 @@ class Adventure(commands.Cog):
     async def clear_user(self, ctx: commands.Context, users: commands.Greedy[discord.User]):
         """[Owner] Lets you clear multiple users character sheets."""
         for user in users:
-            await self.config.user(user).clear()
+            async with self.get_lock(user):
+                self._character_cache.invalidate(user.id)
+                self._leaderboards.remove(user.id)
+                await self.config.user(user).clear()
             await smart_embed(ctx, _("{user}'s character sheet has been erased.").format(user=user))
 
     @adventureset.command(name="remove")
@@ -2419,7 +2489,7 @@ class Adventure(commands.Cog):
         async with self.get_lock(user):
             item = None
             try:
-                c = await Character.from_json(self.config, user, self._daily_bonus)
+                c = await self.get_character(user)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -2441,7 +2511,7 @@ class Adventure(commands.Cog):
                     )
             with contextlib.suppress(KeyError):
                 del c.backpack[item.name]
-            await self.config.user(user).set(await c.to_json(self.config))
+            await self.save_character(user, c)
         await ctx.send(_("{item} removed from {user}.").format(item=box(str(item), lang="css"), user=user))
 
     @adventureset.command()
@@ -2456,9 +2526,10 @@ class Adventure(commands.Cog):
     async def theme(self, ctx: commands.Context, *, theme):
         """[Owner] Change the theme for adventure."""
         if theme == "default":
+            await self._load_theme("default")
             await self.config.theme.set("default")
+            self._settings.forget("theme")
             await smart_embed(ctx, _("Going back to the default theme."))
-            await self.initialize()
             return
         if theme not in os.listdir(cog_data_path(self)):
             await smart_embed(ctx, _("That theme pack does not exist!"))
@@ -2485,10 +2556,12 @@ class Adventure(commands.Cog):
                 ctx, _("That theme pack is missing the following files: {}.").format(humanize_list(missing_files)),
             )
             return
-        else:
-            await self.config.theme.set(theme)
-            await ctx.tick()
-        await self.initialize()
+        if not await self._load_theme(theme):
+            await smart_embed(ctx, _("That theme pack is invalid."))
+            return
+        await self.config.theme.set(theme)
+        self._settings.forget("theme")
+        await ctx.tick()
 
     @commands.group()
     @commands.guild_only()
@@ -2522,6 +2595,8 @@ class Adventure(commands.Cog):
             if monster in config_data[theme]["monsters"]:
                 updated = True
             config_data[theme]["monsters"][monster] = theme_data
+        self._settings.forget("themes")
+        self._monster_rosters.pop(theme, None)
         image = theme_data.pop("image", None)
         text = _(
             "Monster: `{monster}` has been {status} the `{theme}` theme\n"
@@ -2559,6 +2634,7 @@ class Adventure(commands.Cog):
             if pet in config_data[theme]["pet"]:
                 updated = True
             config_data[theme]["pet"][pet] = pet_data
+        self._settings.forget("themes")
 
         pet_bonuses = pet_data.pop("bonuses", {})
         text = _(
@@ -2593,10 +2669,12 @@ class Adventure(commands.Cog):
                 config_data[theme]["monsters"] = {}
             if monster in config_data[theme]["monsters"]:
                 del config_data[theme]["monsters"][monster]
+                self._monster_rosters.pop(theme, None)
             else:
                 text = _("Monster: `{monster}` does not exist in `{theme}` theme").format(monster=monster, theme=theme)
                 await smart_embed(ctx, text)
                 return
+        self._settings.forget("themes")
 
         text = _("Monster: `{monster}` has been deleted from the `{theme}` theme").format(monster=monster, theme=theme)
         await smart_embed(ctx, text)
@@ -2618,6 +2696,7 @@ class Adventure(commands.Cog):
                 text = _("Pet: `{pet}` does not exist in `{theme}` theme").format(pet=pet, theme=theme)
                 await smart_embed(ctx, text)
                 return
+        self._settings.forget("themes")
 
         text = _("Pet: `{pet}` has been deleted from the `{theme}` theme").format(pet=pet, theme=theme)
         await smart_embed(ctx, text)
@@ -2708,15 +2787,17 @@ class Adventure(commands.Cog):
                 msg += "\n".join(chan.name for chan in name_list)
             return await ctx.send(box(msg))
         elif channel.id in channel_list:
-            new_channels = channel_list.remove(channel.id)
+            channel_list.remove(channel.id)
             await smart_embed(
                 ctx, _("The {} channel has been removed from the cart delivery list.").format(channel),
             )
-            return await self.config.guild(ctx.guild).cart_channels.set(new_channels)
+            await self.config.guild(ctx.guild).cart_channels.set(channel_list)
+            self._settings.forget_guild(ctx.guild.id)
         else:
             channel_list.append(channel.id)
             await smart_embed(ctx, _("The {} channel has been added to the cart delivery list.").format(channel))
             await self.config.guild(ctx.guild).cart_channels.set(channel_list)
+            self._settings.forget_guild(ctx.guild.id)
 
     @commands.guild_only()
     @commands.command()
@@ -2877,7 +2958,7 @@ class Adventure(commands.Cog):
             plural = ""
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author, projected=True)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -2928,7 +3009,7 @@ class Adventure(commands.Cog):
                             lang="css",
                         )
                     )
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                    await self.save_character(ctx.author, c)
                 else:
                     await smart_embed(
                         ctx,
@@ -2962,7 +3043,7 @@ class Adventure(commands.Cog):
                             lang="css",
                         )
                     )
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                    await self.save_character(ctx.author, c)
                 else:
                     await smart_embed(
                         ctx,
@@ -2996,7 +3077,7 @@ class Adventure(commands.Cog):
                             lang="css",
                         )
                     )
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                    await self.save_character(ctx.author, c)
                 else:
                     await smart_embed(
                         ctx,
@@ -3038,7 +3119,7 @@ class Adventure(commands.Cog):
             return await smart_embed(ctx, _("This command is not available in DM's on this bot."))
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -3193,7 +3274,7 @@ class Adventure(commands.Cog):
                     c.backpack[x.name].owned -= 1
                     if c.backpack[x.name].owned <= 0:
                         del c.backpack[x.name]
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                    await self.save_character(ctx.author, c)
                 # save so the items are eaten up already
                 for item in c.get_current_equipment():
                     if item.rarity == "forged":
@@ -3230,10 +3311,10 @@ class Adventure(commands.Cog):
                             del c.backpack[item.name]
                         await ctx.send(created_item)
                         c.backpack[newitem.name] = newitem
-                        await self.config.user(ctx.author).set(await c.to_json(self.config))
+                        await self.save_character(ctx.author, c)
                     else:
                         c.heroclass["cooldown"] = time.time() + cooldown_time
-                        await self.config.user(ctx.author).set(await c.to_json(self.config))
+                        await self.save_character(ctx.author, c)
                         mad_forge = box(
                             _("{author}, {newitem} got mad at your rejection and blew itself up.").format(
                                 author=self.escape(ctx.author.display_name), newitem=newitem
@@ -3244,7 +3325,7 @@ class Adventure(commands.Cog):
                 else:
                     c.heroclass["cooldown"] = time.time() + cooldown_time
                     c.backpack[newitem.name] = newitem
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                    await self.save_character(ctx.author, c)
                     forged_item = box(
                         _("{author}, your new {newitem} is lurking in your backpack.").format(
                             author=self.escape(ctx.author.display_name), newitem=newitem
@@ -3410,12 +3491,12 @@ class Adventure(commands.Cog):
         item = Item.from_json(new_item)
         async with self.get_lock(user):
             try:
-                c = await Character.from_json(self.config, user, self._daily_bonus)
+                c = await self.get_character(user)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
             await c.add_to_backpack(item)
-            await self.config.user(user).set(await c.to_json(self.config))
+            await self.save_character(user, c)
         await ctx.send(
             box(
                 _("An item named {item} has been created and placed in {author}'s backpack.").format(
@@ -3447,7 +3528,7 @@ class Adventure(commands.Cog):
         for user in users:
             async with self.get_lock(user):
                 try:
-                    c = await Character.from_json(self.config, user, self._daily_bonus)
+                    c = await self.get_character(user, projected=True)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     continue
@@ -3463,7 +3544,7 @@ class Adventure(commands.Cog):
                     c.treasure[5] += number
                 else:
                     c.treasure[0] += number
-                await self.config.user(user).set(await c.to_json(self.config))
+                await self.save_character(user, c)
                 await ctx.send(
                     box(
                         _(
@@ -3596,7 +3677,7 @@ class Adventure(commands.Cog):
                         currency_name = "credits"
                     spend = round(bal * 0.2)
                     try:
-                        c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                        c = await self.get_character(ctx.author)
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         ctx.command.reset_cooldown(ctx)
@@ -3650,7 +3731,7 @@ class Adventure(commands.Cog):
                     if not await bank.can_spend(ctx.author, spend):
                         return await class_msg.edit(content=broke)
                     try:
-                        c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                        c = await self.get_character(ctx.author)
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         return
@@ -3699,7 +3780,7 @@ class Adventure(commands.Cog):
                                 for item in tinker_wep:
                                     del c.backpack[item.name]
                                 if c.heroclass["name"] == "Tinkerer":
-                                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                                    await self.save_character(ctx.author, c)
                                     if tinker_wep:
                                         await class_msg.edit(
                                             content=box(
@@ -3715,7 +3796,7 @@ class Adventure(commands.Cog):
                                     c.heroclass["pet"] = {}
                                     c.heroclass = classes[clz]
 
-                                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                                    await self.save_character(ctx.author, c)
                                     await self._clear_react(class_msg)
                                     await class_msg.edit(
                                         content=box(
@@ -3757,7 +3838,7 @@ class Adventure(commands.Cog):
                             )
                         elif c.heroclass["name"] == "Psychic":
                             c.heroclass["cooldown"] = max(300, (900 - max((c.luck - c.total_cha) * 2, 0))) + time.time()
-                        await self.config.user(ctx.author).set(await c.to_json(self.config))
+                        await self.save_character(ctx.author, c)
                         await self._clear_react(class_msg)
                         await class_msg.edit(content=box(now_class_msg, lang="css"))
                         try:
@@ -3803,7 +3884,7 @@ class Adventure(commands.Cog):
         msgs = []
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -3862,49 +3943,20 @@ class Adventure(commands.Cog):
                         # atomically save reduced loot count then lock again when saving inside
                         # open chests
                         c.treasure[redux] -= number
-                        await self.config.user(ctx.author).set(await c.to_json(self.config))
+                        await self.save_character(ctx.author, c)
                         items = await self._open_chests(ctx, box_type, number, character=c)
                         msg = _("{}, you've opened the following items:\n\n").format(
                             self.escape(ctx.author.display_name)
                         )
                         msg_len = len(msg)
-                        table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-                        table.set_style(BeautifulTable.STYLE_RST)
-                        msgs = []
-                        total = len(items.values())
-                        table.columns.header = [
-                            "Name",
-                            "Slot",
-                            "ATT",
-                            "CHA",
-                            "INT",
-                            "DEX",
-                            "LUC",
-                            "LVL",
-                            "QTY",
-                            "DEG",
-                            "SET",
-                        ]
-                        async for index, item in AsyncIter(items.values(), steps=100).enumerate(start=1):
-                            if len(str(table)) > 1500:
-                                table.rows.sort("LVL", reverse=True)
-                                msgs.append(box(msg + str(table) + f"\nPage {len(msgs) + 1}", lang="css"))
-                                table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-                                table.set_style(BeautifulTable.STYLE_RST)
-                                table.columns.header = [
-                                    "Name",
-                                    "Slot",
-                                    "ATT",
-                                    "CHA",
-                                    "INT",
-                                    "DEX",
-                                    "LUC",
-                                    "LVL",
-                                    "QTY",
-                                    "DEG",
-                                    "SET",
-                                ]
-                            table.rows.append(
+                        paginator = TablePaginator(
+                            ["Name", "Slot", "ATT", "CHA", "INT", "DEX", "LUC", "LVL", "QTY", "DEG", "SET"],
+                            prefix=msg,
+                            sort_by="LVL",
+                            reverse=True,
+                        )
+                        async for item in AsyncIter(items.values(), steps=100):
+                            paginator.add_row(
                                 (
                                     str(item),
                                     item.slot[0] if len(item.slot) == 1 else "two handed",
@@ -3921,14 +3973,12 @@ class Adventure(commands.Cog):
                                     item.set or "N/A",
                                 )
                             )
-                            if index == total:
-                                table.rows.sort("LVL", reverse=True)
-                                msgs.append(box(msg + str(table) + f"\nPage {len(msgs) + 1}", lang="css"))
+                        msgs = paginator.pages()
                 else:
                     # atomically save reduced loot count then lock again when saving inside
                     # open chests
                     c.treasure[redux] -= 1
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                    await self.save_character(ctx.author, c)
                     await self._open_chest(ctx, ctx.author, box_type, character=c)  # returns item and msg
         if msgs:
             await BaseMenu(
@@ -4053,7 +4103,7 @@ class Adventure(commands.Cog):
             )
 
             try:
-                character = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                character = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 lock.release()
@@ -4082,7 +4132,7 @@ class Adventure(commands.Cog):
                 if items:
                     item_string = "\n".join([f"{v} x{i}" for v, i in items])
                     looted = box(f"{item_string}", lang="css")
-                    await self.config.user(ctx.author).set(await character.to_json(self.config))
+                    await self.save_character(ctx.author, character)
                 loss_msg = _(
                     ", losing {loss} {currency_name} as **{negachar}** rifled through their belongings."
                 ).format(loss=loss_string, currency_name=currency_name, negachar=negachar)
@@ -4117,7 +4167,7 @@ class Adventure(commands.Cog):
                     if items:
                         item_string = "\n".join([f"{v} {i}" for v, i in items])
                         looted = box(f"{item_string}", lang="css")
-                        await self.config.user(ctx.author).set(await character.to_json(self.config))
+                        await self.save_character(ctx.author, character)
                 loss_msg = _(
                     ", losing {loss} {currency_name} as **{negachar}** rifled through their belongings."
                 ).format(loss=loss_string, currency_name=currency_name, negachar=negachar)
@@ -4213,7 +4263,7 @@ class Adventure(commands.Cog):
                     if items:
                         item_string = "\n".join([f"{i}  - {v}" for v, i in items])
                         looted = box(f"{item_string}", lang="css")
-                        await self.config.user(ctx.author).set(await character.to_json(self.config))
+                        await self.save_character(ctx.author, character)
                 loss_msg = _(", losing {loss} {currency_name} as **{negachar}** looted their backpack.").format(
                     loss=loss_string, currency_name=currency_name, negachar=negachar,
                 )
@@ -4239,7 +4289,7 @@ class Adventure(commands.Cog):
             with contextlib.suppress(Exception):
                 lock.release()
             try:
-                character = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                character = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
             else:
@@ -4266,7 +4316,7 @@ class Adventure(commands.Cog):
                     changed = True
 
                 if changed:
-                    await self.config.user(ctx.author).set(await character.to_json(self.config))
+                    await self.save_character(ctx.author, character)
 
     @commands.group(autohelp=False)
     @commands.cooldown(rate=1, per=5, type=commands.BucketType.user)
@@ -4283,7 +4333,7 @@ class Adventure(commands.Cog):
                 return await smart_embed(ctx, _("This command is not available in DM's on this bot."))
             async with self.get_lock(ctx.author):
                 try:
-                    c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                    c = await self.get_character(ctx.author)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     return
@@ -4319,8 +4369,8 @@ class Adventure(commands.Cog):
                                 else _("1 second")
                             ),
                         )
-                    theme = await self.config.theme()
-                    extra_pets = await self.config.themes.all()
+                    theme = await self._settings.get("theme")
+                    extra_pets = await self._settings.get("themes")
                     extra_pets = extra_pets.get(theme, {}).get("pets", {})
                     pet_list = {**self.PETS, **extra_pets}
                     pet_choices = list(pet_list.keys())
@@ -4391,7 +4441,7 @@ class Adventure(commands.Cog):
                             await user_msg.edit(content=f"{pet_msg}\n{pet_msg2}\n{pet_msg3}")
                             c.heroclass["pet"] = pet_list[pet]
                             c.heroclass["catch_cooldown"] = time.time() + cooldown_time
-                            await self.config.user(ctx.author).set(await c.to_json(self.config))
+                            await self.save_character(ctx.author, c)
                         elif roll == 1:
                             bonus = _("But they stepped on a twig and scared it away.")
                             pet_msg3 = box(_("{bonus}\nThe {pet} escaped.").format(bonus=bonus, pet=pet), lang="css",)
@@ -4412,7 +4462,7 @@ class Adventure(commands.Cog):
             return await smart_embed(ctx, _("You're too distracted with the monster you are facing."))
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -4435,7 +4485,7 @@ class Adventure(commands.Cog):
             if c.heroclass["cooldown"] <= time.time():
                 await self._open_chest(ctx, c.heroclass["pet"]["name"], "pet", character=c)
                 c.heroclass["cooldown"] = time.time() + cooldown_time
-                await self.config.user(ctx.author).set(await c.to_json(self.config))
+                await self.save_character(ctx.author, c)
             else:
                 cooldown_time = c.heroclass["cooldown"] - time.time()
                 return await smart_embed(
@@ -4452,7 +4502,7 @@ class Adventure(commands.Cog):
             return await smart_embed(ctx, _("You're too distracted with the monster you are facing."))
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author, projected=True)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -4462,7 +4512,7 @@ class Adventure(commands.Cog):
                 )
             if c.heroclass["pet"]:
                 c.heroclass["pet"] = {}
-                await self.config.user(ctx.author).set(await c.to_json(self.config))
+                await self.save_character(ctx.author, c)
                 return await smart_embed(
                     ctx, _("**{}** released their pet into the wild..").format(self.escape(ctx.author.display_name)),
                 )
@@ -4477,7 +4527,7 @@ class Adventure(commands.Cog):
         """
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author, projected=True)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -4497,7 +4547,7 @@ class Adventure(commands.Cog):
                 if c.heroclass["cooldown"] <= time.time():
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                    await self.save_character(ctx.author, c)
 
                     await smart_embed(
                         ctx,
@@ -4525,7 +4575,7 @@ class Adventure(commands.Cog):
         This allows a Psychic to expose the current enemy's weakeness to the party.
         """
         try:
-            c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+            c = await self.get_character(ctx.author, projected=True)
         except Exception:
             log.exception("Error with the new character sheet")
             ctx.command.reset_cooldown(ctx)
@@ -4560,7 +4610,7 @@ class Adventure(commands.Cog):
                 c.heroclass["ability"] = True
                 c.heroclass["cooldown"] = time.time()
                 async with self.get_lock(c.user):
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                    await self.save_character(ctx.author, c)
                     if good:
                         await smart_embed(
                             ctx,
@@ -4690,7 +4740,7 @@ class Adventure(commands.Cog):
         """
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author, projected=True)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -4711,7 +4761,7 @@ class Adventure(commands.Cog):
                 if c.heroclass["cooldown"] <= time.time():
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                    await self.save_character(ctx.author, c)
                     await smart_embed(
                         ctx,
                         _("{skill} **{c}** is starting to froth at the mouth... {skill}").format(
@@ -4738,7 +4788,7 @@ class Adventure(commands.Cog):
         """
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author, projected=True)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -4759,7 +4809,7 @@ class Adventure(commands.Cog):
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
 
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                    await self.save_character(ctx.author, c)
                     await smart_embed(
                         ctx,
                         _("{skill} **{c}** is focusing all of their energy... {skill}").format(
@@ -4786,7 +4836,7 @@ class Adventure(commands.Cog):
         """
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author, projected=True)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -4806,7 +4856,7 @@ class Adventure(commands.Cog):
                 if c.heroclass["cooldown"] <= time.time():
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
+                    await self.save_character(ctx.author, c)
                     await smart_embed(
                         ctx,
                         _("{skill} **{c}** is whipping up a performance... {skill}").format(
@@ -4841,12 +4891,12 @@ class Adventure(commands.Cog):
             return await smart_embed(ctx, _("Nice try :smirk:"))
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author, projected=True)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
             if spend == "reset":
-                last_reset = await self.config.user(ctx.author).last_skill_reset()
+                last_reset = c.last_skill_reset
                 if last_reset + 3600 > time.time():
                     return await smart_embed(ctx, _("You reset your skills within the last hour, try again later."))
                 bal = c.bal
@@ -4883,8 +4933,8 @@ class Adventure(commands.Cog):
                     c.skill["att"] = 0
                     c.skill["cha"] = 0
                     c.skill["int"] = 0
-                    await self.config.user(ctx.author).set(await c.to_json(self.config))
-                    await self.config.user(ctx.author).last_skill_reset.set(int(time.time()))
+                    c.last_skill_reset = int(time.time())
+                    await self.save_character(ctx.author, c)
                     await bank.withdraw_credits(ctx.author, offering)
                     await smart_embed(
                         ctx, _("{}, your skill points have been reset.").format(self.escape(ctx.author.display_name)),
@@ -4939,7 +4989,7 @@ class Adventure(commands.Cog):
                     c.skill["pool"] -= amount
                     c.skill["int"] += amount
                     spend = "intelligence"
-                await self.config.user(ctx.author).set(await c.to_json(self.config))
+                await self.save_character(ctx.author, c)
                 await smart_embed(
                     ctx,
                     _("{author}, you permanently raised your {spend} value by {amount}.").format(
@@ -4969,7 +5019,7 @@ class Adventure(commands.Cog):
             )
 
         try:
-            c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+            c = await self.get_character(ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             return
@@ -5055,7 +5105,7 @@ class Adventure(commands.Cog):
         if user.bot:
             return
         try:
-            c = await Character.from_json(self.config, user, self._daily_bonus)
+            c = await self.get_character(user)
         except Exception:
             log.exception("Error with the new character sheet")
             return
@@ -5063,41 +5113,10 @@ class Adventure(commands.Cog):
         msg = _("{}'s Character Sheet\n\n").format(self.escape(user.display_name))
         msg_len = len(msg)
         items_names = set()
-        table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-        table.set_style(BeautifulTable.STYLE_RST)
-        msgs = []
-        total = len(items)
-        table.columns.header = [
-            "Name",
-            "Slot",
-            "ATT",
-            "CHA",
-            "INT",
-            "DEX",
-            "LUC",
-            "LVL",
-            "QTY",
-            "DEG",
-            "SET",
-        ]
-        async for index, item in AsyncIter(items, steps=100).enumerate(start=1):
-            if len(str(table)) > 1500:
-                msgs.append(box(msg + str(table) + f"\nPage {len(msgs) + 1}", lang="css"))
-                table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-                table.set_style(BeautifulTable.STYLE_RST)
-                table.columns.header = [
-                    "Name",
-                    "Slot",
-                    "ATT",
-                    "CHA",
-                    "INT",
-                    "DEX",
-                    "LUC",
-                    "LVL",
-                    "QTY",
-                    "DEG",
-                    "SET",
-                ]
+        paginator = TablePaginator(
+            ["Name", "Slot", "ATT", "CHA", "INT", "DEX", "LUC", "LVL", "QTY", "DEG", "SET"], prefix=msg
+        )
+        async for item in AsyncIter(items, steps=100):
             item_name = str(item)
             slots = len(item.slot)
             slot_name = item.slot[0] if slots == 1 else "two handed"
@@ -5119,13 +5138,9 @@ class Adventure(commands.Cog):
                 else "N/A",
                 item.set or "N/A",
             )
-            if data not in table.rows:
-                table.rows.append(data)
-            if index == total:
-                table.set_style(BeautifulTable.STYLE_RST)
-                msgs.append(box(msg + str(table) + f"\nPage {len(msgs) + 1}", lang="css"))
+            paginator.add_row(data)
         await BaseMenu(
-            source=SimpleSource([box(c, lang="css"), *msgs]),
+            source=SimpleSource([box(c, lang="css"), *paginator.pages()]),
             delete_message_after=True,
             clear_reactions_after=True,
             timeout=60,
@@ -5218,7 +5233,7 @@ class Adventure(commands.Cog):
             return await smart_embed(ctx, _("This command is not available in DM's on this bot."))
         async with self.get_lock(ctx.author):
             try:
-                c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+                c = await self.get_character(ctx.author)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
@@ -5265,7 +5280,7 @@ class Adventure(commands.Cog):
                         break
             if msg:
                 await ctx.send(box(msg, lang="css"))
-                await self.config.user(ctx.author).set(await c.to_json(self.config))
+                await self.save_character(ctx.author, c)
             else:
                 await smart_embed(
                     ctx,
@@ -5370,6 +5385,9 @@ class Adventure(commands.Cog):
             self._sessions[ctx.guild.id].finished = True
             await self.config.guild(ctx.guild).cooldown.set(0)
             log.exception("Something went wrong controlling the game", exc_info=exc)
+            with contextlib.suppress(Exception):
+                # keep whatever was already settled for the participants
+                await self._sessions[ctx.guild.id].settlement.commit()
             while ctx.guild.id in self._sessions:
                 del self._sessions[ctx.guild.id]
             return
@@ -5378,6 +5396,7 @@ class Adventure(commands.Cog):
             while ctx.guild.id in self._sessions:
                 del self._sessions[ctx.guild.id]
             return
+        settlement = self._sessions[ctx.guild.id].settlement
         reward_copy = reward.copy()
         send_message = ""
         for (userid, rewards) in reward_copy.items():
@@ -5386,7 +5405,9 @@ class Adventure(commands.Cog):
                 if user is None:
                     # sorry no rewards if you leave the server
                     continue
-                msg = await self._add_rewards(ctx, user, rewards["xp"], rewards["cp"], rewards["special"])
+                msg = await self._add_rewards(
+                    ctx, user, rewards["xp"], rewards["cp"], rewards["special"], settlement=settlement
+                )
                 if msg:
                     send_message += f"{msg}\n"
                 self._rewards[userid] = {}
@@ -5395,18 +5416,11 @@ class Adventure(commands.Cog):
                 await smart_embed(ctx, page, success=True)
         if participants:
             for user in participants:  # reset activated abilities
-                async with self.get_lock(user):
-                    try:
-                        c = await Character.from_json(self.config, user, self._daily_bonus)
-                    except Exception as exc:
-                        log.exception("Error with the new character sheet", exc_info=exc)
-                        continue
-                    if c.heroclass["name"] != "Ranger" and c.heroclass["ability"]:
-                        c.heroclass["ability"] = False
-                    if c.last_currency_check + 600 < time.time() or c.bal > c.last_known_currency:
-                        c.last_known_currency = await bank.get_balance(user)
-                        c.last_currency_check = time.time()
-                    await self.config.user(user).set(await c.to_json(self.config))
+                try:
+                    await settlement.update(user, partial(self._end_adventure, balance=await bank.get_balance(user)))
+                except Exception as exc:
+                    log.exception("Error with the new character sheet", exc_info=exc)
+        await settlement.commit()
         if ctx.message.id in self._reward_message:
             extramsg = self._reward_message.pop(ctx.message.id)
             if extramsg:
@@ -5450,38 +5464,13 @@ class Adventure(commands.Cog):
 
         await ctx.bot.on_command_error(ctx, error, unhandled_by_cog=not handled)
 
-    async def get_challenge(self, ctx: commands.Context, monsters):
+    async def get_challenge(self, ctx: commands.Context, monsters: MonsterRoster):
         try:
-            c = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+            c = await self.get_character(ctx.author, projected=True)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
-            choice = random.choice(list(monsters.keys()) * 3)
-            return choice
-        possible_monsters = []
-        stat_range = self._adv_results.get_stat_range(ctx)
-        async for (e, (m, stats)) in AsyncIter(monsters.items(), steps=100).enumerate(start=1):
-            appropriate_range = max(stats["hp"], stats["dipl"]) <= (max(c.att, c.int, c.cha) * 5)
-            if stat_range["max_stat"] > 0:
-                main_stat = stats["hp"] if (stat_range["stat_type"] == "attack") else stats["dipl"]
-                appropriate_range = (stat_range["min_stat"] * 0.75) <= main_stat <= (stat_range["max_stat"] * 1.2)
-            if not appropriate_range:
-                continue
-            if not stats["boss"] and not stats["miniboss"]:
-                count = 0
-                break_at = random.randint(1, 15)
-                while count < break_at:
-                    count += 1
-                    possible_monsters.append(m)
-                    if count == break_at:
-                        break
-            else:
-                possible_monsters.append(m)
-
-        if len(possible_monsters) == 0:
-            choice = random.choice(list(monsters.keys()) * 3)
-        else:
-            choice = random.choice(possible_monsters)
-        return choice
+            return monsters.random()
+        return monsters.choose(self._adv_results.get_stat_range(ctx), max(c.att, c.int, c.cha))
 
     def _dynamic_monster_stats(self, ctx: commands.Context, choice: MutableMapping):
         stat_range = self._adv_results.get_stat_range(ctx)
@@ -5580,18 +5569,23 @@ class Adventure(commands.Cog):
     async def update_monster_roster(self, user):
 
         try:
-            c = await Character.from_json(self.config, user, self._daily_bonus)
+            c = await self.get_character(user, projected=True)
             failed = False
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             failed = True
 
         transcended_chance = random.randint(0, 10)
-        theme = await self.config.theme()
-        extra_monsters = await self.config.themes.all()
-        extra_monsters = extra_monsters.get(theme, {}).get("monsters", {})
+        theme = await self._settings.get("theme")
+        monsters = self._monster_rosters.get(theme)
+        if monsters is None:
+            extra_monsters = await self._settings.get("themes")
+            extra_monsters = extra_monsters.get(theme, {}).get("monsters", {})
+            monsters = await self.bot.loop.run_in_executor(
+                None, MonsterRoster, self.MONSTERS, self.AS_MONSTERS, extra_monsters
+            )
+            self._monster_rosters[theme] = monsters
         monster_stats = 1
-        monsters = {**self.MONSTERS, **self.AS_MONSTERS, **extra_monsters}
         transcended = False
         if not failed:
             if transcended_chance == 5:
@@ -5609,7 +5603,7 @@ class Adventure(commands.Cog):
     async def _simple(self, ctx: commands.Context, adventure_msg, challenge: str = None, attribute: str = None):
         self.bot.dispatch("adventure", ctx)
         text = ""
-        easy_mode = await self.config.easy_mode()
+        easy_mode = await self._settings.get("easy_mode")
         monster_roster, monster_stats, transcended = await self.update_monster_roster(ctx.author)
         if not challenge or challenge not in monster_roster:
             challenge = await self.get_challenge(ctx, monster_roster)
@@ -5657,9 +5651,13 @@ class Adventure(commands.Cog):
             monster_stats=monster_stats if not no_monster else None,
             message=ctx.message,
             transcended=transcended if not no_monster else None,
-            monster_modified_stats=self._dynamic_monster_stats(ctx, monster_roster[challenge]),
+            monster_modified_stats=self._dynamic_monster_stats(ctx, {**monster_roster[challenge]}),
             easy_mode=easy_mode,
             no_monster=no_monster,
+            settlement=AdventureSettlement(self._character_cache, self._daily_bonus, self.get_lock),
+        )
+        self._scheduler.call_later(
+            SESSION_TIMEOUT, partial(self._expire_session, ctx.guild.id, self._sessions[ctx.guild.id])
         )
         adventure_msg = (
             f"{adventure_msg}{text}\n{random.choice(self.LOCATIONS)}\n"
@@ -5860,6 +5858,13 @@ class Adventure(commands.Cog):
         if str(reaction.emoji) not in emojis:
             return
         if (guild := getattr(user, "guild", None)) is not None:
+            # Only reactions on a running adventure or cart go any further.
+            session = self._sessions.get(guild.id)
+            trader = self._current_traders.get(guild.id)
+            if (session is None or reaction.message.id != session.message_id) and (
+                trader is None or reaction.message.id != trader["msg"]
+            ):
+                return
             if await self.bot.cog_disabled_in_guild(self, guild):
                 return
         else:
@@ -5869,75 +5874,56 @@ class Adventure(commands.Cog):
         if guild.id in self._sessions:
             if reaction.message.id == self._sessions[guild.id].message_id:
                 if guild.id in self._adventure_countdown:
-                    (timer, done, sremain) = self._adventure_countdown[guild.id]
-                    if sremain > 3:
+                    if self._adventure_countdown[guild.id] - time.time() > 3:
                         await self._handle_adventure(reaction, user)
         if guild.id in self._current_traders:
             if reaction.message.id == self._current_traders[guild.id]["msg"] and not self.in_adventure(user=user):
                 if user in self._current_traders[guild.id]["users"]:
                     return
                 if guild.id in self._trader_countdown:
-                    (timer, done, sremain) = self._trader_countdown[guild.id]
-                    if sremain > 3:
+                    if self._trader_countdown[guild.id] - time.time() > 3:
                         await self._handle_cart(reaction, user)
 
     async def _handle_adventure(self, reaction, user):
         action = {v: k for k, v in self._adventure_controls.items()}[str(reaction.emoji)]
         session = self._sessions[user.guild.id]
         has_fund = await has_funds(user, 250)
-        for x in ["fight", "magic", "talk", "pray", "run"]:
-            if user in getattr(session, x, []):
-                getattr(session, x).remove(user)
-
-            if not has_fund or user in getattr(session, x, []):
-                if reaction.message.channel.permissions_for(user.guild.me).manage_messages:
-                    symbol = self._adventure_controls[x]
-                    await reaction.message.remove_reaction(symbol, user)
-
-        restricted = await self.config.restrict()
-        if user not in getattr(session, action, []):
-            if not has_fund:
-                with contextlib.suppress(discord.HTTPException):
-                    await user.send(
-                        _(
-                            "You contemplate going on an adventure with your friends, so "
-                            "you go to your bank to get some money to prepare and they "
-                            "tell you that your bank is empty!\n"
-                            "You run home to look for some spare coins and you can't "
-                            "even find a single one, so you tell your friends that you can't "
-                            "join them as you already have plans... as you are too embarrassed "
-                            "to tell them you are broke!"
-                        )
-                    )
-                return
-            if restricted:
-                all_users = []
-                for (guild_id, guild_session) in self._sessions.items():
-                    guild_users_in_game = (
-                        guild_session.fight
-                        + guild_session.magic
-                        + guild_session.talk
-                        + guild_session.pray
-                        + guild_session.run
+        session.leave(user)
+        self._forget_participant(user.id, session)
+        if not has_fund and reaction.message.channel.permissions_for(user.guild.me).manage_messages:
+            for x in ["fight", "magic", "talk", "pray", "run"]:
+                symbol = self._adventure_controls[x]
+                await reaction.message.remove_reaction(symbol, user)
+
+        if not has_fund:
+            with contextlib.suppress(discord.HTTPException):
+                await user.send(
+                    _(
+                        "You contemplate going on an adventure with your friends, so "
+                        "you go to your bank to get some money to prepare and they "
+                        "tell you that your bank is empty!\n"
+                        "You run home to look for some spare coins and you can't "
+                        "even find a single one, so you tell your friends that you can't "
+                        "join them as you already have plans... as you are too embarrassed "
+                        "to tell them you are broke!"
                     )
-                    all_users = all_users + guild_users_in_game
-
-                if user in all_users:
-                    user_id = f"{user.id}-{user.guild.id}"
-                    # iterating through reactions here and removing them seems to be expensive
-                    # so they can just keep their react on the adventures they can't join
-                    if user_id not in self._react_messaged:
-                        await reaction.message.channel.send(
-                            _(
-                                "**{c}**, you are already in an existing adventure. "
-                                "Wait for it to finish before joining another one."
-                            ).format(c=self.escape(user.display_name))
-                        )
-                        self._react_messaged.append(user_id)
-                else:
-                    getattr(session, action).append(user)
-            else:
-                getattr(session, action).append(user)
+                )
+            return
+        if await self._settings.get("restrict") and self.in_adventure(user=user):
+            user_id = f"{user.id}-{user.guild.id}"
+            # iterating through reactions here and removing them seems to be expensive
+            # so they can just keep their react on the adventures they can't join
+            if user_id not in self._react_messaged:
+                await reaction.message.channel.send(
+                    _(
+                        "**{c}**, you are already in an existing adventure. "
+                        "Wait for it to finish before joining another one."
+                    ).format(c=self.escape(user.display_name))
+                )
+                self._react_messaged.add(user_id)
+        else:
+            session.join(user, action)
+            self._participants.setdefault(user.id, set()).add(session)
 
     async def _handle_cart(self, reaction, user):
         guild = user.guild
@@ -5973,7 +5959,7 @@ class Adventure(commands.Cog):
             await bank.withdraw_credits(spender, int(items["price"]) * pred.result)
             async with self.get_lock(user):
                 try:
-                    c = await Character.from_json(self.config, user, self._daily_bonus)
+                    c = await self.get_character(user)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     return
@@ -5990,7 +5976,7 @@ class Adventure(commands.Cog):
                 item = items["item"]
                 item.owned = pred.result
                 await c.add_to_backpack(item, number=pred.result)
-                await self.config.user(user).set(await c.to_json(self.config))
+                await self.save_character(user, c)
                 with contextlib.suppress(discord.HTTPException):
                     await to_delete.delete()
                     await msg.delete()
@@ -6047,6 +6033,7 @@ class Adventure(commands.Cog):
         self._sessions[ctx.guild.id].pray = pray_list
         self._sessions[ctx.guild.id].run = run_list
         self._sessions[ctx.guild.id].magic = magic_list
+        await session.settlement.preload([*fight_list, *magic_list, *talk_list, *pray_list, *run_list])
         fight_name_list = []
         wizard_name_list = []
         talk_name_list = []
@@ -6108,20 +6095,19 @@ class Adventure(commands.Cog):
             parsed_users = []
             for (action_name, action) in participants.items():
                 for user in action:
+                    stats = [action_name]
+                    first = user not in parsed_users
+                    if first:
+                        stats.append("loses" if lost or user in participants["run"] else "wins")
                     try:
-                        c = await Character.from_json(self.config, user, self._daily_bonus)
+                        await session.settlement.update(
+                            user, partial(self._record_adventure, stats=stats, weekly=first)
+                        )
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         continue
-                    current_val = c.adventures.get(action_name, 0)
-                    c.adventures.update({action_name: current_val + 1})
-                    if user not in parsed_users:
-                        special_action = "loses" if lost or user in participants["run"] else "wins"
-                        current_val = c.adventures.get(special_action, 0)
-                        c.adventures.update({special_action: current_val + 1})
-                        c.weekly_score.update({"adventures": c.weekly_score.get("adventures", 0) + 1})
+                    if first:
                         parsed_users.append(user)
-                    await self.config.user(user).set(await c.to_json(self.config))
             attack, diplomacy, magic, run_msg = await self.handle_run(
                 ctx.guild.id, attack, diplomacy, magic, shame=True
             )
@@ -6241,7 +6227,7 @@ class Adventure(commands.Cog):
             currency_name = await bank.get_currency_name(ctx.guild,)
             for user in session.participants:
                 try:
-                    c = await Character.from_json(self.config, user, self._daily_bonus)
+                    c = await session.settlement.get(user)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     continue
@@ -6261,9 +6247,7 @@ class Adventure(commands.Cog):
                             await bank.withdraw_credits(user, loss)
                         else:
                             await bank.set_balance(user, 0)
-                c.adventures.update({"loses": c.adventures.get("loses", 0) + 1})
-                c.weekly_score.update({"adventures": c.weekly_score.get("adventures", 0) + 1})
-                await self.config.user(user).set(await c.to_json(self.config))
+                await session.settlement.update(user, partial(self._record_adventure, stats=["loses"], weekly=True))
             loss_list = []
             result_msg += session.miniboss["defeat"]
             if len(repair_list) > 0:
@@ -6285,7 +6269,7 @@ class Adventure(commands.Cog):
             currency_name = await bank.get_currency_name(ctx.guild,)
             for user in session.participants:
                 try:
-                    c = await Character.from_json(self.config, user, self._daily_bonus)
+                    c = await session.settlement.get(user)
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     continue
@@ -6359,7 +6343,7 @@ class Adventure(commands.Cog):
                 users = set(fight_list + magic_list + talk_list + pray_list + fumblelist)
                 for user in users:
                     try:
-                        c = await Character.from_json(self.config, user, self._daily_bonus)
+                        c = await session.settlement.get(user)
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         continue
@@ -6403,7 +6387,7 @@ class Adventure(commands.Cog):
                 users = run_list
                 for user in users:
                     try:
-                        c = await Character.from_json(self.config, user, self._daily_bonus)
+                        c = await session.settlement.get(user)
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         continue
@@ -6544,7 +6528,7 @@ class Adventure(commands.Cog):
                 users = set(fight_list + magic_list + talk_list + pray_list + fumblelist)
                 for user in users:
                     try:
-                        c = await Character.from_json(self.config, user, self._daily_bonus)
+                        c = await session.settlement.get(user)
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         continue
@@ -6605,20 +6589,17 @@ class Adventure(commands.Cog):
         parsed_users = []
         for (action_name, action) in participants.items():
             for user in action:
+                stats = [action_name]
+                first = user not in parsed_users
+                if first:
+                    stats.append("loses" if lost or user in participants["run"] else "wins")
                 try:
-                    c = await Character.from_json(self.config, user, self._daily_bonus)
+                    await session.settlement.update(user, partial(self._record_adventure, stats=stats, weekly=first))
                 except Exception as exc:
                     log.exception("Error with the new character sheet", exc_info=exc)
                     continue
-                current_val = c.adventures.get(action_name, 0)
-                c.adventures.update({action_name: current_val + 1})
-                if user not in parsed_users:
-                    special_action = "loses" if lost or user in participants["run"] else "wins"
-                    current_val = c.adventures.get(special_action, 0)
-                    c.adventures.update({special_action: current_val + 1})
-                    c.weekly_score.update({"adventures": c.weekly_score.get("adventures", 0) + 1})
+                if first:
                     parsed_users.append(user)
-                await self.config.user(user).set(await c.to_json(self.config))
 
     async def handle_run(self, guild_id, attack, diplomacy, magic, shame=False):
         runners = []
@@ -6653,7 +6634,7 @@ class Adventure(commands.Cog):
 
         for user in fight_list:
             try:
-                c = await Character.from_json(self.config, user, self._daily_bonus)
+                c = await session.settlement.get(user)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 continue
@@ -6728,7 +6709,7 @@ class Adventure(commands.Cog):
                 attack += int(session.insight[1].total_att * 0.2)
         for user in magic_list:
             try:
-                c = await Character.from_json(self.config, user, self._daily_bonus)
+                c = await session.settlement.get(user)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 continue
@@ -6830,7 +6811,7 @@ class Adventure(commands.Cog):
         failed_emoji = self.emojis.fumble
         for user in pray_list:
             try:
-                c = await Character.from_json(self.config, user, self._daily_bonus)
+                c = await session.settlement.get(user)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 continue
@@ -6984,7 +6965,7 @@ class Adventure(commands.Cog):
         failed_emoji = self.emojis.fumble
         for user in talk_list:
             try:
-                c = await Character.from_json(self.config, user, self._daily_bonus)
+                c = await session.settlement.get(user)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 continue
@@ -7073,7 +7054,7 @@ class Adventure(commands.Cog):
             else:
                 for user in participants:  # check if any fighter has an equipped mirror shield to give them a chance.
                     try:
-                        c = await Character.from_json(self.config, user, self._daily_bonus)
+                        c = await session.settlement.get(user)
                     except Exception as exc:
                         log.exception("Error with the new character sheet", exc_info=exc)
                         continue
@@ -7091,137 +7072,174 @@ class Adventure(commands.Cog):
             failed = False
         return failed
 
-    async def _add_rewards(self, ctx: commands.Context, user, exp, cp, special):
+    async def _add_rewards(
+        self, ctx: commands.Context, user, exp, cp, special, settlement: Optional[AdventureSettlement] = None
+    ):
+        if settlement is not None:
+            try:
+                c = await settlement.get(user)
+            except Exception as exc:
+                log.exception("Error with the new character sheet", exc_info=exc)
+                return
+            await self._deposit_reward(ctx, user, cp)
+            special = self._roll_special(c, c.exp + exp, special)
+            return await settlement.update(user, partial(self._grant_rewards, user=user, exp=exp, special=special))
         lock = self.get_lock(user)
         if not lock.locked():
             await lock.acquire()
         try:
-            c = await Character.from_json(self.config, user, self._daily_bonus)
+            c = await self.get_character(user)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             lock.release()
             return
         else:
-            rebirth_text = ""
-            c.exp += exp
-            member = ctx.guild.get_member(user.id)
-            cp = max(cp, 0)
-            if cp > 0:
-                try:
-                    await bank.deposit_credits(member, cp)
-                except BalanceTooHigh as e:
-                    await bank.set_balance(member, e.max_balance)
-            extra = ""
-            rebirthextra = ""
-            lvl_start = c.lvl
-            lvl_end = int(max(c.exp, 0) ** (1 / 3.5))
-            lvl_end = lvl_end if lvl_end < c.maxlevel else c.maxlevel
-            levelup_emoji = self.emojis.level_up
-            rebirth_emoji = self.emojis.rebirth
-            if lvl_end >= c.maxlevel:
-                rebirthextra = _("{} You can now rebirth {}").format(rebirth_emoji, user.mention)
-            if lvl_start < lvl_end:
-                # recalculate free skillpoint pool based on new level and already spent points.
-                c.lvl = lvl_end
-                assigned_stats = c.skill["att"] + c.skill["cha"] + c.skill["int"]
-                starting_points = await calculate_sp(lvl_start, c) + assigned_stats
-                ending_points = await calculate_sp(lvl_end, c) + assigned_stats
-
-                if c.skill["pool"] < 0:
-                    c.skill["pool"] = 0
-                c.skill["pool"] += ending_points - starting_points
-                if c.skill["pool"] > 0:
-                    extra = _(" You have **{}** skill points available.").format(c.skill["pool"])
-                rebirth_text = _("{} {} is now level **{}**!{}\n{}").format(
-                    levelup_emoji, user.mention, lvl_end, extra, rebirthextra
-                )
-            if c.rebirths > 1:
-                roll = random.randint(1, 100)
-                if lvl_end == c.maxlevel:
-                    roll += random.randint(50, 100)
-                if special is False:
-                    special = [0, 0, 0, 0, 0, 0]
-                    if c.rebirths > 1 and roll < 50:
-                        special[0] += 1
-                    if c.rebirths > 5 and roll < 30:
-                        special[1] += 1
-                    if c.rebirths > 10 > roll:
-                        special[2] += 1
-                    if c.rebirths > 15 and roll < 5:
-                        special[3] += 1
-                    if special == [0, 0, 0, 0, 0, 0]:
-                        special = False
-                else:
-                    if c.rebirths > 1 and roll < 50:
-                        special[0] += 1
-                    if c.rebirths > 5 and roll < 30:
-                        special[1] += 1
-                    if c.rebirths > 10 > roll:
-                        special[2] += 1
-                    if c.rebirths > 15 and roll < 5:
-                        special[3] += 1
-                    if special == [0, 0, 0, 0, 0, 0]:
-                        special = False
-            if special is not False:
-                c.treasure = [sum(x) for x in zip(c.treasure, special)]
-            await self.config.user(user).set(await c.to_json(self.config))
+            await self._deposit_reward(ctx, user, cp)
+            special = self._roll_special(c, c.exp + exp, special)
+            rebirth_text = await self._grant_rewards(c, user=user, exp=exp, special=special)
+            await self.save_character(user, c)
             return rebirth_text
         finally:
             lock = self.get_lock(user)
             with contextlib.suppress(Exception):
                 lock.release()
 
-    async def _adv_countdown(self, ctx: commands.Context, seconds, title) -> asyncio.Task:
-        await self._data_check(ctx)
+    @staticmethod
+    async def _deposit_reward(ctx: commands.Context, user, cp) -> None:
+        member = ctx.guild.get_member(user.id)
+        cp = max(cp, 0)
+        if cp > 0:
+            try:
+                await bank.deposit_credits(member, cp)
+            except BalanceTooHigh as e:
+                await bank.set_balance(member, e.max_balance)
 
-        async def adv_countdown():
-            secondint = int(seconds)
-            adv_end = await self._get_epoch(secondint)
-            timer, done, sremain = await self._remaining(adv_end)
-            message_adv = await ctx.send(f"⏳ [{title}] {timer}s")
-            deleted = False
-            while not done:
-                timer, done, sremain = await self._remaining(adv_end)
-                self._adventure_countdown[ctx.guild.id] = (timer, done, sremain)
-                if done:
-                    if not deleted:
-                        await message_adv.delete()
-                    break
-                elif not deleted and int(sremain) % 5 == 0:
-                    try:
-                        await message_adv.edit(content=f"⏳ [{title}] {timer}s")
-                    except discord.NotFound:
-                        deleted = True
-                await asyncio.sleep(1)
-            log.debug("Timer countdown done.")
+    @staticmethod
+    def _roll_special(c: Character, exp: int, special):
+        """Roll the bonus chests of a character whose experience is going to be ``exp``."""
+        if c.rebirths <= 1:
+            return special
+        lvl_end = min(int(max(exp, 0) ** (1 / 3.5)), c.maxlevel)
+        roll = random.randint(1, 100)
+        if lvl_end == c.maxlevel:
+            roll += random.randint(50, 100)
+        special = [0, 0, 0, 0, 0, 0] if special is False else list(special)
+        if c.rebirths > 1 and roll < 50:
+            special[0] += 1
+        if c.rebirths > 5 and roll < 30:
+            special[1] += 1
+        if c.rebirths > 10 > roll:
+            special[2] += 1
+        if c.rebirths > 15 and roll < 5:
+            special[3] += 1
+        if special == [0, 0, 0, 0, 0, 0]:
+            special = False
+        return special
+
+    async def _grant_rewards(self, c: Character, user, exp, special) -> str:
+        """Add experience and chests to the character, levelling it up. Returns the level-up message."""
+        rebirth_text = ""
+        c.exp += exp
+        extra = ""
+        rebirthextra = ""
+        lvl_start = c.lvl
+        lvl_end = int(max(c.exp, 0) ** (1 / 3.5))
+        lvl_end = lvl_end if lvl_end < c.maxlevel else c.maxlevel
+        levelup_emoji = self.emojis.level_up
+        rebirth_emoji = self.emojis.rebirth
+        if lvl_end >= c.maxlevel:
+            rebirthextra = _("{} You can now rebirth {}").format(rebirth_emoji, user.mention)
+        if lvl_start < lvl_end:
+            # recalculate free skillpoint pool based on new level and already spent points.
+            c.lvl = lvl_end
+            assigned_stats = c.skill["att"] + c.skill["cha"] + c.skill["int"]
+            starting_points = await calculate_sp(lvl_start, c) + assigned_stats
+            ending_points = await calculate_sp(lvl_end, c) + assigned_stats
+
+            if c.skill["pool"] < 0:
+                c.skill["pool"] = 0
+            c.skill["pool"] += ending_points - starting_points
+            if c.skill["pool"] > 0:
+                extra = _(" You have **{}** skill points available.").format(c.skill["pool"])
+            rebirth_text = _("{} {} is now level **{}**!{}\n{}").format(
+                levelup_emoji, user.mention, lvl_end, extra, rebirthextra
+            )
+        if special is not False:
+            c.treasure = [sum(x) for x in zip(c.treasure, special)]
+        return rebirth_text
+
+    @staticmethod
+    def _record_adventure(c: Character, stats: List[str], weekly: bool = False) -> None:
+        """Count an adventure in the character's scoreboard stats."""
+        for stat in stats:
+            c.adventures.update({stat: c.adventures.get(stat, 0) + 1})
+        if weekly:
+            c.weekly_score.update({"adventures": c.weekly_score.get("adventures", 0) + 1})
 
-        return ctx.bot.loop.create_task(adv_countdown())
+    @staticmethod
+    def _end_adventure(c: Character, balance: int) -> None:
+        """Reset activated abilities and note the balance once an adventure is over."""
+        if c.heroclass["name"] != "Ranger" and c.heroclass["ability"]:
+            c.heroclass["ability"] = False
+        if c.last_currency_check + 600 < time.time() or balance > c.last_known_currency:
+            c.last_known_currency = balance
+            c.last_currency_check = time.time()
+
+    async def _adv_countdown(self, ctx: commands.Context, seconds, title) -> asyncio.Future:
+        await self._data_check(ctx)
+        return await self._countdown(ctx, seconds, title, self._adventure_countdown, ctx.guild.id)
 
-    async def _cart_countdown(self, ctx: commands.Context, seconds, title, room=None) -> asyncio.Task:
+    async def _cart_countdown(self, ctx: commands.Context, seconds, title, room=None) -> asyncio.Future:
         room = room or ctx
         await self._data_check(ctx)
+        return await self._countdown(room, seconds, title, self._trader_countdown, ctx.guild.id)
 
-        async def cart_countdown():
-            secondint = int(seconds)
-            cart_end = await self._get_epoch(secondint)
-            timer, done, sremain = await self._remaining(cart_end)
-            message_cart = await room.send(f"⏳ [{title}] {timer}s")
-            deleted = False
-            while not done:
-                timer, done, sremain = await self._remaining(cart_end)
-                self._trader_countdown[ctx.guild.id] = (timer, done, sremain)
-                if done:
-                    if not deleted:
-                        await message_cart.delete()
-                    break
-                if not deleted and int(sremain) % 5 == 0:
-                    try:
-                        await message_cart.edit(content=f"⏳ [{title}] {timer}s")
-                    except discord.NotFound:
-                        deleted = True
-                await asyncio.sleep(1)
+    async def _countdown(
+        self, room: discord.abc.Messageable, seconds, title, deadlines: MutableMapping[int, float], guild_id: int
+    ) -> asyncio.Future:
+        """Post a countdown message and hand it to the scheduler.
 
-        return ctx.bot.loop.create_task(cart_countdown())
+        The message is refreshed whenever the remaining time hits a multiple of five
+        seconds and deleted once time is up. ``deadlines`` records the epoch time it
+        ends at for the reaction listener. Returns a future that completes when time is up.
+        """
+        end = self._scheduler.clock() + int(seconds)
+        deadlines[guild_id] = await self._get_epoch(int(seconds))
+        timer, done, sremain = await self._remaining(end)
+        message = await room.send(f"⏳ [{title}] {timer}s")
+        finished = self.bot.loop.create_future()
+        deleted = False
+        pending = None
+
+        def schedule_refresh():
+            nonlocal pending
+            step = int(end - self._scheduler.clock()) // 5 * 5
+            pending = self._scheduler.call_at(end - step if step > 0 and not deleted else end, refresh)
+
+        async def refresh():
+            nonlocal deleted
+            if finished.done():
+                return
+            timer, done, sremain = await self._remaining(end)
+            if done:
+                if not deleted:
+                    with contextlib.suppress(discord.HTTPException):
+                        await message.delete()
+                if not finished.done():
+                    finished.set_result(None)
+                log.debug("Timer countdown done.")
+                return
+            if not deleted:
+                try:
+                    await message.edit(content=f"⏳ [{title}] {timer}s")
+                except discord.NotFound:
+                    deleted = True
+            if not finished.done():
+                schedule_refresh()
+
+        schedule_refresh()
+        finished.add_done_callback(lambda f: pending.cancel())
+        return finished
 
     @staticmethod
     async def _clear_react(msg):
@@ -7256,19 +7274,24 @@ class Adventure(commands.Cog):
         final_words += [word if word in exceptions else word.capitalize() for word in lowercase_words[1:]]
         return " ".join(final_words)
 
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        self._leaderboards.members_changed(member.guild)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self._leaderboards.members_changed(member.guild)
+
     @commands.Cog.listener()
     async def on_message_without_command(self, message):
         await self._ready_event.wait()
-        if message.guild is not None:
-            if await self.bot.cog_disabled_in_guild(self, message.guild):
-                return
-        else:
-            return
-        channels = await self.config.guild(message.guild).cart_channels()
-        if not channels:
+        if message.guild is None:
             return
+        channels = await self._settings.cart_channels(message.guild)
         if message.channel.id not in channels:
             return
+        if await self.bot.cog_disabled_in_guild(self, message.guild):
+            return
         if not message.author.bot:
             roll = random.randint(1, 20)
             if roll == 20:
@@ -7280,81 +7303,35 @@ class Adventure(commands.Cog):
                 await asyncio.sleep(5)
                 await self._trader(ctx)
 
-    async def _roll_chest(self, chest_type: str, c: Character):
-        # set rarity to chest by default
-        rarity = chest_type
-        if chest_type == "pet":
-            rarity = "normal"
-        INITIAL_MAX_ROLL = 400
-        # max luck for best chest odds
-        MAX_CHEST_LUCK = 200
+    @staticmethod
+    def _chest_top_range(c: Character) -> int:
         # lower gives you better chances for better items
         max_roll = INITIAL_MAX_ROLL - round(c.luck) - (c.rebirths // 2)
-        top_range = max(max_roll, INITIAL_MAX_ROLL - MAX_CHEST_LUCK)
-        roll = max(random.randint(1, top_range), 1)
-        if chest_type == "normal":
-            if roll <= INITIAL_MAX_ROLL * 0.05:  # 5% to roll rare
-                rarity = "rare"
-            else:
-                pass  # 95% to roll common
-        elif chest_type == "rare":
-            if roll <= INITIAL_MAX_ROLL * 0.05:  # 5% to roll epic
-                rarity = "epic"
-            elif roll <= INITIAL_MAX_ROLL * 0.95:  # 90% to roll rare
-                pass
-            else:
-                rarity = "normal"  # 5% to roll normal
-        elif chest_type == "epic":
-            if roll <= INITIAL_MAX_ROLL * 0.05:  # 5% to roll legendary
-                rarity = "legendary"
-            elif roll <= INITIAL_MAX_ROLL * 0.90:  # 85% to roll epic
-                pass
-            else:  # 10% to roll rare
-                rarity = "rare"
-        elif chest_type == "legendary":
-            if roll <= INITIAL_MAX_ROLL * 0.75:  # 75% to roll legendary
-                pass
-            elif roll <= INITIAL_MAX_ROLL * 0.95:  # 20% to roll epic
-                rarity = "epic"
-            else:
-                rarity = "rare"  # 5% to roll rare
-        elif chest_type == "ascended":
-            if roll <= INITIAL_MAX_ROLL * 0.55:  # 55% to roll set
-                rarity = "ascended"
-            else:
-                rarity = "legendary"  # 45% to roll legendary
-        elif chest_type == "pet":
-            if roll <= INITIAL_MAX_ROLL * 0.05:  # 5% to roll legendary
-                rarity = "legendary"
-            elif roll <= INITIAL_MAX_ROLL * 0.15:  # 10% to roll epic
-                rarity = "epic"
-            elif roll <= INITIAL_MAX_ROLL * 0.57:  # 42% to roll rare
-                rarity = "rare"
-            else:
-                rarity = "normal"  # 47% to roll common
-        elif chest_type == "set":
-            if roll <= INITIAL_MAX_ROLL * 0.55:  # 55% to roll set
-                rarity = "set"
-            elif roll <= INITIAL_MAX_ROLL * 0.87:
-                rarity = "ascended"  # 45% to roll legendary
-            else:
-                rarity = "legendary"  # 45% to roll legendary
+        return max(max_roll, INITIAL_MAX_ROLL - MAX_CHEST_LUCK)
+
+    async def _roll_chest(self, chest_type: str, c: Character):
+        roll = max(random.randint(1, self._chest_top_range(c)), 1)
+        return await self._genitem(chest_rarity(chest_type, roll))
 
-        return await self._genitem(rarity)
+    def _roll_chest_rarities(self, chest_type: str, c: Character, amount: int) -> MutableMapping[str, int]:
+        """Roll the rarity of ``amount`` chests at once, with the odds of :meth:`_roll_chest`."""
+        return chest_rarities(chest_type, self._chest_top_range(c), amount)
 
     async def _open_chests(
         self, ctx: commands.Context, chest_type: str, amount: int, character: Character,
     ):
         items = {}
-        async for _loop_counter in AsyncIter(range(0, max(amount, 0)), steps=100):
-            item = await self._roll_chest(chest_type, character)
-            item_name = str(item)
-            if item_name in items:
-                items[item_name].owned += 1
-            else:
-                items[item_name] = item
-            await character.add_to_backpack(item)
-        await self.config.user(ctx.author).set(await character.to_json(self.config))
+        rarities = self._roll_chest_rarities(chest_type, character, max(amount, 0))
+        for (rarity, number) in rarities.items():
+            async for item in AsyncIter(await self._genitems(rarity, number), steps=100):
+                item_name = str(item)
+                if item_name in items:
+                    items[item_name].owned += 1
+                else:
+                    items[item_name] = item
+        async for item in AsyncIter(items.values(), steps=100):
+            await character.add_to_backpack(copy(item), number=item.owned)
+        await self.save_character(ctx.author, character)
         return items
 
     async def _open_chest(self, ctx: commands.Context, user, chest_type, character):
@@ -7485,7 +7462,7 @@ class Adventure(commands.Cog):
                     )
                 )
             )
-            await self.config.user(ctx.author).set(await character.to_json(self.config))
+            await self.save_character(ctx.author, character)
             return
         await self._clear_react(open_msg)
         if self._treasure_controls[react.emoji] == "sell":
@@ -7515,14 +7492,14 @@ class Adventure(commands.Cog):
             await self._clear_react(open_msg)
             character.last_known_currency = await bank.get_balance(ctx.author)
             character.last_currency_check = time.time()
-            await self.config.user(ctx.author).set(await character.to_json(self.config))
+            await self.save_character(ctx.author, character)
         elif self._treasure_controls[react.emoji] == "equip":
             equiplevel = equip_level(character, item)
             if self.is_dev(ctx.author):
                 equiplevel = 0
             if not can_equip(character, item):
                 await character.add_to_backpack(item)
-                await self.config.user(ctx.author).set(await character.to_json(self.config))
+                await self.save_character(ctx.author, character)
                 return await smart_embed(
                     ctx,
                     f"**{self.escape(ctx.author.display_name)}**, you need to be level "
@@ -7547,7 +7524,7 @@ class Adventure(commands.Cog):
                 )
             await open_msg.edit(content=equip_msg)
             character = await character.equip_item(item, False, self.is_dev(ctx.author))
-            await self.config.user(ctx.author).set(await character.to_json(self.config))
+            await self.save_character(ctx.author, character)
         else:
             await character.add_to_backpack(item)
             await open_msg.edit(
@@ -7561,11 +7538,11 @@ class Adventure(commands.Cog):
                 )
             )
             await self._clear_react(open_msg)
-            await self.config.user(ctx.author).set(await character.to_json(self.config))
+            await self.save_character(ctx.author, character)
 
     @staticmethod
-    async def _remaining(epoch):
-        remaining = epoch - time.time()
+    async def _remaining(deadline):
+        remaining = deadline - TimerScheduler.clock()
         finish = remaining < 0
         m, s = divmod(remaining, 60)
         h, m = divmod(m, 60)
@@ -7581,6 +7558,7 @@ class Adventure(commands.Cog):
         return (out, finish, remaining)
 
     async def _reward(self, ctx: commands.Context, userlist, amount, modif, special):
+        session = self._sessions[ctx.guild.id]
         daymult = self._daily_bonus.get(str(datetime.today().isoweekday()), 0)
         xp = max(1, round(amount))
         cp = max(1, round(amount))
@@ -7594,7 +7572,7 @@ class Adventure(commands.Cog):
         async for user in AsyncIter(userlist, steps=100):
             self._rewards[user.id] = {}
             try:
-                c = await Character.from_json(self.config, user, self._daily_bonus)
+                c = await session.settlement.get(user)
             except Exception as exc:
                 log.exception("Error with the new character sheet", exc_info=exc)
                 continue
@@ -7698,18 +7676,15 @@ class Adventure(commands.Cog):
             base = (250, 500)
         else:
             base = (10, 100)
-        price = random.randint(base[0], base[1]) * abs(item.max_main_stat)
-        price += price * max(int((c.total_cha) / 1000), -1)
-
-        if c.luck > 0:
-            price = price + round(price * (c.luck / 1000))
-        if c.luck < 0:
-            price = price - round(price * (abs(c.luck) / 1000))
-        if price < 0:
-            price = 0
-        price += round(price * min(0.1 * c.rebirths / 15, 0.4))
-
-        return max(price, base[0])
+        return sell_total(
+            base[0],
+            base[1],
+            item.max_main_stat,
+            max(int((c.total_cha) / 1000), -1),
+            c.luck,
+            c.rebirths,
+            amount,
+        )
 
     async def _trader(self, ctx: commands.Context, bypass=False):
         em_list = ReactionPredicate.NUMBER_EMOJIS
@@ -7844,8 +7819,9 @@ class Adventure(commands.Cog):
             self.cleanup_loop.cancel()
         if self._init_task:
             self._init_task.cancel()
-        if self.gb_task:
-            self.gb_task.cancel()
+        self._scheduler.stop()
+        self._migration.stop()
+        self._character_cache.stop()
 
         for (msg_id, task) in self.tasks.items():
             task.cancel()
@@ -7870,34 +7846,8 @@ class Adventure(commands.Cog):
         `list` of `tuple`
             The sorted leaderboard in the form of :code:`(user_id, raw_account)`
         """
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=100):
-            user_data = {}
-            for item in ["lvl", "rebirths", "set_items"]:
-                if item not in v:
-                    v.update({item: 0})
-            for (vk, vi) in v.items():
-                if vk in ["lvl", "rebirths", "set_items"]:
-                    user_data.update({vk: vi})
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
-        sorted_acc = sorted(
-            raw_accounts_new.items(),
-            key=lambda x: (x[1].get("rebirths", 0), x[1].get("lvl", 1), x[1].get("set_items", 0)),
-            reverse=True,
-        )
-        if positions is None:
-            return sorted_acc
-        else:
-            return sorted_acc[:positions]
+        check = (lambda user_id, data: guild.get_member(user_id) is not None) if guild is not None else None
+        return self._leaderboards.rebirths.top(positions, check)
 
     @commands.command()
     @commands.bot_has_permissions(add_reactions=True, embed_links=True)
@@ -7920,7 +7870,7 @@ class Adventure(commands.Cog):
 
     async def get_global_scoreboard(
         self, positions: int = None, guild: discord.Guild = None, keyword: str = None
-    ) -> List[tuple]:
+    ) -> Sequence[tuple]:
         """Gets the bank's leaderboard.
 
         Parameters
@@ -7933,8 +7883,9 @@ class Adventure(commands.Cog):
 
         Returns
         -------
-        `list` of `tuple`
-            The sorted leaderboard in the form of :code:`(user_id, raw_account)`
+        `Sequence` of `tuple`
+            The sorted leaderboard in the form of :code:`(user_id, raw_account)`, read
+            lazily from the cached ranking
 
         Raises
         ------
@@ -7943,43 +7894,15 @@ class Adventure(commands.Cog):
         """
         if keyword is None:
             keyword = "wins"
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=200):
-            user_data = {}
-            for item in ["adventures", "rebirths"]:
-                if item not in v:
-                    if item == "adventures":
-                        v.update({item: {keyword: 0}})
-                    else:
-                        v.update({item: 0})
-
-            for (vk, vi) in v.items():
-                if vk in ["rebirths"]:
-                    user_data.update({vk: vi})
-                elif vk in ["adventures"]:
-                    for (s, sv) in vi.items():
-                        if s == keyword:
-                            user_data.update(vi)
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
-
-        sorted_acc = sorted(
-            raw_accounts_new.items(), key=lambda x: (x[1].get(keyword, 0), x[1].get("rebirths", 0)), reverse=True,
+        check = (lambda user_id, data: guild.get_member(user_id) is not None) if guild is not None else None
+        ranking = self._leaderboards.adventures[keyword].ranking(
+            check, key=self._leaderboards.guild_key(guild) if guild is not None else None
         )
-        if positions is None:
-            return sorted_acc
-        else:
-            return sorted_acc[:positions]
+        return ranking[:positions] if positions is not None else ranking
 
-    async def get_global_negaverse_scoreboard(self, positions: int = None, guild: discord.Guild = None) -> List[tuple]:
+    async def get_global_negaverse_scoreboard(
+        self, positions: int = None, guild: discord.Guild = None
+    ) -> Sequence[tuple]:
         """Gets the bank's leaderboard.
 
         Parameters
@@ -7992,39 +7915,20 @@ class Adventure(commands.Cog):
 
         Returns
         -------
-        `list` of `tuple`
-            The sorted leaderboard in the form of :code:`(user_id, raw_account)`
+        `Sequence` of `tuple`
+            The sorted leaderboard in the form of :code:`(user_id, raw_account)`, read
+            lazily from the cached ranking
 
         Raises
         ------
         TypeError
             If the bank is guild-specific and no guild was specified
         """
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=200):
-            user_data = {}
-            for (vk, vi) in v.items():
-                if vk in ["nega"]:
-                    for (s, sv) in vi.items():
-                        user_data.update(vi)
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
-
-        sorted_acc = sorted(
-            raw_accounts_new.items(), key=lambda x: (x[1].get("wins", 0), x[1].get("loses", 0)), reverse=True,
+        check = (lambda user_id, data: guild.get_member(user_id) is not None) if guild is not None else None
+        ranking = self._leaderboards.negaverse.ranking(
+            check, key=self._leaderboards.guild_key(guild) if guild is not None else None
         )
-        if positions is None:
-            return sorted_acc
-        else:
-            return sorted_acc[:positions]
+        return ranking[:positions] if positions is not None else ranking
 
     @commands.command()
     @commands.bot_has_permissions(add_reactions=True, embed_links=True)
@@ -8102,40 +8006,8 @@ class Adventure(commands.Cog):
         TypeError
             If the bank is guild-specific and no guild was specified
         """
-        current_week = date.today().isocalendar()[1]
-        keyword = "adventures"
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=200):
-            user_data = {}
-            for item in ["weekly_score"]:
-                if item not in v:
-                    if item == "weekly_score":
-                        v.update({item: {keyword: 0, "rebirths": 0}})
-
-            for (vk, vi) in v.items():
-                if vk in ["weekly_score"]:
-                    if vi.get("week", -1) == current_week:
-                        for (s, sv) in vi.items():
-                            if s in [keyword]:
-                                user_data.update(vi)
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
-
-        sorted_acc = sorted(
-            raw_accounts_new.items(), key=lambda x: (x[1].get(keyword, 0), x[1].get("rebirths", 0)), reverse=True,
-        )
-        if positions is None:
-            return sorted_acc
-        else:
-            return sorted_acc[:positions]
+        check = (lambda user_id, data: guild.get_member(user_id) is not None) if guild is not None else None
+        return self._leaderboards.weekly.top(positions, self._leaderboards.current_week_check(check))
 
     @commands.command(name="apayday", cooldown_after_parsing=True)
     @has_separated_economy()
@@ -8173,14 +8045,14 @@ class Adventure(commands.Cog):
                 ),
             )
         try:
-            character = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+            character = await self.get_character(ctx.author, projected=True)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
         else:
             if character.last_currency_check + 600 < time.time() or character.bal > character.last_known_currency:
                 character.last_known_currency = await bank.get_balance(ctx.author)
                 character.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await character.to_json(self.config))
+                await self.save_character(ctx.author, character)
 
     @commands.group(name="atransfer")
     @has_separated_economy()
@@ -8231,14 +8103,14 @@ class Adventure(commands.Cog):
             ),
         )
         try:
-            character = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+            character = await self.get_character(ctx.author, projected=True)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
         else:
             if character.last_currency_check + 600 < time.time() or character.bal > character.last_known_currency:
                 character.last_known_currency = await bank.get_balance(ctx.author)
                 character.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await character.to_json(self.config))
+                await self.save_character(ctx.author, character)
 
     @commands_atransfer.command(name="withdraw", cooldown_after_parsing=True)
     @commands.guild_only()
@@ -8333,9 +8205,10 @@ class Adventure(commands.Cog):
             highest = percent
 
         try:
-            transfered = await bank.transfer_credits(
-                from_=ctx.author, to=player, amount=amount, tax=highest
-            )  # Customizable Tax
+            async with self.locks.acquire_many((ctx.author.id, player.id)):
+                transfered = await bank.transfer_credits(
+                    from_=ctx.author, to=player, amount=amount, tax=highest
+                )  # Customizable Tax
         except (ValueError, BalanceTooHigh) as e:
             ctx.command.reset_cooldown(ctx)
             return await ctx.send(str(e))
@@ -8386,34 +8259,16 @@ class Adventure(commands.Cog):
         """Show your sets."""
 
         try:
-            character = await Character.from_json(self.config, ctx.author, self._daily_bonus)
+            character = await self.get_character(ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             return
 
         sets = await character.get_set_count()
-        table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-        table.set_style(BeautifulTable.STYLE_RST)
-        table.columns.header = [
-            "Name",
-            "Unique Pieces",
-            "Unique Owned",
-        ]
-        msgs = []
+        paginator = TablePaginator(["Name", "Unique Pieces", "Unique Owned"], sort_by="Name", reverse=False)
         for k, v in sets.items():
-            if len(str(table)) > 1500:
-                table.rows.sort("Name", reverse=False)
-                msgs.append(box(str(table) + f"\nPage {len(msgs) + 1}", lang="css"))
-                table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-                table.set_style(BeautifulTable.STYLE_RST)
-                table.columns.header = [
-                    "Name",
-                    "Unique Pieces",
-                    "Unique Owned",
-                ]
-            table.rows.append((k, f"{v[0]}", f" {v[1]}" if v[1] == v[0] else f"[{v[1]}]"))
-        table.rows.sort("Name", reverse=False)
-        msgs.append(box(str(table) + f"\nPage {len(msgs) + 1}", lang="css"))
+            paginator.add_row((k, f"{v[0]}", f" {v[1]}" if v[1] == v[0] else f"[{v[1]}]"))
+        msgs = paginator.pages() or [box("\nPage 1", lang="css")]
         await BaseMenu(
             source=SimpleSource(msgs), delete_message_after=True, clear_reactions_after=True, timeout=60,
         ).start(ctx=ctx)
@@ -0,0 +1,124 @@
+import random
+from collections import Counter
+from functools import lru_cache
+from math import floor, sqrt
+from typing import List, MutableMapping, Tuple
+
+# Stacks up to this size are still rolled copy by copy. Larger stacks draw their
+# total from the normal limit of the per-copy distribution, with the exact mean and
+# variance, so the cost no longer grows with the number of copies.
+EXACT_LIMIT = 1000
+# Chests roll in 1..INITIAL_MAX_ROLL, less the character's luck and rebirths.
+INITIAL_MAX_ROLL = 400
+# max luck for best chest odds
+MAX_CHEST_LUCK = 200
+# Chest type -> ordered (roll threshold as a fraction of INITIAL_MAX_ROLL, rarity).
+# A roll gets the first rarity whose threshold it doesn't exceed; None catches every remaining roll.
+CHEST_ODDS = {
+    "normal": ((0.05, "rare"), (None, "normal")),  # 5% rare, 95% common
+    "rare": ((0.05, "epic"), (0.95, "rare"), (None, "normal")),  # 5% epic, 90% rare, 5% normal
+    "epic": ((0.05, "legendary"), (0.90, "epic"), (None, "rare")),  # 5% legendary, 85% epic, 10% rare
+    "legendary": ((0.75, "legendary"), (0.95, "epic"), (None, "rare")),  # 75% legendary, 20% epic, 5% rare
+    "ascended": ((0.55, "ascended"), (None, "legendary")),  # 55% ascended, 45% legendary
+    "pet": ((0.05, "legendary"), (0.15, "epic"), (0.57, "rare"), (None, "normal")),
+    "set": ((0.55, "set"), (0.87, "ascended"), (None, "legendary")),
+}
+
+
+def chest_rarity(chest_type: str, roll: int) -> str:
+    """Rarity of the item in a ``chest_type`` chest for a single ``roll``."""
+    for (threshold, rarity) in CHEST_ODDS.get(chest_type, ((None, chest_type),)):
+        if threshold is None or roll <= INITIAL_MAX_ROLL * threshold:
+            break
+    return rarity
+
+
+def chest_weights(chest_type: str, top_range: int) -> Tuple[List[str], List[int]]:
+    """The rarities of a chest and, cumulatively, how many rolls in ``1..top_range`` land on each."""
+    odds = CHEST_ODDS.get(chest_type, ((None, chest_type),))
+    rarities = [rarity for (threshold, rarity) in odds]
+    cum_weights = [
+        top_range if threshold is None else min(floor(INITIAL_MAX_ROLL * threshold), top_range)
+        for (threshold, rarity) in odds
+    ]
+    return rarities, cum_weights
+
+
+def chest_rarities(chest_type: str, top_range: int, amount: int) -> MutableMapping[str, int]:
+    """Roll the rarity of ``amount`` chests at once.
+
+    Weighting each rarity by the rolls in ``1..top_range`` that land on it gives
+    the same distribution as rolling every chest with :func:`chest_rarity`.
+    """
+    (rarities, cum_weights) = chest_weights(chest_type, top_range)
+    return Counter(random.choices(rarities, cum_weights=cum_weights, k=amount))
+
+
+def unit_sell_price(roll: int, low: int, stat: int, cha_bonus: int, luck: float, rebirths: int) -> int:
+    """Price of one copy of an item for a ``roll`` in ``low..high``."""
+    price = roll * abs(stat)
+    price += price * cha_bonus
+
+    if luck > 0:
+        price = price + round(price * (luck / 1000))
+    if luck < 0:
+        price = price - round(price * (abs(luck) / 1000))
+    if price < 0:
+        price = 0
+    price += round(price * min(0.1 * rebirths / 15, 0.4))
+
+    return max(price, low)
+
+
+@lru_cache(maxsize=1024)
+def sell_price_moments(
+    low: int, high: int, stat: int, cha_bonus: int, luck: float, rebirths: int
+) -> Tuple[float, float, int, int]:
+    """Return the mean, variance, minimum and maximum price of a single copy."""
+    prices = [unit_sell_price(roll, low, stat, cha_bonus, luck, rebirths) for roll in range(low, high + 1)]
+    mean = sum(prices) / len(prices)
+    variance = sum((price - mean) ** 2 for price in prices) / len(prices)
+    return mean, variance, min(prices), max(prices)
+
+
+def sum_of_copies(amount: int, mean: float, variance: float, low: int, high: int) -> int:
+    """Draw the sum of ``amount`` independent copies of a variable bounded by ``low`` and ``high``.
+
+    The tails of the normal limit are cut off, so the total can never be negative
+    or outside what rolling every copy could give.
+    """
+    total = round(random.gauss(amount * mean, sqrt(amount * variance)))
+    return max(min(total, amount * high), amount * low, 0)
+
+
+def sell_total(low: int, high: int, stat: int, cha_bonus: int, luck: float, rebirths: int, amount: int) -> int:
+    """Total price of ``amount`` copies, each rolled in ``low..high``."""
+    if amount <= EXACT_LIMIT:
+        return sum(
+            unit_sell_price(random.randint(low, high), low, stat, cha_bonus, luck, rebirths) for _ in range(amount)
+        )
+    mean, variance, cheapest, dearest = sell_price_moments(low, high, stat, cha_bonus, luck, rebirths)
+    return sum_of_copies(amount, mean, variance, cheapest, dearest)
+
+
+def binomial(trials: int, chance: float) -> int:
+    """Number of successes in ``trials`` independent attempts."""
+    if trials <= EXACT_LIMIT:
+        return sum(random.random() < chance for _ in range(trials))
+    if hasattr(random, "binomialvariate"):  # Python 3.12+
+        return random.binomialvariate(trials, chance)
+    return sum_of_copies(trials, chance, chance * (1 - chance), 0, 1)
+
+
+def disassemble(amount: int, tinkerer: bool) -> Tuple[int, int]:
+    """Disassemble ``amount`` copies of an item.
+
+    Returns the number of successful attempts and the chests they yield. Tinkerers
+    succeed one time in four and get one or two chests each time; everyone else
+    succeeds one time in six and gets a single chest.
+    """
+    if not tinkerer:
+        success = binomial(amount, 1 / 6)
+        return success, success
+    success = binomial(amount, 1 / 4)
+    return success, success + binomial(success, 1 / 2)
@@ -0,0 +1,533 @@
+import asyncio
+import contextlib
+import logging
+import time
+from copy import copy, deepcopy
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, MutableMapping, Optional, Set, Tuple
+
+import discord
+from redbot.core import Config
+from redbot.core.drivers import JsonDriver
+
+from .charsheet import Character
+from .compact import decode_backpack, encode_backpack, is_compact, should_compact
+
+log = logging.getLogger("red.cogs.adventure.cache")
+
+# How many participant sheets an adventure loads at once before it is resolved.
+PRELOAD_CONCURRENCY = 10
+# Fields of a character sheet a projected load reads and a projected save writes
+# back: everything except the backpack and loadouts, which make up most of a big sheet.
+PROJECTED_FIELDS = (
+    "exp",
+    "lvl",
+    "att",
+    "cha",
+    "int",
+    "treasure",
+    "items",
+    "class",
+    "heroclass",
+    "skill",
+    "rebirths",
+    "set_items",
+    "adventures",
+    "nega",
+    "weekly_score",
+    "last_skill_reset",
+    "last_known_currency",
+    "last_currency_check",
+)
+# On drivers that store keys separately, a flush writes a sheet key by key and backpack
+# entry by entry while it has at most this many changes queued; past that a single
+# write of the whole sheet is cheaper.
+MAX_DELTA_WRITES = 16
+_MISSING = object()
+
+
+def _copy_field(key: str, value: Any) -> Any:
+    if key == "backpack" or not isinstance(value, (dict, list)):
+        return value
+    return copy(value)
+
+
+class CharacterCache:
+    """Write-behind cache of character sheets.
+
+    Sheets are kept in memory keyed by user ID. Saving a character only updates the
+    cached document and marks it dirty; dirty documents are written back to Config
+    by :meth:`flush`, which runs on a timer, when a user's lock is released and when
+    the cog unloads.
+
+    Commands that never touch the backpack or loadouts can use a projected load,
+    which reads only ``PROJECTED_FIELDS`` from Config on a miss. Saving it merges
+    the fields that changed into the cached sheet, loading the sheet first if needed.
+
+    Saves track what changed: only the top-level keys that differ and the backpack
+    entries added, modified or removed since the character was loaded are queued.
+    On drivers that write keys separately (Postgres) a flush writes just those
+    unless the whole sheet was replaced. Red's JSON driver rewrites the whole
+    settings file on every set or clear, so there each sheet is written with a
+    single set.
+
+    Large backpacks are stored in the compact layout from :mod:`.compact`. Cached
+    sheets always hold the plain layout; it is converted when read and written.
+    """
+
+    def __init__(self, config: Config, flush_interval: int = 30):
+        self._config = config
+        self.flush_interval = flush_interval
+        self._data: Dict[int, dict] = {}
+        # User ID -> (keys, backpack items) waiting to be written, or None for the whole sheet.
+        self._dirty: Dict[int, Optional[Tuple[Set[str], Set[str]]]] = {}
+        # Users whose backpack is stored compact.
+        self._compact: Set[int] = set()
+        # User ID -> when the cached sheet was last known to match Config. Only these are evicted.
+        self._clean_since: Dict[int, float] = {}
+        # Whether the driver writes a single key without rewriting everything else.
+        self.partial = not isinstance(config.driver, JsonDriver)
+        self._flush_task: Optional[asyncio.Task] = None
+        self.on_save: Optional[Callable[[int, dict], None]] = None
+        self.hits = 0
+        self.misses = 0
+        self.projected = 0
+        self.saves = 0
+        self.flushes = 0
+        self.writes = 0
+        self.partial_writes = 0
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._data
+
+    def is_dirty(self, user_id: int) -> bool:
+        return user_id in self._dirty
+
+    async def get_data(self, user: discord.abc.User) -> dict:
+        """Return a working copy of the stored character document for the user.
+
+        Top-level containers are copied, since :meth:`Character.from_json` keeps and
+        modifies them. The backpack is shared: it is only read into new items, and
+        copying it would cost as much as the read the cache saves.
+        """
+        if user.id in self._data:
+            self.hits += 1
+        else:
+            await self._fetch(user)
+        return {key: _copy_field(key, value) for (key, value) in self._data[user.id].items()}
+
+    async def _fetch(self, user: discord.abc.User) -> None:
+        self.misses += 1
+        data = await self._config.user(user).all()
+        # Another task may have cached and saved the sheet while this one was reading.
+        if user.id in self._data:
+            return
+        # Config fills in the registered defaults, including the legacy hero class and
+        # item backpack. A sheet that has their replacements never stored them, and
+        # keeping them would make every save see its items as changed.
+        if "heroclass" in data:
+            data.pop("class", None)
+        if "backpack" in data and not data.get("items", {}).get("backpack", True):
+            del data["items"]["backpack"]
+        if is_compact(data.get("backpack", {})):
+            data["backpack"] = decode_backpack(data["backpack"])
+            self._compact.add(user.id)
+        self._data[user.id] = data
+        self._clean_since[user.id] = time.monotonic()
+
+    async def get_fields(self, user: discord.abc.User, fields: Iterable[str]) -> dict:
+        """Return working copies of some fields of the character document.
+
+        A cached document is used as is; otherwise only these fields are read from
+        Config. Fields that aren't registered and were never saved are left out.
+        """
+        if user.id in self._data:
+            self.hits += 1
+            data = self._data[user.id]
+            return {field: _copy_field(field, data[field]) for field in fields if field in data}
+        self.projected += 1
+        group = self._config.user(user)
+        data = {}
+        for field in fields:
+            with contextlib.suppress(KeyError):
+                data[field] = await group.get_raw(field)
+        return data
+
+    async def load(self, user: discord.abc.User, daily_bonus_mapping: Dict[str, float]) -> Character:
+        """Build a Character for the user, reading Config only on a cache miss."""
+        data = await self.get_data(user)
+        stored = set(data.get("backpack", ()))
+        character = await Character.from_json(self._config, user, daily_bonus_mapping, data=data)
+        if stored == set(character.backpack):
+            character.backpack.mark_saved()
+        return character
+
+    async def load_projected(self, user: discord.abc.User, daily_bonus_mapping: Dict[str, float]) -> Character:
+        """Build a Character from ``PROJECTED_FIELDS`` only.
+
+        Its backpack and loadouts are empty and ``set_items`` keeps the stored count.
+        :meth:`save` merges only the projected fields into the stored sheet.
+        """
+        data = await self.get_fields(user, PROJECTED_FIELDS)
+        set_items = data.get("set_items", 0)
+        character = await Character.from_json(
+            self._config, user, daily_bonus_mapping, data={**data, "backpack": {}, "loadouts": {}}
+        )
+        character.set_items = set_items
+        character.projected = True
+        return character
+
+    async def save(self, user: discord.abc.User, character: Character) -> None:
+        """Store the character and queue it to be written back to Config."""
+        if not character.projected:
+            await self._save_changes(user.id, character)
+            return
+        data = await character.to_json(self._config, backpack=False)
+        fields = {field: data[field] for field in PROJECTED_FIELDS if field in data}
+        if user.id not in self._data:
+            # Merge into the full sheet so the fields are written with the rest of it, once.
+            await self._fetch(user)
+        cached = self._data[user.id]
+        keys = [field for (field, value) in fields.items() if cached.get(field, _MISSING) != value]
+        if not keys:
+            self.saves += 1
+            return
+        self._store(user.id, {**cached, **{key: deepcopy(fields[key]) for key in keys}}, keys=keys)
+
+    async def _save_changes(self, user_id: int, character: Character) -> None:
+        changes = character.backpack.changes()
+        data = await character.to_json(self._config, backpack=changes is None)
+        cached = self._data.get(user_id)
+        if changes is None or cached is None or "backpack" not in cached:
+            if "backpack" not in data:
+                data = await character.to_json(self._config)
+            self.set_data(user_id, data)
+            character.backpack.mark_saved()
+            return
+        keys = [key for (key, value) in data.items() if cached.get(key, _MISSING) != value]
+        (changed, removed) = changes
+        if not keys and not changed and not removed:
+            self.saves += 1
+            return
+        backpack = dict(cached["backpack"])
+        for name in changed:
+            backpack.update(character.backpack[name].to_json())
+        for name in removed:
+            backpack.pop(name, None)
+        update = {key: deepcopy(data[key]) for key in keys}
+        self._store(user_id, {**cached, **update, "backpack": backpack}, keys=keys, items=[*changed, *removed])
+        character.backpack.mark_saved()
+
+    def set_data(self, user_id: int, data: dict) -> None:
+        """Replace the whole cached sheet; the next flush rewrites all of it.
+
+        ``data`` may come straight from Config, so a compact backpack is decoded
+        to keep cached sheets in the plain layout.
+        """
+        data = deepcopy(data)
+        if is_compact(data.get("backpack", {})):
+            data["backpack"] = decode_backpack(data["backpack"])
+        self._store(user_id, data)
+
+    def _store(
+        self, user_id: int, data: dict, keys: Optional[Iterable[str]] = None, items: Iterable[str] = ()
+    ) -> None:
+        self.saves += 1
+        self._data[user_id] = data
+        self._mark_dirty(user_id, keys, items)
+        if self.on_save is not None:
+            self.on_save(user_id, data)
+
+    def _mark_dirty(self, user_id: int, keys: Optional[Iterable[str]] = None, items: Iterable[str] = ()) -> None:
+        self._clean_since.pop(user_id, None)
+        if keys is None:
+            self._dirty[user_id] = None
+        elif user_id not in self._dirty:
+            self._dirty[user_id] = (set(keys), set(items))
+        elif (pending := self._dirty[user_id]) is not None:
+            pending[0].update(keys)
+            pending[1].update(items)
+
+    def migrate(self, user_id: int, migrate: Callable[[dict], bool]) -> bool:
+        """Apply ``migrate`` to a cached sheet in place; if it reports a change, the whole sheet is rewritten."""
+        data = self._data.get(user_id)
+        if data is None or not migrate(data):
+            return False
+        self._mark_dirty(user_id)
+        return True
+
+    def invalidate(self, user_id: int) -> None:
+        """Forget the cached sheet without writing it back."""
+        self._data.pop(user_id, None)
+        self._dirty.pop(user_id, None)
+        self._compact.discard(user_id)
+        self._clean_since.pop(user_id, None)
+
+    async def flush(self, user_id: Optional[int] = None) -> int:
+        """Write dirty sheets back to Config.
+
+        If ``user_id`` is given only that user is written. Returns the number of
+        documents written.
+        """
+        if user_id is None:
+            to_write = list(self._dirty)
+        elif user_id in self._dirty:
+            to_write = [user_id]
+        else:
+            return 0
+        self.flushes += 1
+        written = 0
+        for uid in to_write:
+            if uid not in self._dirty:
+                continue
+            changes = self._dirty.pop(uid)
+            data = self._data.get(uid)
+            if data is None:
+                continue
+            try:
+                await self._write(uid, data, changes)
+            except Exception as exc:
+                if changes is None:
+                    self._mark_dirty(uid)
+                else:
+                    self._mark_dirty(uid, *changes)
+                log.exception("Failed to write character sheet for %s", uid, exc_info=exc)
+            else:
+                written += 1
+                if uid not in self._dirty:
+                    self._clean_since[uid] = time.monotonic()
+        self.writes += written
+        return written
+
+    async def _write(self, user_id: int, data: dict, changes: Optional[Tuple[Set[str], Set[str]]]) -> None:
+        group = self._config.user_from_id(user_id)
+        backpack = data.get("backpack", {})
+        was_compact = user_id in self._compact
+        compact = should_compact(len(backpack), was_compact)
+        if changes is None or not self.partial or sum(map(len, changes)) > MAX_DELTA_WRITES:
+            await group.set({**data, "backpack": encode_backpack(backpack)} if compact else data)
+        else:
+            (keys, items) = changes
+            for key in keys:
+                await group.set_raw(key, value=data[key])
+            self.partial_writes += 1
+            if not items:
+                return
+            if compact or was_compact:
+                # A compact backpack is a single value, so it is written as a whole.
+                await group.set_raw("backpack", value=encode_backpack(backpack) if compact else backpack)
+            else:
+                for name in items:
+                    if name in backpack:
+                        await group.set_raw("backpack", name, value=backpack[name])
+                    else:
+                        await group.clear_raw("backpack", name)
+        if compact:
+            self._compact.add(user_id)
+        else:
+            self._compact.discard(user_id)
+
+    def schedule_flush(self, user_id: Optional[int] = None) -> asyncio.Task:
+        return asyncio.get_event_loop().create_task(self.flush(user_id))
+
+    def start(self) -> None:
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_event_loop().create_task(self._flush_loop())
+
+    def stop(self) -> Optional[asyncio.Task]:
+        """Stop the timer and write back whatever is still dirty."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._dirty:
+            return self.schedule_flush()
+        return None
+
+    async def _flush_loop(self) -> None:
+        with contextlib.suppress(asyncio.CancelledError):
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                if self._dirty:
+                    await self.flush()
+                self.evict()
+
+    def evict(self, idle: Optional[float] = None) -> int:
+        """Drop sheets that have matched Config for at least ``idle`` seconds (the flush interval by default).
+
+        Clean entries are cheap to reload; dropping them keeps the cache from growing
+        with every user who ever played. A sheet waiting to be written, being written
+        or whose last write failed is never dropped. Returns the number dropped.
+        """
+        cutoff = time.monotonic() - (self.flush_interval if idle is None else idle)
+        stale = [uid for (uid, since) in self._clean_since.items() if since <= cutoff and uid not in self._dirty]
+        for uid in stale:
+            del self._clean_since[uid]
+            self._data.pop(uid, None)
+            self._compact.discard(uid)
+        return len(stale)
+
+    def stats(self) -> MutableMapping[str, int]:
+        return {
+            "cached": len(self._data),
+            "dirty": len(self._dirty),
+            "hits": self.hits,
+            "misses": self.misses,
+            "projected": self.projected,
+            "saves": self.saves,
+            "flushes": self.flushes,
+            "writes": self.writes,
+            "partial_writes": self.partial_writes,
+        }
+
+
+class SettingsCache:
+    """In-memory snapshot of the settings read on every message, reaction and adventure.
+
+    Values are read from Config the first time they are needed and kept until the
+    command that changes them calls :meth:`forget` or :meth:`forget_guild`.
+    """
+
+    def __init__(self, config: Config):
+        self._config = config
+        self._global: Dict[str, Any] = {}
+        self._cart_channels: Dict[int, List[int]] = {}
+        self.reads = 0
+        self.saved: Counter = Counter()
+
+    async def get(self, name: str) -> Any:
+        """Return the global setting ``name``. Don't mutate the result."""
+        if name in self._global:
+            self.saved[name] += 1
+        else:
+            self.reads += 1
+            self._global[name] = await self._config.get_attr(name)()
+        return self._global[name]
+
+    async def cart_channels(self, guild: discord.Guild) -> List[int]:
+        if guild.id in self._cart_channels:
+            self.saved["cart_channels"] += 1
+        else:
+            self.reads += 1
+            self._cart_channels[guild.id] = await self._config.guild(guild).cart_channels() or []
+        return self._cart_channels[guild.id]
+
+    def forget(self, name: str) -> None:
+        self._global.pop(name, None)
+
+    def forget_guild(self, guild_id: int) -> None:
+        self._cart_channels.pop(guild_id, None)
+
+    def stats(self) -> MutableMapping[str, int]:
+        return {"reads": self.reads, "saved": sum(self.saved.values()), **self.saved}
+
+
+class AdventureSettlement:
+    """Batches every participant's character changes for a single adventure.
+
+    Each participant's sheet is loaded once and shared by all resolution steps
+    (fight, pray, talk, run, rewards), which only read it. Changes are made
+    through :meth:`update`: the change is applied to the shared character at once
+    and recorded. :meth:`commit` then takes each participant's lock, loads their
+    current sheet, replays their changes on it and saves it once, so whatever
+    the player did in the meantime is kept.
+    """
+
+    def __init__(
+        self,
+        cache: CharacterCache,
+        daily_bonus_mapping: Dict[str, float],
+        lock: Callable[[discord.abc.User], asyncio.Lock],
+    ):
+        self._cache = cache
+        self._daily_bonus = daily_bonus_mapping
+        self._lock = lock
+        self._characters: Dict[int, Character] = {}
+        self._users: Dict[int, discord.abc.User] = {}
+        # User ID -> changes to replay on the user's current sheet at commit.
+        self._changes: Dict[int, List[Callable[[Character], Any]]] = {}
+        self.loads = 0
+        self.writes = 0
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._characters
+
+    async def get(self, user: discord.abc.User) -> Character:
+        """Return the participant's character. Don't modify it; use :meth:`update`.
+
+        The sheet is loaded under the user's lock, so it is never read halfway
+        through a command that is changing it.
+        """
+        if user.id not in self._characters:
+            async with self._lock(user):
+                if user.id not in self._characters:
+                    self._characters[user.id] = await self._cache.load(user, self._daily_bonus)
+                    self._users[user.id] = user
+                    self.loads += 1
+        return self._characters[user.id]
+
+    async def preload(self, users: Iterable[discord.abc.User], limit: int = PRELOAD_CONCURRENCY) -> int:
+        """Load the sheets (and with them the balances) of ``users``, ``limit`` at a time.
+
+        Each sheet is loaded under its user's lock, like :meth:`get`. It is only
+        read until :meth:`commit`, which loads it again, so loading early can't
+        cause a later change to be lost. A sheet that fails to load is left out; :meth:`get` tries it again and raises
+        where the resolvers already handle the error. Returns the number loaded.
+        """
+        semaphore = asyncio.Semaphore(limit)
+        pending = [user for user in {user.id: user for user in users}.values() if user.id not in self._characters]
+
+        async def load(user: discord.abc.User) -> bool:
+            async with semaphore:
+                try:
+                    await self.get(user)
+                except Exception as exc:
+                    log.debug("Could not preload the character sheet for %s", user.id, exc_info=exc)
+                    return False
+                return True
+
+        loaded = await asyncio.gather(*(load(user) for user in pending))
+        return sum(loaded)
+
+    @staticmethod
+    async def _apply(change: Callable[[Character], Any], character: Character) -> Any:
+        result = change(character)
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    async def update(self, user: discord.abc.User, change: Callable[[Character], Any]) -> Any:
+        """Apply ``change`` to the participant's character and record it for :meth:`commit`.
+
+        ``change`` takes a Character and may be a coroutine function. It runs again
+        on a fresh load at commit, so it must change the sheet relative to what is
+        there (add experience, count a win) and not copy values out of the shared
+        character. Returns what the first run returned.
+        """
+        character = await self.get(user)
+        result = await self._apply(change, character)
+        self._changes.setdefault(user.id, []).append(change)
+        return result
+
+    async def commit(self) -> int:
+        """Replay the recorded changes on each participant's current sheet and write it back.
+
+        Returns the number of sheets written.
+        """
+        changes, self._changes = self._changes, {}
+        written = 0
+        for (uid, pending) in changes.items():
+            user = self._users[uid]
+            async with self._lock(user):
+                try:
+                    character = await self._cache.load(user, self._daily_bonus)
+                    for change in pending:
+                        await self._apply(change, character)
+                    await self._cache.save(user, character)
+                except Exception as exc:
+                    log.exception("Could not settle the adventure for %s", uid, exc_info=exc)
+                    continue
+                await self._cache.flush(uid)
+            written += 1
+        self.writes += written
+        log.debug("Adventure settled: %s sheets loaded, %s written", self.loads, written)
+        return written
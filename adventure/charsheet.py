@@ -7,14 +7,15 @@ import logging
 import random
 import re
 import shlex
+import sys
+import weakref
 from collections import defaultdict
-from copy import copy
 from datetime import date, datetime, timedelta
+from functools import lru_cache
 from string import ascii_letters, digits
-from typing import Any, Dict, List, Mapping, MutableMapping, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple, Union
 
 import discord
-from beautifultable import ALIGN_LEFT, BeautifulTable
 from discord.ext.commands import check
 from discord.ext.commands.converter import Converter
 from discord.ext.commands.errors import BadArgument
@@ -27,6 +28,8 @@ from redbot.core.utils.menus import start_adding_reactions
 from redbot.core.utils.predicates import ReactionPredicate
 
 from . import bank
+from .compact import decode_backpack, is_compact
+from .paginator import TablePaginator
 
 log = logging.getLogger("red.cogs.adventure")
 
@@ -167,35 +170,177 @@ class Stats(Converter):
         return result
 
 
+# Marker -> (rarity, replacements applied to the stored name).
+# "{...:'" markers are looked up by everything up to and including the first ":'".
+ITEM_NAME_MARKERS: Mapping[str, Tuple[str, Tuple[Tuple[str, str], ...]]] = {
+    ".": ("rare", (("_", " "), (".", ""))),
+    "[": ("epic", (("[", ""), ("]", ""))),
+    "{Legendary:'": ("legendary", (("{Legendary:'", ""), ("'}", ""))),
+    "{legendary:'": ("legendary", (("{legendary:'", ""), ("'}", ""))),
+    "{Ascended:'": ("ascended", (("{Ascended:'", ""), ("'}", ""))),
+    "{ascended:'": ("ascended", (("{ascended:'", ""), ("'}", ""))),
+    "{Gear_Set:'": ("set", (("{Gear_Set:'", ""), ("'}", ""))),
+    "{Gear Set:'": ("set", (("{Gear Set:'", ""), ("'}", ""))),
+    "{gear_set:'": ("set", (("{gear_set:'", ""), ("'}", ""))),
+    "{Set:'": ("set", (("{Set:''", ""), ("''}", ""))),
+    "{set:'": ("set", (("{set:''", ""), ("''}", ""))),
+    "{.:'": ("forged", (("{.:'", ""), ("':.}", ""))),
+    "{Event:'": ("event", (("{Event:'", ""), ("''}", ""))),
+}
+
+
+@lru_cache(maxsize=65536)
+def parse_item_name(name: str) -> Tuple[str, str]:
+    """Split a stored backpack key into its plain name and the rarity its markers imply."""
+    if not name:
+        return name, "normal"
+    if name[0] == "{":
+        end = name.find(":'")
+        marker = ITEM_NAME_MARKERS.get(name[: end + 2]) if end != -1 else None
+    else:
+        marker = ITEM_NAME_MARKERS.get(name[0])
+    if marker is None:
+        return name, "normal"
+    (rarity, replacements) = marker
+    for (old, new) in replacements:
+        name = name.replace(old, new)
+    return name, rarity
+
+
+class ItemTemplate:
+    """The static part of an item, shared by every copy of the same item.
+
+    Templates are interned, so identical items across all loaded backpacks
+    (and the set items in ``TR_GEAR_SET``) point at a single instance.
+    """
+
+    __slots__ = (
+        "name",
+        "slot",
+        "att",
+        "int",
+        "cha",
+        "rarity",
+        "dex",
+        "luck",
+        "set",
+        "parts",
+        "total_stats",
+        "max_main_stat",
+        "equip_level",
+        "__weakref__",
+    )
+
+    _interned: MutableMapping[tuple, ItemTemplate] = weakref.WeakValueDictionary()
+
+    def __init__(self, name, slot, att, int, cha, rarity, dex, luck, set, parts):
+        self.name: str = name
+        self.slot: List[str] = slot
+        self.att: int = att
+        self.int: int = int
+        self.cha: int = cha
+        self.rarity: str = rarity
+        self.dex: int = dex
+        self.luck: int = luck
+        self.set: bool = set
+        self.parts: int = parts
+        self.total_stats: int = att + int + cha + dex + luck
+        if len(slot) > 2:
+            self.total_stats *= 2
+        self.max_main_stat = max(att, int, cha, 1)
+        self.equip_level = self._get_equip_level()
+
+    @classmethod
+    def intern(cls, name, slot, att, int, cha, rarity, dex, luck, set, parts) -> ItemTemplate:
+        slot = list(slot)
+        key = (name, tuple(slot), att, int, cha, rarity, dex, luck, set, parts)
+        template = cls._interned.get(key)
+        if template is None:
+            template = cls(sys.intern(name), slot, att, int, cha, rarity, dex, luck, set, parts)
+            cls._interned[key] = template
+        return template
+
+    def _get_equip_level(self) -> int:
+        lvl = 1
+        if self.rarity not in ["forged"]:
+            # epic and legendary stats too similar so make level req's
+            # the same
+            rarity_multiplier = max(min(RARITIES.index(self.rarity) if self.rarity in RARITIES else 1, 5), 1)
+            mult = 1 + (rarity_multiplier / 10)
+            positive_stats = (
+                sum([i for i in [self.att, self.int, self.cha, self.dex, self.luck] if i > 0])
+                * mult
+                * (1.7 if len(self.slot) == 2 else 1)
+            )
+            negative_stats = (
+                sum([i for i in [self.att, self.int, self.cha, self.dex, self.luck] if i < 0])
+                / 2
+                * (1.7 if len(self.slot) == 2 else 1)
+            )
+            lvl = positive_stats + negative_stats
+        return max(int(lvl), 1)
+
+
+def loadout_reference(entry: Union[str, Mapping[str, dict], None]) -> Optional[str]:
+    """The backpack key a loadout slot points at, or None for an empty slot.
+
+    Loadouts used to store a full copy of each item; those entries resolve to the
+    item's name the same way equipping them always looked the item up.
+    """
+    if entry is None or isinstance(entry, str):
+        return entry
+    if not entry:
+        return None
+    return Item.remove_markdowns("".join(entry.keys()))
+
+
+def _template_property(attr: str) -> property:
+    return property(lambda self: getattr(self._template, attr))
+
+
 class Item:
     """An object to represent an item in the game world."""
 
+    __slots__ = ("_template", "owned", "degrade", "lvl")
+
     def __init__(self, **kwargs):
         if kwargs.get("rarity") in ["event"]:
-            self.name: str = kwargs.get("name")
+            name = kwargs.get("name")
         elif kwargs.get("rarity") in ["set", "legendary", "ascended"]:
-            self.name: str = kwargs.get("name").title()
+            name = kwargs.get("name").title()
         else:
-            self.name: str = kwargs.get("name").lower()
-        self.slot: List[str] = kwargs.get("slot")
-        self.att: int = kwargs.get("att")
-        self.int: int = kwargs.get("int")
-        self.cha: int = kwargs.get("cha")
-        self.rarity: str = kwargs.get("rarity")
-        self.dex: int = kwargs.get("dex")
-        self.luck: int = kwargs.get("luck")
+            name = kwargs.get("name").lower()
+        self._template: ItemTemplate = ItemTemplate.intern(
+            name=name,
+            slot=kwargs.get("slot"),
+            att=kwargs.get("att"),
+            int=kwargs.get("int"),
+            cha=kwargs.get("cha"),
+            rarity=kwargs.get("rarity"),
+            dex=kwargs.get("dex"),
+            luck=kwargs.get("luck"),
+            set=kwargs.get("set", False),
+            parts=kwargs.get("parts"),
+        )
         self.owned: int = kwargs.get("owned")
-        self.set: bool = kwargs.get("set", False)
-        self.parts: int = kwargs.get("parts")
-        self.total_stats: int = self.att + self.int + self.cha + self.dex + self.luck
-        if len(self.slot) > 2:
-            self.total_stats *= 2
-        self.max_main_stat = max(self.att, self.int, self.cha, 1)
         self.lvl: int = (
             kwargs.get("lvl") or self.get_equip_level()
         ) if self.rarity == "event" else self.get_equip_level()
         self.degrade = kwargs.get("degrade", 5)
 
+    name = _template_property("name")
+    slot = _template_property("slot")
+    att = _template_property("att")
+    int = _template_property("int")
+    cha = _template_property("cha")
+    rarity = _template_property("rarity")
+    dex = _template_property("dex")
+    luck = _template_property("luck")
+    set = _template_property("set")
+    parts = _template_property("parts")
+    total_stats = _template_property("total_stats")
+    max_main_stat = _template_property("max_main_stat")
+
     def __str__(self):
         if self.rarity == "normal":
             return self.name
@@ -221,24 +366,7 @@ class Item:
         return str(self)
 
     def get_equip_level(self):
-        lvl = 1
-        if self.rarity not in ["forged"]:
-            # epic and legendary stats too similar so make level req's
-            # the same
-            rarity_multiplier = max(min(RARITIES.index(self.rarity) if self.rarity in RARITIES else 1, 5), 1)
-            mult = 1 + (rarity_multiplier / 10)
-            positive_stats = (
-                sum([i for i in [self.att, self.int, self.cha, self.dex, self.luck] if i > 0])
-                * mult
-                * (1.7 if len(self.slot) == 2 else 1)
-            )
-            negative_stats = (
-                sum([i for i in [self.att, self.int, self.cha, self.dex, self.luck] if i < 0])
-                / 2
-                * (1.7 if len(self.slot) == 2 else 1)
-            )
-            lvl = positive_stats + negative_stats
-        return max(int(lvl), 1)
+        return self._template.equip_level
 
     @staticmethod
     def remove_markdowns(item):
@@ -274,46 +402,7 @@ class Item:
     def from_json(cls, data: dict):
         name = "".join(data.keys())
         data = data[name]
-        rarity = "normal"
-        if name.startswith("."):
-            name = name.replace("_", " ").replace(".", "")
-            rarity = "rare"
-        elif name.startswith("["):
-            name = name.replace("[", "").replace("]", "")
-            rarity = "epic"
-        elif name.startswith("{Legendary:'"):
-            name = name.replace("{Legendary:'", "").replace("'}", "")
-            rarity = "legendary"
-        elif name.startswith("{legendary:'"):
-            name = name.replace("{legendary:'", "").replace("'}", "")
-            rarity = "legendary"
-        elif name.startswith("{Ascended:'"):
-            name = name.replace("{Ascended:'", "").replace("'}", "")
-            rarity = "ascended"
-        elif name.startswith("{ascended:'"):
-            name = name.replace("{ascended:'", "").replace("'}", "")
-            rarity = "ascended"
-        elif name.startswith("{Gear_Set:'"):
-            name = name.replace("{Gear_Set:'", "").replace("'}", "")
-            rarity = "set"
-        elif name.startswith("{Gear Set:'"):
-            name = name.replace("{Gear Set:'", "").replace("'}", "")
-            rarity = "set"
-        elif name.startswith("{gear_set:'"):
-            name = name.replace("{gear_set:'", "").replace("'}", "")
-            rarity = "set"
-        elif name.startswith("{Set:'"):
-            name = name.replace("{Set:''", "").replace("''}", "")
-            rarity = "set"
-        elif name.startswith("{set:'"):
-            name = name.replace("{set:''", "").replace("''}", "")
-            rarity = "set"
-        elif name.startswith("{.:'"):
-            name = name.replace("{.:'", "").replace("':.}", "")
-            rarity = "forged"
-        elif name.startswith("{Event:'"):
-            name = name.replace("{Event:'", "").replace("''}", "")
-            rarity = "event"
+        name, rarity = parse_item_name(name)
         rarity = data["rarity"] if "rarity" in data else rarity
         att = data["att"] if "att" in data else 0
         dex = data["dex"] if "dex" in data else 0
@@ -365,16 +454,21 @@ class Item:
         if db and self.rarity == "set":
             updated_set = db.get(self.name)
             if updated_set:
-                self.att = updated_set.get("att", self.att)
-                self.int = updated_set.get("int", self.int)
-                self.cha = updated_set.get("cha", self.cha)
-                self.dex = updated_set.get("dex", self.dex)
-                self.luck = updated_set.get("luck", self.luck)
-                self.set = updated_set.get("set", self.set)
-                self.parts = updated_set.get("parts", self.parts)
+                self._template = ItemTemplate.intern(
+                    name=self.name,
+                    slot=self.slot,
+                    att=updated_set.get("att", self.att),
+                    int=updated_set.get("int", self.int),
+                    cha=updated_set.get("cha", self.cha),
+                    rarity=self.rarity,
+                    dex=updated_set.get("dex", self.dex),
+                    luck=updated_set.get("luck", self.luck),
+                    set=updated_set.get("set", self.set),
+                    parts=updated_set.get("parts", self.parts),
+                )
         data = {
             self.name: {
-                "slot": self.slot,
+                "slot": list(self.slot),
                 "att": self.att,
                 "int": self.int,
                 "cha": self.cha,
@@ -400,6 +494,171 @@ class Item:
         return data
 
 
+class Backpack(dict):
+    """A character's backpack, keyed by item name, with secondary indexes.
+
+    Item names are indexed by slot, rarity, set and level as items are added and
+    removed, so filters can start from the items that can possibly match instead of
+    scanning the whole backpack.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self._next_position = 0
+        self._positions: Dict[str, int] = {}
+        self._indexed: Dict[str, tuple] = {}
+        self.by_slot: MutableMapping[str, Set[str]] = defaultdict(set)
+        self.by_rarity: MutableMapping[str, Set[str]] = defaultdict(set)
+        self.by_set: MutableMapping[Any, Set[str]] = defaultdict(set)
+        self.by_level: MutableMapping[Tuple[int, bool], Set[str]] = defaultdict(set)
+        self._saved: Optional[Dict[str, tuple]] = None
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    def _index(self, name: str, item: Item) -> None:
+        template = item._template
+        keys = (
+            template.slot[0] if len(template.slot) < 2 else "two handed",
+            template.rarity,
+            template.set,
+            (item.lvl, template.rarity == "event"),
+        )
+        self._indexed[name] = keys
+        for (index, key) in zip((self.by_slot, self.by_rarity, self.by_set, self.by_level), keys):
+            index[key].add(name)
+
+    def _unindex(self, name: str) -> None:
+        keys = self._indexed.pop(name, None)
+        if keys is None:
+            return
+        for (index, key) in zip((self.by_slot, self.by_rarity, self.by_set, self.by_level), keys):
+            index[key].discard(name)
+            if not index[key]:
+                del index[key]
+
+    def __setitem__(self, name: str, item: Item) -> None:
+        if name in self:
+            self._unindex(name)
+        else:
+            self._positions[name] = self._next_position
+            self._next_position += 1
+        super().__setitem__(name, item)
+        self._index(name, item)
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self._unindex(name)
+        del self._positions[name]
+
+    def pop(self, name: str, *default):
+        if name not in self:
+            return super().pop(name, *default)
+        item = self[name]
+        del self[name]
+        return item
+
+    def popitem(self) -> Tuple[str, Item]:
+        (name, item) = super().popitem()
+        self._unindex(name)
+        del self._positions[name]
+        return name, item
+
+    def setdefault(self, name: str, default: Item = None) -> Item:
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args, **kwargs) -> None:
+        for (name, item) in dict(*args, **kwargs).items():
+            self[name] = item
+
+    def clear(self) -> None:
+        super().clear()
+        self._positions.clear()
+        self._indexed.clear()
+        for index in (self.by_slot, self.by_rarity, self.by_set, self.by_level):
+            index.clear()
+
+    @staticmethod
+    def _signature(item: Item) -> tuple:
+        return item._template, item.owned, item.degrade, item.lvl
+
+    def mark_saved(self) -> None:
+        """Remember the items as they are now stored, so :meth:`changes` can tell what differs."""
+        if all(item.name == name for (name, item) in self.items()):
+            self._saved = {name: self._signature(item) for (name, item) in self.items()}
+        else:
+            self._saved = None
+
+    def changes(self) -> Optional[Tuple[List[str], List[str]]]:
+        """Names of the items added or modified and of the items removed since :meth:`mark_saved`.
+
+        Returns None if the backpack was never marked saved, or if an item is stored
+        under a name other than its own, in which case it has to be written in full.
+        """
+        if self._saved is None:
+            return None
+        changed = [name for (name, item) in self.items() if self._saved.get(name) != self._signature(item)]
+        if any(self[name].name != name for name in changed):
+            return None
+        removed = [name for name in self._saved if name not in self]
+        return changed, removed
+
+    @staticmethod
+    def _union(index: Mapping[Any, Set[str]], keys: Iterable) -> Set[str]:
+        names = set()
+        for key in keys:
+            names |= index.get(key, set())
+        return names
+
+    def select(
+        self,
+        slots: List[str] = None,
+        rarities: List[str] = None,
+        sets: List[str] = None,
+        level_check: Callable[[Item], bool] = None,
+        exclude: bool = False,
+        rarity_exclude: List[str] = None,
+    ) -> List[str]:
+        """Return the names of the items that can match a filter, in backpack order.
+
+        Slots, rarities and sets keep matching items, or drop them if ``exclude`` is
+        set. ``level_check`` is called with one item per level group. Callers still
+        apply their full filter to the returned items.
+        """
+        groups = []
+        if not exclude:
+            if slots:
+                groups.append(self._union(self.by_slot, slots))
+            if sets:
+                groups.append(self.by_rarity.get("set", set()))
+                groups.append(self._union(self.by_set, sets))
+            elif rarities:
+                groups.append(self._union(self.by_rarity, rarities))
+        if level_check is not None:
+            groups.append(
+                {
+                    name
+                    for names in self.by_level.values()
+                    if level_check(self[next(iter(names))])
+                    for name in names
+                }
+            )
+        if not groups and not exclude and not rarity_exclude:
+            return list(self)
+
+        names = set.intersection(*groups) if groups else set(self)
+        if exclude:
+            names -= self._union(self.by_slot, slots or [])
+            names -= self._union(self.by_rarity, rarities or [])
+            names -= self._union(self.by_set, sets or [])
+        if rarity_exclude:
+            names -= self._union(self.by_rarity, rarity_exclude)
+        return sorted(names, key=self._positions.__getitem__)
+
+
 class GameSession:
     """A class to represent and hold current game sessions per server."""
 
@@ -412,19 +671,19 @@ class GameSession:
     monster: dict
     message_id: int
     reacted: bool = False
-    participants: Set[discord.Member] = set()
-    monster_modified_stats: MutableMapping = {}
-    fight: List[discord.Member] = []
-    magic: List[discord.Member] = []
-    talk: List[discord.Member] = []
-    pray: List[discord.Member] = []
-    run: List[discord.Member] = []
+    participants: Set[discord.Member]
+    actions: Dict[int, str]
+    monster_modified_stats: MutableMapping
+    fight: List[discord.Member]
+    magic: List[discord.Member]
+    talk: List[discord.Member]
+    pray: List[discord.Member]
+    run: List[discord.Member]
     message: discord.Message = None
     transcended: bool = False
     insight: Tuple[float, Character] = (0, None)
-    start_time: datetime = datetime.now()
+    start_time: datetime
     easy_mode: bool = False
-    insight = (0, None)
     no_monster: bool = False
     exposed: bool = False
     finished: bool = False
@@ -449,15 +708,115 @@ class GameSession:
         self.talk: List[discord.Member] = []
         self.pray: List[discord.Member] = []
         self.run: List[discord.Member] = []
+        self.actions: Dict[int, str] = {}
         self.transcended: bool = kwargs.pop("transcended", False)
         self.start_time = datetime.now()
         self.easy_mode = kwargs.get("easy_mode", False)
         self.no_monster = kwargs.get("no_monster", False)
+        self.settlement = kwargs.pop("settlement", None)
+
+    def action_of(self, user: discord.abc.User) -> Optional[str]:
+        """The action the user has picked in this session, if any."""
+        return self.actions.get(user.id)
+
+    def join(self, user: discord.abc.User, action: str) -> None:
+        self.leave(user)
+        getattr(self, action).append(user)
+        self.actions[user.id] = action
+
+    def leave(self, user: discord.abc.User) -> Optional[str]:
+        """Take the user out of whichever action they picked and return it."""
+        action = self.actions.pop(user.id, None)
+        if action is not None and user in getattr(self, action):
+            getattr(self, action).remove(user)
+        return action
+
+
+def rebirth_stat_points(rebirths: int) -> int:
+    """Points every stat gets from rebirths.
+
+    Each rebirth up to the 9th is worth 2 points, the 10th to 19th 1, the 20th to
+    29th 5 and every later one 3, plus 5 for every full 10 rebirths.
+    """
+    return (
+        rebirths // 10 * 5
+        + 2 * max(min(rebirths, 9), 0)
+        + max(min(rebirths, 19) - 9, 0)
+        + 5 * max(min(rebirths, 29) - 19, 0)
+        + 3 * max(rebirths - 29, 0)
+    )
+
+
+# Slots an item can be equipped in, in the order Character reads them.
+GEAR_SLOTS = tuple(slot for slot in ORDER if slot != "two handed")
+STATS = ("att", "cha", "int", "dex", "luck")
+
+
+@lru_cache(maxsize=4096)
+def gear_stats(gear: Tuple[Optional[ItemTemplate], ...], rebirths: int) -> Tuple[dict, List[str], dict]:
+    """Set bonus, completed sets and stats of the templates equipped in ``GEAR_SLOTS``.
+
+    Templates are interned, so a character keeps hitting the same entry until its
+    gear or rebirths change. Depends on ``SET_BONUSES``; clear it when a theme loads.
+
+    Returns ``(gear_set_bonus, sets, stats)`` where ``stats`` maps each stat to the
+    ``(total, base)`` pair :meth:`Character.get_stat_value` returns.
+    """
+    set_names = {}
+    added = []
+    for item in gear:
+        if item is None or item.name in added:
+            continue
+        if item.set and item.set not in set_names:
+            added.append(item.name)
+            set_names[item.set] = (item.parts, 1)
+        elif item.set:
+            added.append(item.name)
+            parts, count = set_names[item.set]
+            set_names[item.set] = (parts, count + 1)
+    sets = [s for (s, (parts, count)) in set_names.items() if count >= parts and s]
+    bonus = {"att": 0, "cha": 0, "int": 0, "dex": 0, "luck": 0, "statmult": 1, "xpmult": 1, "cpmult": 1}
+    for (_set, (_, count)) in set_names.items():
+        for set_bonus in SET_BONUSES.get(_set, []):
+            if set_bonus.get("parts", 100) > count:
+                continue
+            for (key, value) in set_bonus.items():
+                if key == "parts":
+                    continue
+                if key not in ["cpmult", "xpmult", "statmult"]:
+                    bonus[key] += value
+                elif value > 1:
+                    bonus[key] += value - 1
+                elif value >= 0:
+                    bonus[key] -= 1 - value
+    bonus["cpmult"] = max(0, bonus["cpmult"])
+    bonus["xpmult"] = max(0, bonus["xpmult"])
+    bonus["statmult"] = max(-0.25, bonus["statmult"])
+
+    extrapoints = rebirth_stat_points(rebirths)
+    stats = {}
+    for stat in STATS:
+        base = extrapoints + sum(int(getattr(item, stat)) for item in gear if item is not None)
+        stats[stat] = (int(base * bonus["statmult"]) + bonus[stat], base)
+    return bonus, sets, stats
 
 
 class Character(Item):
     """An class to represent the characters stats."""
 
+    # A character has no item template; these are plain attributes set in __init__.
+    att = int = cha = dex = luck = total_stats = None
+    # Loaded without its backpack and loadouts; see CharacterCache.load_projected.
+    projected = False
+
+    @property
+    def backpack(self) -> Backpack:
+        return self._backpack
+
+    @backpack.setter
+    def backpack(self, value: Mapping[str, Item]) -> None:
+        self._backpack = value if isinstance(value, Backpack) else Backpack(value)
+
     def __init__(self, **kwargs):
         self.exp: int = kwargs.pop("exp")
         self.lvl: int = kwargs.pop("lvl")
@@ -473,7 +832,7 @@ class Character(Item):
         self.right: Item = kwargs.pop("right")
         self.ring: Item = kwargs.pop("ring")
         self.charm: Item = kwargs.pop("charm")
-        self.backpack: dict = kwargs.pop("backpack")
+        self.backpack: Backpack = kwargs.pop("backpack")
         self.loadouts: dict = kwargs.pop("loadouts")
         self.heroclass: dict = kwargs.pop("heroclass")
         self.skill: dict = kwargs.pop("skill")
@@ -549,36 +908,12 @@ class Character(Item):
 
     def get_stat_value(self, stat: str):
         """Calculates the stats dynamically for each slot of equipment."""
-        extrapoints = 0
-        rebirths = copy(self.rebirths)
-        extrapoints += rebirths // 10 * 5
-
-        for _loop_counter in range(rebirths):
-            if rebirths >= 30:
-                extrapoints += 3
-            elif rebirths >= 20:
-                extrapoints += 5
-            elif rebirths >= 10:
-                extrapoints += 1
-            elif rebirths < 10:
-                extrapoints += 2
-            rebirths -= 1
-
-        extrapoints = int(extrapoints)
-
-        stats = 0 + extrapoints
-        for slot in ORDER:
-            if slot == "two handed":
-                continue
-            try:
-                item = getattr(self, slot)
-                if item:
-                    stats += int(getattr(item, stat))
-            except Exception as exc:
-                log.error(f"error calculating {stat}", exc_info=exc)
-        return (
-            int(stats * self.gear_set_bonus.get("statmult", 1)) + self.gear_set_bonus.get(stat, 0),
-            stats,
+        return self._gear_stats()[2][stat]
+
+    def _gear_stats(self) -> Tuple[dict, List[str], dict]:
+        return gear_stats(
+            tuple(None if (item := getattr(self, slot)) is None else item._template for slot in GEAR_SLOTS),
+            self.rebirths,
         )
 
     async def get_set_count(self, return_items: bool = False, set_name: str = None):
@@ -611,58 +946,9 @@ class Character(Item):
         return set_names
 
     def get_set_bonus(self):
-        set_names = {}
-        last_slot = ""
-        base = {
-            "att": 0,
-            "cha": 0,
-            "int": 0,
-            "dex": 0,
-            "luck": 0,
-            "statmult": 1,
-            "xpmult": 1,
-            "cpmult": 1,
-        }
-        added = []
-        for slots in ORDER:
-            if slots == "two handed":
-                continue
-            if last_slot == "two handed":
-                last_slot = slots
-                continue
-            item = getattr(self, slots)
-            if item is None or item.name in added:
-                continue
-            if item.set and item.set not in set_names:
-                added.append(item.name)
-                set_names.update({item.set: (item.parts, 1, SET_BONUSES.get(item.set, []))})
-            elif item.set and item.set in set_names:
-                added.append(item.name)
-                parts, count, bonus = set_names[item.set]
-                set_names[item.set] = (parts, count + 1, bonus)
-        full_sets = [(s, v[1]) for s, v in set_names.items() if v[1] >= v[0]]
-        partial_sets = [(s, v[1]) for s, v in set_names.items()]
-        self.sets = [s for s, _ in full_sets if s]
-        for (_set, parts) in partial_sets:
-            set_bonuses = SET_BONUSES.get(_set, [])
-            for bonus in set_bonuses:
-                required_parts = bonus.get("parts", 100)
-                if required_parts > parts:
-                    continue
-                for (key, value) in bonus.items():
-                    if key == "parts":
-                        continue
-                    if key not in ["cpmult", "xpmult", "statmult"]:
-                        base[key] += value
-                    elif key in ["cpmult", "xpmult", "statmult"]:
-                        if value > 1:
-                            base[key] += value - 1
-                        elif value >= 0:
-                            base[key] -= 1 - value
-        self.gear_set_bonus = base
-        self.gear_set_bonus["cpmult"] = max(0, self.gear_set_bonus["cpmult"])
-        self.gear_set_bonus["xpmult"] = max(0, self.gear_set_bonus["xpmult"])
-        self.gear_set_bonus["statmult"] = max(-0.25, self.gear_set_bonus["statmult"])
+        (bonus, sets, stats) = self._gear_stats()
+        self.sets = list(sets)
+        self.gear_set_bonus = dict(bonus)
 
     def __str__(self):
         """Define str to be our default look for the character sheet :thinkies:"""
@@ -803,18 +1089,14 @@ class Character(Item):
         rebirths = max(self.rebirths, 0)
 
         if rebirths == 0:
-            maxlevel = 5
-        else:
-            maxlevel = REBIRTH_LVL
-
-        for _loop_counter in range(rebirths):
-            if rebirths >= 20:
-                maxlevel += REBIRTH_STEP
-            elif rebirths >= 10:
-                maxlevel += 10
-            elif rebirths < 10:
-                maxlevel += 5
-            rebirths -= 1
+            return 5
+        # Rebirths 1-9 add 5 levels each, 10-19 add 10 and every later one REBIRTH_STEP.
+        maxlevel = (
+            REBIRTH_LVL
+            + 5 * min(rebirths, 9)
+            + 10 * max(min(rebirths, 19) - 9, 0)
+            + REBIRTH_STEP * max(rebirths - 19, 0)
+        )
         return min(maxlevel, 10000)
 
     @staticmethod
@@ -903,24 +1185,10 @@ class Character(Item):
         else:
             msg = _("{author}'s forgeables\n\n").format(author=escape(self.user.display_name, formatting=True))
         msg_len = len(msg)
-        table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-        table.set_style(BeautifulTable.STYLE_RST)
-        tables = []
-        table.columns.header = [
-            "Name",
-            "Slot",
-            "ATT",
-            "CHA",
-            "INT",
-            "DEX",
-            "LUC",
-            "LVL",
-            "QTY",
-            "DEG",
-            "SET",
-        ]
+        paginator = TablePaginator(
+            ["Name", "Slot", "ATT", "CHA", "INT", "DEX", "LUC", "LVL", "QTY", "DEG", "SET"], prefix=msg
+        )
         consumed_list = consumed
-        remainder = False
         async for slot_group in AsyncIter(bkpk, steps=100):
             slot_name_org = slot_group[0][1].slot
             slot_name = slot_name_org[0] if len(slot_name_org) < 2 else "two handed"
@@ -941,24 +1209,6 @@ class Character(Item):
                     continue
                 if set_name is not None and set_name != item.set:
                     continue
-                if len(str(table)) > 1500:
-                    remainder = False
-                    tables.append(box(msg + str(table) + f"\nPage {len(tables) + 1}", lang="css"))
-                    table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-                    table.set_style(BeautifulTable.STYLE_RST)
-                    table.columns.header = [
-                        "Name",
-                        "Slot",
-                        "ATT",
-                        "CHA",
-                        "INT",
-                        "DEX",
-                        "LUC",
-                        "LVL",
-                        "QTY",
-                        "DEG",
-                        "SET",
-                    ]
                 if show_delta:
                     att = self.get_equipped_delta(current_equipped, item, "att")
                     cha = self.get_equipped_delta(current_equipped, item, "cha")
@@ -971,8 +1221,7 @@ class Character(Item):
                     int = item.int if len(slot_name_org) < 2 else item.int * 2
                     dex = item.dex if len(slot_name_org) < 2 else item.dex * 2
                     luck = item.luck if len(slot_name_org) < 2 else item.luck * 2
-                remainder = True
-                table.rows.append(
+                paginator.add_row(
                     (
                         str(item),
                         slot_name,
@@ -989,9 +1238,7 @@ class Character(Item):
                         item.set or "N/A",
                     )
                 )
-        if remainder:
-            tables.append(box(msg + str(table) + f"\nPage {len(tables) + 1}", lang="css"))
-        return tables
+        return paginator.pages()
 
     async def get_sorted_backpack_arg_parse(
         self,
@@ -1018,8 +1265,28 @@ class Character(Item):
         def _sort(item):
             return self.get_rarity_index(item), item[1].lvl, item[1].total_stats
 
+        names = backpack
         if not _except:
-            async for item_name in AsyncIter(backpack, steps=100):
+            if isinstance(backpack, Backpack):
+
+                def level_check(item):
+                    e_level = equip_level(self, item)
+                    if equippable and self.lvl < e_level:
+                        return False
+                    if level:
+                        if (d := level.get("equal")) is not None:
+                            return e_level == d
+                        return level["min"] < e_level < level["max"]
+                    return True
+
+                names = backpack.select(
+                    slots=slots,
+                    rarities=rarities,
+                    sets=sets,
+                    level_check=level_check if (equippable or level) else None,
+                    rarity_exclude=rarity_exclude,
+                )
+            async for item_name in AsyncIter(names, steps=100):
                 item = backpack[item_name]
                 item_slots = item.slot
                 slot_name = item_slots[0]
@@ -1102,7 +1369,27 @@ class Character(Item):
         else:
             rarities = [] if rarities == RARITIES else rarities
             slots = [] if slots == ORDER else slots
-            async for item_name in AsyncIter(backpack, steps=100):
+            if isinstance(backpack, Backpack):
+
+                def level_check(item):
+                    e_level = equip_level(self, item)
+                    if equippable and self.lvl >= e_level:
+                        return False
+                    if level:
+                        if (d := level.get("equal")) is not None:
+                            return e_level != d
+                        return not level["min"] < e_level < level["max"]
+                    return True
+
+                names = backpack.select(
+                    slots=slots,
+                    rarities=rarities,
+                    sets=sets,
+                    level_check=level_check if (equippable or level) else None,
+                    exclude=True,
+                    rarity_exclude=rarity_exclude,
+                )
+            async for item_name in AsyncIter(names, steps=100):
                 item = backpack[item_name]
                 item_slots = item.slot
                 slot_name = item_slots[0]
@@ -1225,9 +1512,6 @@ class Character(Item):
         )
 
         msg = _("{author}'s backpack\n\n").format(author=escape(self.user.display_name, formatting=True))
-        table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-        table.set_style(BeautifulTable.STYLE_RST)
-        tables = []
         headers = [
             "Name",
             "Slot",
@@ -1245,19 +1529,11 @@ class Character(Item):
         if sets or not rarities or "set" in rarities:
             headers.append("SET")
 
-        table.columns.header = headers
-
-        remainder = False
+        paginator = TablePaginator(headers, prefix=msg)
         async for slot_name, slot_group in AsyncIter(bkpk, steps=100):
             slot_name_org = slot_group[0][1].slot
             current_equipped = getattr(self, slot_name if slot_name != "two handed" else "left", None)
             async for item_name, item in AsyncIter(slot_group, steps=100):
-                if len(str(table)) > 1500:
-                    tables.append(box(msg + str(table) + f"\nPage {len(tables) + 1}", lang="css"))
-                    table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-                    table.set_style(BeautifulTable.STYLE_RST)
-                    table.columns.header = headers
-                    remainder = False
                 if delta:
                     att = self.get_equipped_delta(current_equipped, item, "att")
                     cha = self.get_equipped_delta(current_equipped, item, "cha")
@@ -1289,11 +1565,8 @@ class Character(Item):
                     )
                 if "SET" in headers:
                     data.append(item.set or "N/A",)
-                table.rows.append(data)
-                remainder = True
-        if remainder:
-            tables.append(box(msg + str(table) + f"\nPage {len(tables) + 1}", lang="css"))
-        return tables
+                paginator.add_row(data)
+        return paginator.pages()
 
     async def get_argparse_backpack_items(
         self, query: MutableMapping[str, Any], rarity_exclude: List[str] = None
@@ -1392,47 +1665,40 @@ class Character(Item):
                 self.backpack[item.name] = item
 
     async def equip_loadout(self, loadout_name):
+        """Equip the items a loadout points at; one backpack lookup per slot.
+
+        Slots whose item is no longer owned are emptied. Items above the
+        character's level are skipped by :meth:`equip_item`.
+        """
         loadout = self.loadouts[loadout_name]
-        for (slot, item) in loadout.items():
-            name_unformatted = "".join(item.keys())
-            name = Item.remove_markdowns(name_unformatted)
+        for (slot, name) in loadout.items():
             current = getattr(self, slot)
-            if current and current.name == name_unformatted:
+            if current and current.name == name:
                 continue
-            if current and current.name != name_unformatted:
+            if current:
                 await self.unequip_item(current)
-            if name not in self.backpack:
-                setattr(self, slot, None)
-            else:
-                if item.get("rarity", "common") == "event":
-                    equiplevel = item.get(
-                        "lvl", max((item.get("lvl", 1) - min(max(self.rebirths // 2 - 1, 0), 50)), 1),
-                    )
-                else:
-                    equiplevel = max((item.get("lvl", 1) - min(max(self.rebirths // 2 - 1, 0), 50)), 1)
-                if equiplevel > self.lvl:
-                    continue
-
+            if name in self.backpack:
                 await self.equip_item(self.backpack[name], True)
+            else:
+                setattr(self, slot, None)
 
         return self
 
+    def loadout_items(self, loadout_name) -> Dict[str, Optional[Item]]:
+        """The items a loadout points at by slot, from the equipment or the backpack."""
+        items = {}
+        for (slot, name) in self.loadouts[loadout_name].items():
+            current = getattr(self, slot)
+            if current and current.name == name:
+                items[slot] = current
+            else:
+                items[slot] = self.backpack.get(name) if name else None
+        return items
+
     @staticmethod
     async def save_loadout(char):
-        """Return a dict of currently equipped items for loadouts."""
-        return {
-            "head": char.head.to_json() if char.head else {},
-            "neck": char.neck.to_json() if char.neck else {},
-            "chest": char.chest.to_json() if char.chest else {},
-            "gloves": char.gloves.to_json() if char.gloves else {},
-            "belt": char.belt.to_json() if char.belt else {},
-            "legs": char.legs.to_json() if char.legs else {},
-            "boots": char.boots.to_json() if char.boots else {},
-            "left": char.left.to_json() if char.left else {},
-            "right": char.right.to_json() if char.right else {},
-            "ring": char.ring.to_json() if char.ring else {},
-            "charm": char.charm.to_json() if char.charm else {},
-        }
+        """Return the names of the currently equipped items by slot, for loadouts."""
+        return {slot: item.name if (item := getattr(char, slot)) else None for slot in GEAR_SLOTS}
 
     def get_current_equipment(self, return_place_holder: bool = False) -> List[Item]:
         """returns a list of Items currently equipped."""
@@ -1458,9 +1724,15 @@ class Character(Item):
         return self
 
     @classmethod
-    async def from_json(cls, config: Config, user: discord.Member, daily_bonus_mapping: Dict[str, float]):
-        """Return a Character object from config and user."""
-        data = await config.user(user).all()
+    async def from_json(
+        cls, config: Config, user: discord.Member, daily_bonus_mapping: Dict[str, float], data: dict = None
+    ):
+        """Return a Character object from config and user.
+
+        ``data`` may be passed to build the character from an already loaded document.
+        """
+        if data is None:
+            data = await config.user(user).all()
         balance = await bank.get_balance(user)
         equipment = {k: Item.from_json(v) if v else None for k, v in data["items"].items() if k != "backpack"}
         if "int" not in data["skill"]:
@@ -1468,7 +1740,10 @@ class Character(Item):
             # auto update old users with new skill slot
             # likely unnecessary since this worked without it but this prevents
             # potential issues
-        loadouts = data["loadouts"]
+        loadouts = {
+            name: {slot: loadout_reference(entry) for (slot, entry) in loadout.items()}
+            for (name, loadout) in data["loadouts"].items()
+        }
         heroclass = {
             "name": "Hero",
             "ability": False,
@@ -1488,6 +1763,8 @@ class Character(Item):
                 item = Item.from_json({n: i})
                 backpack[item.name] = item
         else:
+            if is_compact(data["backpack"]):
+                data["backpack"] = decode_backpack(data["backpack"])
             backpack = {n: Item.from_json({n: i}) for n, i in data["backpack"].items()}
         while len(data["treasure"]) < 5:
             data["treasure"].append(0)
@@ -1558,30 +1835,18 @@ class Character(Item):
         return cls(**hero_data, daily_bonus_mapping=daily_bonus_mapping)
 
     def get_set_item_count(self):
-        count_set = 0
-        last_slot = ""
-        for slots in ORDER:
-            if slots == "two handed":
-                continue
-            if last_slot == "two handed":
-                last_slot = slots
-                continue
-            item = getattr(self, slots)
-            if item is None:
-                continue
-            if item.rarity in ["set"]:
-                count_set += 1
-        for (k, v) in self.backpack.items():
-            for (n, i) in v.to_json().items():
-                if i.get("rarity", False) in ["set"]:
-                    count_set += v.owned
+        count_set = sum(1 for item in self.get_current_equipment() if item.rarity in ["set"])
+        for name in self.backpack.by_rarity.get("set", ()):
+            count_set += self.backpack[name].owned
         return count_set
 
-    async def to_json(self, config) -> dict:
-        backpack = {}
-        for (k, v) in self.backpack.items():
-            for (n, i) in v.to_json().items():
-                backpack[n] = i
+    async def to_json(self, config, backpack: bool = True) -> dict:
+        """Serialise the sheet. With ``backpack=False`` the backpack is left out."""
+        items = {}
+        if backpack:
+            for (k, v) in self.backpack.items():
+                for (n, i) in v.to_json().items():
+                    items[n] = i
 
         if self.heroclass["name"] == "Ranger" and self.heroclass.get("pet"):
             theme = await config.theme()
@@ -1613,8 +1878,8 @@ class Character(Item):
                 "ring": self.ring.to_json() if self.ring else {},
                 "charm": self.charm.to_json() if self.charm else {},
             },
-            "backpack": backpack,
-            "loadouts": self.loadouts,  # convert to dict of items
+            **({"backpack": items} if backpack else {}),
+            "loadouts": self.loadouts,
             "heroclass": self.heroclass,
             "skill": self.skill,
             "rebirths": self.rebirths,
@@ -1724,9 +1989,7 @@ class Character(Item):
 class ItemsConverter(Converter):
     async def convert(self, ctx, argument) -> Tuple[str, List[Item]]:
         try:
-            c = await Character.from_json(
-                ctx.bot.get_cog("Adventure").config, ctx.author, ctx.bot.get_cog("Adventure")._daily_bonus,
-            )
+            c = await ctx.bot.get_cog("Adventure").get_character(ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             raise BadArgument
@@ -1795,9 +2058,7 @@ class ItemsConverter(Converter):
 class ItemConverter(Converter):
     async def convert(self, ctx, argument) -> Item:
         try:
-            c = await Character.from_json(
-                ctx.bot.get_cog("Adventure").config, ctx.author, ctx.bot.get_cog("Adventure")._daily_bonus,
-            )
+            c = await ctx.bot.get_cog("Adventure").get_character(ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             raise BadArgument
@@ -1850,9 +2111,7 @@ class ItemConverter(Converter):
 class EquipableItemConverter(Converter):
     async def convert(self, ctx, argument) -> Item:
         try:
-            c = await Character.from_json(
-                ctx.bot.get_cog("Adventure").config, ctx.author, ctx.bot.get_cog("Adventure")._daily_bonus,
-            )
+            c = await ctx.bot.get_cog("Adventure").get_character(ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             raise BadArgument
@@ -1916,9 +2175,7 @@ class EquipableItemConverter(Converter):
 class EquipmentConverter(Converter):
     async def convert(self, ctx, argument) -> Union[Item, List[Item]]:
         try:
-            c = await Character.from_json(
-                ctx.bot.get_cog("Adventure").config, ctx.author, ctx.bot.get_cog("Adventure")._daily_bonus,
-            )
+            c = await ctx.bot.get_cog("Adventure").get_character(ctx.author)
         except Exception as exc:
             log.exception("Error with the new character sheet", exc_info=exc)
             raise BadArgument
@@ -2147,6 +2404,18 @@ def get_item_db(rarity):
         return TR_GEAR_SET
 
 
+def intern_item_db(db: dict) -> dict:
+    """Share repeated strings and slot lists between the entries of a loaded item database."""
+    slots = {}
+    for data in db.values():
+        if isinstance(data.get("set"), str):
+            data["set"] = sys.intern(data["set"])
+        if "slot" in data:
+            key = tuple(sys.intern(i) for i in data["slot"])
+            data["slot"] = slots.setdefault(key, list(key))
+    return db
+
+
 def has_funds_check(cost):
     async def predicate(ctx):
         if not await bank.can_spend(ctx.author, cost):
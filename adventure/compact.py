@@ -0,0 +1,104 @@
+from typing import Any, Dict, List, Mapping
+
+# Marks a stored backpack as compact; the value is the layout version.
+COMPACT_KEY = "__compact__"
+COMPACT_VERSION = 1
+# Backpacks with at least this many items are stored compact. A compact backpack goes
+# back to one dict per item once it shrinks below half of this, so a backpack sitting
+# on the threshold doesn't switch format on every sale.
+COMPACT_THRESHOLD = 1000
+# Item fields stored as codes into a table of their distinct values.
+INTERNED = ("slot", "rarity", "set")
+# Item fields stored as they are.
+PLAIN = ("att", "int", "cha", "dex", "luck", "owned", "degrade", "lvl", "parts")
+
+
+def is_compact(backpack: Mapping[str, Any]) -> bool:
+    return COMPACT_KEY in backpack
+
+
+def should_compact(size: int, compact: bool) -> bool:
+    """Whether a backpack of ``size`` items should be stored compact, given how it is stored now."""
+    return size >= COMPACT_THRESHOLD or (compact and size >= COMPACT_THRESHOLD // 2)
+
+
+def _intern(table: Dict[Any, int], values: List[Any], value: Any) -> int:
+    key = tuple(value) if isinstance(value, list) else value
+    if key not in table:
+        table[key] = len(values)
+        values.append(value)
+    return table[key]
+
+
+def encode_backpack(backpack: Mapping[str, dict]) -> dict:
+    """Store a backpack as columns instead of one dict per item.
+
+    Every item gets an entry in each column, in backpack order. ``shapes`` lists
+    the distinct sets of keys the items have and ``shape`` points each item at
+    its own, so a missing key stays missing. Slots, rarities and sets are stored
+    as codes into ``tables``. Anything else an item carries goes into ``extra``
+    keyed by the item's position.
+    """
+    items = list(backpack.values())
+    shapes: Dict[tuple, int] = {}
+    shape_column = [shapes.setdefault(tuple(item), len(shapes)) for item in items]
+    columns = {key: [item.get(key, 0) for item in items] for key in PLAIN}
+    tables = {}
+    extra: Dict[str, dict] = {}
+    for key in INTERNED:
+        (codes, values) = ({}, [])
+        column = []
+        for (index, item) in enumerate(items):
+            try:
+                column.append(_intern(codes, values, item.get(key)))
+            except TypeError:
+                # Unhashable values can't go in a table; keep them with the item instead.
+                extra.setdefault(str(index), {})[key] = item[key]
+                column.append(_intern(codes, values, None))
+        columns[key] = column
+        tables[key] = values
+    known = {*INTERNED, *PLAIN}
+    odd_shapes = {code for (shape, code) in shapes.items() if not known.issuperset(shape)}
+    if odd_shapes:
+        for (index, item) in enumerate(items):
+            if shape_column[index] in odd_shapes:
+                unknown = {key: value for (key, value) in item.items() if key not in known}
+                extra.setdefault(str(index), {}).update(unknown)
+    return {
+        COMPACT_KEY: COMPACT_VERSION,
+        "names": list(backpack),
+        "shapes": [list(shape) for shape in shapes],
+        "shape": shape_column,
+        "tables": tables,
+        "columns": columns,
+        "extra": extra,
+    }
+
+
+def decode_backpack(data: Mapping[str, Any]) -> Dict[str, dict]:
+    """Turn a compact backpack back into one dict per item."""
+    version = data.get(COMPACT_KEY)
+    if version != COMPACT_VERSION:
+        raise ValueError(f"Unsupported compact backpack version: {version}")
+    columns = dict(data["columns"])
+    for (key, table) in data["tables"].items():
+        columns[key] = [table[code] for code in columns[key]]
+    order = list(columns)
+    # Per shape, the keys read from the columns and where they sit in a row.
+    layouts = []
+    for shape in data["shapes"]:
+        keys = [key for key in shape if key in columns]
+        layouts.append((keys, [order.index(key) for key in keys]))
+    extra = data["extra"]
+    backpack = {}
+    rows = zip(data["names"], data["shape"], zip(*columns.values()))
+    for (index, (name, shape, row)) in enumerate(rows):
+        (keys, positions) = layouts[shape]
+        item = dict(zip(keys, map(row.__getitem__, positions)))
+        if isinstance(item.get("slot"), list):
+            item["slot"] = list(item["slot"])
+        if extra and str(index) in extra:
+            item.update(extra[str(index)])
+            item = {key: item[key] for key in data["shapes"][shape]}
+        backpack[name] = item
+    return backpack
@@ -0,0 +1,221 @@
+import logging
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import date
+from typing import Callable, Dict, Hashable, Iterator, List, Mapping, MutableMapping, Optional, Sequence, Tuple, Union
+
+import discord
+from redbot.core.utils import AsyncIter
+
+log = logging.getLogger("red.cogs.adventure.leaderboard")
+
+ADVENTURE_STATS = ("wins", "loses", "fight", "spell", "talk", "pray", "run", "fumbles")
+# Filtered orderings kept per index (one per guild scoreboard); all are dropped past this many.
+MAX_CACHED_ORDERINGS = 64
+
+
+class Ranking(Sequence):
+    """Ranked ``(user_id, data)`` pairs, highest first.
+
+    Only the order of user IDs is stored; a user's data is looked up when their
+    entry is read, so a page shows current stats and slicing a page costs the
+    same however many users are ranked. Users removed since the order was taken
+    keep their place with empty stats that read as 0.
+    """
+
+    __slots__ = ("_ids", "_data")
+
+    def __init__(self, ids: List[int], data: Mapping[int, dict]):
+        self._ids = ids
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [self._entry(user_id) for user_id in self._ids[index]]
+        return self._entry(self._ids[index])
+
+    def _entry(self, user_id: int) -> Tuple[int, Mapping]:
+        data = self._data.get(user_id)
+        return user_id, data if data is not None else defaultdict(int)
+
+
+class RankedIndex:
+    """Users kept in sorted order by a key.
+
+    Lookups use binary search; entries are re-positioned whenever a user's
+    data changes so queries never have to sort the whole user base. Descending
+    orderings handed out by :meth:`ranking` are cached until a user moves.
+    """
+
+    def __init__(self):
+        self._order: List[Tuple[tuple, int]] = []
+        self._keys: Dict[int, tuple] = {}
+        self._data: Dict[int, dict] = {}
+        self._orderings: Dict[Hashable, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._keys
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._keys)
+
+    def update(self, user_id: int, key: tuple, data: dict) -> None:
+        old_key = self._keys.get(user_id)
+        if old_key is not None:
+            if old_key == key:
+                self._data[user_id] = data
+                return
+            self._remove_entry(user_id, old_key)
+        insort(self._order, (key, user_id))
+        self._keys[user_id] = key
+        self._data[user_id] = data
+        self._orderings.clear()
+
+    def remove(self, user_id: int) -> None:
+        key = self._keys.pop(user_id, None)
+        if key is None:
+            return
+        self._remove_entry(user_id, key)
+        del self._data[user_id]
+        self._orderings.clear()
+
+    def _remove_entry(self, user_id: int, key: tuple) -> None:
+        index = bisect_left(self._order, (key, user_id))
+        if index < len(self._order) and self._order[index] == (key, user_id):
+            del self._order[index]
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """Return the 1-based position of the user, or None if they aren't ranked."""
+        key = self._keys.get(user_id)
+        if key is None:
+            return None
+        return len(self._order) - bisect_right(self._order, (key, user_id)) + 1
+
+    def descending(self) -> Iterator[Tuple[int, dict]]:
+        for (key, user_id) in reversed(self._order):
+            yield user_id, self._data[user_id]
+
+    def ranking(self, check: Optional[Callable[[int, dict], bool]] = None, key: Hashable = None) -> Ranking:
+        """Return every user passing ``check`` in descending order.
+
+        The order is worked out on first use and shared by every caller asking with
+        the same ``key`` until a user changes position. ``key`` names the filter and
+        must change whenever the outcome of ``check`` could, e.g.
+        :meth:`Leaderboards.guild_key`; without a ``check`` it must be None. A
+        ``check`` without a ``key`` is applied afresh on every call.
+        """
+        cached = check is None or key is not None
+        ids = self._orderings.get(key) if cached else None
+        if ids is None:
+            data = self._data
+            ids = [user_id for (_, user_id) in reversed(self._order) if check is None or check(user_id, data[user_id])]
+            if cached:
+                if len(self._orderings) >= MAX_CACHED_ORDERINGS:
+                    self._orderings.clear()
+                self._orderings[key] = ids
+        return Ranking(ids, self._data)
+
+    def top(
+        self, positions: Optional[int] = None, check: Optional[Callable[[int, dict], bool]] = None
+    ) -> List[Tuple[int, dict]]:
+        """Return the highest ranked ``(user_id, data)`` pairs that pass ``check``."""
+        results = []
+        for (user_id, data) in self.descending():
+            if check is not None and not check(user_id, data):
+                continue
+            results.append((user_id, data))
+            if positions is not None and len(results) >= positions:
+                break
+        return results
+
+
+class Leaderboards:
+    """Ranked indexes for every Adventure scoreboard.
+
+    Built once from all user data and updated from each saved character sheet.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.rebirths = RankedIndex()
+        self.adventures: MutableMapping[str, RankedIndex] = {stat: RankedIndex() for stat in ADVENTURE_STATS}
+        self.negaverse = RankedIndex()
+        self.weekly = RankedIndex()
+        self._member_versions: Dict[int, int] = {}
+
+    async def build(self, all_users: Mapping[int, dict]) -> None:
+        self.__init__()
+        async for (user_id, data) in AsyncIter(all_users.items(), steps=200):
+            self.update(user_id, data)
+        self.ready = True
+        log.debug("Built leaderboard indexes for %s users", len(all_users))
+
+    def update(self, user_id: int, data: Mapping) -> None:
+        """Re-rank a user from their character document."""
+        self.rebirths.update(
+            user_id,
+            (data.get("rebirths", 0), data.get("lvl", 0), data.get("set_items", 0)),
+            {"lvl": data.get("lvl", 0), "rebirths": data.get("rebirths", 0), "set_items": data.get("set_items", 0)},
+        )
+
+        for (stat, index) in self.adventures.items():
+            adventures = data.get("adventures", {stat: 0})
+            user_data = {"rebirths": data.get("rebirths", 0)}
+            if stat in adventures:
+                user_data.update(adventures)
+            index.update(user_id, (user_data.get(stat, 0), user_data.get("rebirths", 0)), user_data)
+
+        nega = data.get("nega")
+        if nega:
+            self.negaverse.update(user_id, (nega.get("wins", 0), nega.get("loses", 0)), dict(nega))
+        else:
+            self.negaverse.remove(user_id)
+
+        weekly = data.get("weekly_score")
+        if weekly and "adventures" in weekly:
+            self.weekly.update(
+                user_id, (weekly.get("adventures", 0), weekly.get("rebirths", 0)), dict(weekly),
+            )
+        else:
+            self.weekly.remove(user_id)
+
+    def user_ids(self) -> List[int]:
+        """Every user with a character sheet; each one is ranked by rebirths."""
+        return list(self.rebirths)
+
+    def remove(self, user_id: int) -> None:
+        self.rebirths.remove(user_id)
+        for index in self.adventures.values():
+            index.remove(user_id)
+        self.negaverse.remove(user_id)
+        self.weekly.remove(user_id)
+
+    def guild_key(self, guild: discord.Guild) -> Hashable:
+        """Cache key for an ordering filtered to the guild's current members.
+
+        It changes whenever someone joins or leaves the guild and once its member
+        list has finished loading, so a cached ordering never outlives the members
+        it was filtered by.
+        """
+        return guild.id, guild.chunked, self._member_versions.get(guild.id, 0)
+
+    def members_changed(self, guild: discord.Guild) -> None:
+        """Retire the guild's cached orderings after its membership changes."""
+        self._member_versions[guild.id] = self._member_versions.get(guild.id, 0) + 1
+
+    @staticmethod
+    def current_week_check(check: Optional[Callable[[int, dict], bool]] = None) -> Callable[[int, dict], bool]:
+        current_week = date.today().isocalendar()[1]
+
+        def predicate(user_id: int, data: dict) -> bool:
+            if data.get("week", -1) != current_week:
+                return False
+            return check is None or check(user_id, data)
+
+        return predicate
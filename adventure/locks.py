@@ -0,0 +1,183 @@
+import asyncio
+import contextlib
+import time
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple
+
+from .cache import CharacterCache
+
+# Idle locks unused for this long are dropped by :meth:`LockRegistry.evict`.
+IDLE_TIMEOUT = 600
+# The registry drops idle locks, least recently used first, to stay below this many.
+MAX_LOCKS = 5000
+# Contention is remembered for at most this many users; the quietest are forgotten first.
+MAX_TRACKED_USERS = 1000
+
+# Name of the command the current task is running, set before every Adventure command.
+current_command: ContextVar = ContextVar("adventure_command", default="(no command)")
+
+
+class LockStats:
+    """Acquisition counts and wait times for one command."""
+
+    __slots__ = ("acquired", "contended", "rejected", "wait", "max_wait")
+
+    def __init__(self):
+        self.acquired = 0
+        self.contended = 0
+        self.rejected = 0
+        self.wait = 0.0
+        self.max_wait = 0.0
+
+
+class CharacterLock(asyncio.Lock):
+    """Per-user lock that writes the user's cached sheet back once released."""
+
+    def __init__(self, cache: CharacterCache, user_id: int, registry: Optional["LockRegistry"] = None):
+        super().__init__()
+        self._cache = cache
+        self._user_id = user_id
+        self._registry = registry
+        self.waiting = 0
+        self.last_used = time.monotonic()
+
+    @property
+    def idle(self) -> bool:
+        return not self.locked() and not self.waiting
+
+    async def acquire(self) -> bool:
+        contended = self.locked() or self.waiting > 0
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            await super().acquire()
+        finally:
+            self.waiting -= 1
+        self.last_used = time.monotonic()
+        if self._registry is not None:
+            self._registry.record(self._user_id, time.perf_counter() - start, contended)
+        return True
+
+    def release(self) -> None:
+        super().release()
+        self.last_used = time.monotonic()
+        if self._cache.is_dirty(self._user_id):
+            self._cache.schedule_flush(self._user_id)
+
+
+class LockRegistry(Mapping):
+    """The character locks of every user who played recently.
+
+    Locks are created on first use and dropped again once idle, so the registry
+    doesn't grow with every user who ever played. A lock that is held or waited
+    on is never dropped. Every acquisition is recorded against the command that
+    made it, and users whose lock is often contended are remembered as hot.
+    """
+
+    def __init__(self, cache: CharacterCache, idle_timeout: float = IDLE_TIMEOUT, max_locks: int = MAX_LOCKS):
+        self._cache = cache
+        self.idle_timeout = idle_timeout
+        self.max_locks = max_locks
+        self._locks: MutableMapping[int, CharacterLock] = OrderedDict()
+        self.commands: Dict[str, LockStats] = {}
+        self.contention: Counter = Counter()
+        self.user_wait: Counter = Counter()
+        self.created = 0
+        self.evicted = 0
+
+    def __getitem__(self, user_id: int) -> CharacterLock:
+        return self._locks[user_id]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._locks)
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def get(self, user_id: int) -> CharacterLock:
+        """Return the user's lock, creating it if needed."""
+        lock = self._locks.get(user_id)
+        if lock is None:
+            if len(self._locks) >= self.max_locks:
+                self.evict()
+            lock = self._locks[user_id] = CharacterLock(self._cache, user_id, self)
+            self.created += 1
+        else:
+            self._locks.move_to_end(user_id)
+        lock.last_used = time.monotonic()
+        return lock
+
+    @contextlib.asynccontextmanager
+    async def acquire_many(self, user_ids: Iterable[int]) -> AsyncIterator[List[CharacterLock]]:
+        """Hold the locks of several users at once.
+
+        Locks are always taken in ascending user ID order, so two commands locking
+        the same users can't each end up waiting on a lock the other holds.
+        """
+        acquired = []
+        try:
+            for user_id in sorted(set(user_ids)):
+                # Fetch each lock only when it is taken; an untaken lock could be evicted meanwhile.
+                lock = self.get(user_id)
+                await lock.acquire()
+                acquired.append(lock)
+            yield acquired
+        finally:
+            for lock in reversed(acquired):
+                with contextlib.suppress(RuntimeError):
+                    lock.release()
+
+    def evict(self) -> int:
+        """Drop idle locks that timed out, and more while over ``max_locks``. Returns the number dropped."""
+        now = time.monotonic()
+        evicted = 0
+        for (user_id, lock) in list(self._locks.items()):
+            over = len(self._locks) >= self.max_locks
+            if not over and now - lock.last_used < self.idle_timeout:
+                break
+            if lock.idle:
+                del self._locks[user_id]
+                evicted += 1
+        self.evicted += evicted
+        return evicted
+
+    def _stats(self) -> LockStats:
+        name = current_command.get()
+        if name not in self.commands:
+            self.commands[name] = LockStats()
+        return self.commands[name]
+
+    def record(self, user_id: int, wait: float, contended: bool) -> None:
+        stats = self._stats()
+        stats.acquired += 1
+        stats.wait += wait
+        stats.max_wait = max(stats.max_wait, wait)
+        if contended:
+            stats.contended += 1
+            self._track(user_id, wait)
+
+    def reject(self, user_id: int) -> None:
+        """Record a command turned away because the user's lock was held."""
+        self._stats().rejected += 1
+        self._track(user_id, 0.0)
+
+    def _track(self, user_id: int, wait: float) -> None:
+        self.contention[user_id] += 1
+        self.user_wait[user_id] += wait
+        if len(self.contention) > MAX_TRACKED_USERS:
+            keep = dict(self.contention.most_common(MAX_TRACKED_USERS // 2))
+            self.contention = Counter(keep)
+            self.user_wait = Counter({uid: self.user_wait[uid] for uid in keep})
+
+    def hottest(self, limit: int = 10) -> List[Tuple[int, int, float]]:
+        """The most contended users as ``(user_id, contended, total wait)``."""
+        return [(user_id, count, self.user_wait[user_id]) for (user_id, count) in self.contention.most_common(limit)]
+
+    def stats(self) -> MutableMapping[str, int]:
+        return {
+            "locks": len(self._locks),
+            "held": sum(1 for lock in self._locks.values() if lock.locked()),
+            "created": self.created,
+            "evicted": self.evicted,
+        }
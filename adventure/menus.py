@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
 import discord
 from redbot.core.commands import commands
@@ -87,7 +87,7 @@ class LeaderboardSource(menus.ListPageSource):
 
 
 class WeeklyScoreboardSource(menus.ListPageSource):
-    def __init__(self, entries: List[Tuple[int, Dict]], stat: Optional[str] = None):
+    def __init__(self, entries: Sequence[Tuple[int, Dict]], stat: Optional[str] = None):
         super().__init__(entries, per_page=10)
         self._stat = stat or "wins"
 
@@ -147,7 +147,7 @@ class WeeklyScoreboardSource(menus.ListPageSource):
 
 
 class ScoreboardSource(WeeklyScoreboardSource):
-    def __init__(self, entries: List[Tuple[int, Dict]], stat: Optional[str] = None):
+    def __init__(self, entries: Sequence[Tuple[int, Dict]], stat: Optional[str] = None):
         super().__init__(entries)
         self._stat = stat or "wins"
         self._legend = None
@@ -220,7 +220,7 @@ class ScoreboardSource(WeeklyScoreboardSource):
 
 
 class NVScoreboardSource(WeeklyScoreboardSource):
-    def __init__(self, entries: List[Tuple[int, Dict]], stat: Optional[str] = None):
+    def __init__(self, entries: Sequence[Tuple[int, Dict]], stat: Optional[str] = None):
         super().__init__(entries)
 
     def is_paginating(self):
@@ -624,86 +624,47 @@ class ScoreBoardMenu(BaseMenu, inherit_buttons=False):
             return True
         return max_pages <= 2
 
-    @menus.button("\N{FACE WITH PARTY HORN AND PARTY HAT}")
-    async def wins(self, payload: discord.RawReactionActionEvent) -> None:
-        if self._current == "wins":
+    async def _show_scoreboard(self, stat: str) -> None:
+        if self._current == stat:
             return
-        self._current = "wins"
+        self._current = stat
+        # The ordering is cached by the cog's leaderboards, so switching only slices the first page.
         rebirth_sorted = await self.cog.get_global_scoreboard(
-            guild=self.ctx.guild if not self.show_global else None, keyword=self._current
+            guild=self.ctx.guild if not self.show_global else None, keyword=stat
         )
-        await self.change_source(source=ScoreboardSource(entries=rebirth_sorted, stat=self._current))
+        await self.change_source(source=ScoreboardSource(entries=rebirth_sorted, stat=stat))
+
+    @menus.button("\N{FACE WITH PARTY HORN AND PARTY HAT}")
+    async def wins(self, payload: discord.RawReactionActionEvent) -> None:
+        await self._show_scoreboard("wins")
 
     @menus.button("\N{FIRE}")
     async def losses(self, payload: discord.RawReactionActionEvent) -> None:
-        if self._current == "loses":
-            return
-        self._current = "loses"
-        rebirth_sorted = await self.cog.get_global_scoreboard(
-            guild=self.ctx.guild if not self.show_global else None, keyword=self._current
-        )
-        await self.change_source(source=ScoreboardSource(entries=rebirth_sorted, stat=self._current))
+        await self._show_scoreboard("loses")
 
     @menus.button("\N{DAGGER KNIFE}")
     async def physical(self, payload: discord.RawReactionActionEvent) -> None:
-        """stops the pagination session."""
-        if self._current == "fight":
-            return
-        self._current = "fight"
-        rebirth_sorted = await self.cog.get_global_scoreboard(
-            guild=self.ctx.guild if not self.show_global else None, keyword=self._current
-        )
-        await self.change_source(source=ScoreboardSource(entries=rebirth_sorted, stat=self._current))
+        await self._show_scoreboard("fight")
 
     @menus.button("\N{SPARKLES}")
     async def magic(self, payload: discord.RawReactionActionEvent) -> None:
-        if self._current == "spell":
-            return
-        self._current = "spell"
-        rebirth_sorted = await self.cog.get_global_scoreboard(
-            guild=self.ctx.guild if not self.show_global else None, keyword=self._current
-        )
-        await self.change_source(source=ScoreboardSource(entries=rebirth_sorted, stat=self._current))
+        await self._show_scoreboard("spell")
 
     @menus.button("\N{LEFT SPEECH BUBBLE}")
     async def diplomacy(self, payload: discord.RawReactionActionEvent) -> None:
-        if self._current == "talk":
-            return
-        self._current = "talk"
-        rebirth_sorted = await self.cog.get_global_scoreboard(
-            guild=self.ctx.guild if not self.show_global else None, keyword=self._current
-        )
-        await self.change_source(source=ScoreboardSource(entries=rebirth_sorted, stat=self._current))
+        await self._show_scoreboard("talk")
 
     @menus.button("\N{PERSON WITH FOLDED HANDS}")
     async def praying(self, payload: discord.RawReactionActionEvent) -> None:
-        if self._current == "pray":
-            return
-        self._current = "pray"
-        rebirth_sorted = await self.cog.get_global_scoreboard(
-            guild=self.ctx.guild if not self.show_global else None, keyword=self._current
-        )
-        await self.change_source(source=ScoreboardSource(entries=rebirth_sorted, stat=self._current))
+        await self._show_scoreboard("pray")
 
     @menus.button("\N{RUNNER}")
     async def runner(self, payload: discord.RawReactionActionEvent) -> None:
-        if self._current == "run":
-            return
-        self._current = "run"
-        rebirth_sorted = await self.cog.get_global_scoreboard(
-            guild=self.ctx.guild if not self.show_global else None, keyword=self._current
-        )
-        await self.change_source(source=ScoreboardSource(entries=rebirth_sorted, stat=self._current))
+        await self._show_scoreboard("run")
 
     @menus.button("\N{EXCLAMATION QUESTION MARK}")
     async def fumble(self, payload: discord.RawReactionActionEvent) -> None:
-        if self._current == "fumbles":
-            return
-        self._current = "fumbles"
-        rebirth_sorted = await self.cog.get_global_scoreboard(
-            guild=self.ctx.guild if not self.show_global else None, keyword=self._current
-        )
-        await self.change_source(source=ScoreboardSource(entries=rebirth_sorted, stat=self._current))
+        await self._show_scoreboard("fumbles")
 
     @menus.button(
         "\N{BLACK LEFT-POINTING DOUBLE TRIANGLE WITH VERTICAL BAR}\N{VARIATION SELECTOR-16}",
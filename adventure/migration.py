@@ -0,0 +1,185 @@
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Iterable, List, MutableMapping, Optional
+
+from redbot.core import Config
+
+from .cache import CharacterCache
+from .charsheet import loadout_reference, parse_item_name
+from .compact import decode_backpack, encode_backpack, is_compact, should_compact
+from .locks import LockRegistry
+
+log = logging.getLogger("red.cogs.adventure.migration")
+
+# Version of the layout the job leaves every character sheet in. Bump it when
+# normalise_sheet changes so the next start walks everyone again.
+LAYOUT_VERSION = 2
+# Users read and written before the job saves its checkpoint and yields to the event loop.
+CHUNK_SIZE = 100
+
+
+def normalise_sheet(data: dict, compact: bool = True) -> bool:
+    """Bring a stored character document to the newest layout, in place.
+
+    This is the clean-up Character.from_json otherwise repeats on every load: the
+    hero class lives under ``heroclass``, the backpack is a top-level mapping keyed
+    by plain item names, loadouts name the items they use instead of copying them,
+    the treasure list has every chest type and experience isn't negative. With ``compact`` the backpack is also stored in the layout its
+    size calls for. Returns whether anything changed.
+    """
+    changed = False
+    if "class" in data:
+        heroclass = data.pop("class")
+        data.setdefault("heroclass", heroclass)
+        changed = True
+    items = data.get("items", {})
+    if "backpack" in items:
+        legacy = items.pop("backpack")
+        if "backpack" not in data:
+            data["backpack"] = legacy
+        changed = True
+    backpack = data.get("backpack", {})
+    if not is_compact(backpack) and any(parse_item_name(name)[0] != name for name in backpack):
+        data["backpack"] = backpack = {parse_item_name(name)[0]: item for (name, item) in backpack.items()}
+        changed = True
+    for loadout in data.get("loadouts", {}).values():
+        for (slot, entry) in loadout.items():
+            if entry is not None and not isinstance(entry, str):
+                loadout[slot] = loadout_reference(entry)
+                changed = True
+    treasure = data.get("treasure")
+    if treasure is not None and len(treasure) < 6:
+        while len(treasure) < 5:
+            treasure.append(0)
+        if len(treasure) == 5:
+            treasure.insert(4, 0)
+        changed = True
+    if data.get("exp", 0) < 0:
+        data["exp"] = 0
+        changed = True
+    stored_compact = is_compact(backpack)
+    size = len(backpack["names"]) if stored_compact else len(backpack)
+    if stored_compact != (compact and should_compact(size, stored_compact)):
+        data["backpack"] = decode_backpack(backpack) if stored_compact else encode_backpack(backpack)
+        changed = True
+    return changed
+
+
+class MigrationJob:
+    """Walks every stored character sheet and rewrites it in the newest layout.
+
+    Users are read and written one at a time through raw Config access, in
+    ascending ID order and in chunks of ``chunk_size``. After every chunk the last
+    user ID is saved as a checkpoint, so a reloaded cog carries on where it
+    stopped, and the job yields to the event loop so gameplay isn't held up.
+
+    Sheets in the character cache are migrated in memory and rewritten by the
+    cache. Other sheets are read and written back under the user's lock; one the
+    cache loads or that is deleted meanwhile is left alone, so the job never
+    writes over a newer save or brings back erased data.
+    """
+
+    def __init__(self, config: Config, cache: CharacterCache, locks: LockRegistry, chunk_size: int = CHUNK_SIZE):
+        self._config = config
+        self._cache = cache
+        self._locks = locks
+        self.chunk_size = chunk_size
+        self._task: Optional[asyncio.Task] = None
+        self.total = 0
+        self.migrated = 0
+        self.changed = 0
+        self.elapsed = 0.0
+        self.finished = False
+        self._resumed_at = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, user_ids: Iterable[int], restart: bool = False) -> asyncio.Task:
+        if not self.running:
+            self._task = asyncio.get_event_loop().create_task(self._guard(list(user_ids), restart))
+        return self._task
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _guard(self, user_ids: List[int], restart: bool) -> None:
+        try:
+            await self.run(user_ids, restart=restart)
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:
+            log.exception("Character migration failed", exc_info=exc)
+
+    async def run(self, user_ids: Iterable[int], restart: bool = False) -> int:
+        """Migrate every user in ``user_ids`` not covered by the checkpoint. Returns the number changed."""
+        checkpoint = await self._config.migration()
+        if restart or checkpoint["version"] != LAYOUT_VERSION:
+            checkpoint = {"version": LAYOUT_VERSION, "last_user": 0, "migrated": 0, "changed": 0, "done": False}
+        if checkpoint["done"]:
+            self.finished = True
+            return 0
+        pending = sorted(uid for uid in set(user_ids) if uid > checkpoint["last_user"])
+        self.total = checkpoint["migrated"] + len(pending)
+        self.migrated = self._resumed_at = checkpoint["migrated"]
+        self.changed = checkpoint["changed"]
+        self.elapsed = 0.0
+        self.finished = False
+        group = self._config._get_base_group(self._config.USER)
+        for start in range(0, len(pending), self.chunk_size):
+            chunk = pending[start : start + self.chunk_size]
+            began = time.perf_counter()
+            for uid in chunk:
+                await self._migrate_user(group, uid)
+            self.elapsed += time.perf_counter() - began
+            checkpoint.update(last_user=chunk[-1], migrated=self.migrated, changed=self.changed)
+            await self._config.migration.set(checkpoint)
+            await asyncio.sleep(0)
+        self.finished = True
+        checkpoint.update(migrated=self.migrated, changed=self.changed, done=True)
+        await self._config.migration.set(checkpoint)
+        log.info(
+            "Migrated %s character sheets (%s changed) in %.1fs, %.0f users/s",
+            self.migrated,
+            self.changed,
+            self.elapsed,
+            self.throughput,
+        )
+        return self.changed
+
+    async def _migrate_user(self, group, user_id: int) -> None:
+        if user_id in self._cache:
+            if self._cache.migrate(user_id, lambda data: normalise_sheet(data, compact=False)):
+                self.changed += 1
+        else:
+            async with self._locks.get(user_id):
+                with contextlib.suppress(KeyError):
+                    data = await group.get_raw(str(user_id))
+                    # A sheet loaded meanwhile is the cache's to write, and re-reading one key
+                    # raises KeyError for a sheet erased meanwhile rather than writing it back.
+                    if normalise_sheet(data) and user_id not in self._cache and data:
+                        await group.get_raw(str(user_id), next(iter(data)))
+                        await group.set_raw(str(user_id), value=data)
+                        self.changed += 1
+        self.migrated += 1
+
+    @property
+    def throughput(self) -> float:
+        """Users migrated per second by the current run."""
+        return (self.migrated - self._resumed_at) / self.elapsed if self.elapsed else 0.0
+
+    def stats(self) -> MutableMapping[str, float]:
+        return {
+            "running": self.running,
+            "finished": self.finished,
+            "total": self.total,
+            "migrated": self.migrated,
+            "changed": self.changed,
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+        }
@@ -0,0 +1,119 @@
+from typing import Any, List, Optional, Sequence, Tuple
+
+from beautifultable import ALIGN_LEFT, BeautifulTable
+from beautifultable.utils import pre_process, termwidth
+from redbot.core.utils.chat_formatting import box
+
+
+class TablePaginator:
+    """Split table rows into pages the way the cog always has, in linear time.
+
+    A page is cut before a row is added once the rendered table is longer than
+    ``limit`` characters - the same boundaries as checking ``len(str(table))``
+    after every row. Instead of re-rendering, the rendered length is derived from
+    the running width of each column. Tables that BeautifulTable would wrap
+    (multi-line cells or rows wider than ``maxwidth``) fall back to measuring the
+    rendered table so the output stays identical.
+    """
+
+    def __init__(
+        self,
+        headers: Sequence[str],
+        *,
+        prefix: str = "",
+        limit: int = 1500,
+        maxwidth: int = 500,
+        sort_by: Optional[str] = None,
+        reverse: bool = False,
+    ):
+        self.headers = list(headers)
+        self.prefix = prefix
+        self.limit = limit
+        self.maxwidth = maxwidth
+        self.sort_by = sort_by
+        self.reverse = reverse
+        self._pages: List[str] = []
+        self._rows: List[Sequence[Any]] = []
+        template = self._new_table()
+        self._detect_numerics = template.detect_numerics
+        self._precision = template.precision
+        self._sign = template.sign.value
+        header_cells = [self._measure(h) or (0, 0) for h in self.headers]
+        self._header_widths = [width for (width, extra) in header_cells]
+        self._header_extra = sum(extra for (width, extra) in header_cells)
+        self._widths = list(self._header_widths)
+        self._extra = self._header_extra
+        self._exact = True
+
+    def __len__(self) -> int:
+        return len(self._pages) + (1 if self._rows else 0)
+
+    def _new_table(self) -> BeautifulTable:
+        table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=self.maxwidth)
+        table.set_style(BeautifulTable.STYLE_RST)
+        table.columns.header = self.headers
+        return table
+
+    def _measure(self, value: Any) -> Optional[Tuple[int, int]]:
+        """Return ``(display width, characters beyond that width)`` for a cell.
+
+        The second value is non-zero for wide characters or escape codes, where the
+        number of characters differs from the columns they take up. Returns None if
+        the cell spans several lines.
+        """
+        lines = pre_process(value, self._detect_numerics, self._precision, self._sign).split("\n")
+        if len(lines) > 1:
+            return None
+        text = pre_process(lines[0], self._detect_numerics, self._precision, self._sign)
+        width = termwidth(text)
+        return width, len(text) - width
+
+    def _table_width(self) -> int:
+        # RST style: one padding space on each side of a cell and a single space between columns.
+        return sum(self._widths) + 3 * len(self._widths) - 1
+
+    def rendered_length(self) -> int:
+        """Length of ``str(table)`` for the rows on the current page."""
+        if not self._rows:
+            return 0
+        if not self._exact or self._table_width() > self.maxwidth:
+            return len(str(self._build_table()))
+        lines = len(self._rows) + 4  # top border, header, header separator, rows, bottom border
+        return lines * self._table_width() + lines - 1 + self._extra
+
+    def _build_table(self) -> BeautifulTable:
+        table = self._new_table()
+        for row in self._rows:
+            table.rows.append(row)
+        if self.sort_by is not None:
+            table.rows.sort(self.sort_by, reverse=self.reverse)
+        return table
+
+    def _cut_page(self) -> None:
+        self._pages.append(
+            box(self.prefix + str(self._build_table()) + f"\nPage {len(self._pages) + 1}", lang="css")
+        )
+        self._rows = []
+        self._widths = list(self._header_widths)
+        self._extra = self._header_extra
+        self._exact = True
+
+    def add_row(self, row: Sequence[Any]) -> None:
+        if self.rendered_length() > self.limit:
+            self._cut_page()
+        self._rows.append(row)
+        for (index, value) in enumerate(row):
+            measured = self._measure(value)
+            if measured is None:
+                self._exact = False
+                continue
+            (width, extra) = measured
+            self._extra += extra
+            if width > self._widths[index]:
+                self._widths[index] = width
+
+    def pages(self) -> List[str]:
+        """Return every page, including the rows added since the last cut."""
+        if self._rows:
+            self._cut_page()
+        return self._pages
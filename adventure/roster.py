@@ -0,0 +1,143 @@
+import random
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from functools import lru_cache
+from itertools import accumulate
+from typing import Dict, Iterator, List, MutableMapping, Optional, Tuple
+
+# Regular monsters go into the draw between 1 and this many times; bosses and minibosses once.
+MAX_ENTRIES = 15
+# Tail probabilities below this are dropped while building entry distributions;
+# the total mass lost stays far below double precision.
+NEGLIGIBLE = 1e-20
+# Entry distributions are kept for every CHECKPOINT-th count of regular monsters so
+# any other count is at most CHECKPOINT - 1 convolutions away.
+CHECKPOINT = 16
+_checkpoints: List[Tuple[int, Tuple[float, ...]]] = [(0, (1.0,))]
+_checkpoint_lock = threading.Lock()
+
+
+def _add_monster(offset: int, probabilities: Tuple[float, ...]) -> Tuple[int, Tuple[float, ...]]:
+    # Convolve with a uniform 1..MAX_ENTRIES using a sliding window over prefix sums.
+    sums = [0.0, *accumulate(probabilities)]
+    size = len(probabilities)
+    convolved = [
+        (sums[min(i, size)] - sums[max(i - MAX_ENTRIES, 0)]) / MAX_ENTRIES for i in range(1, size + MAX_ENTRIES)
+    ]
+    start, end = 0, len(convolved)
+    while convolved[start] < NEGLIGIBLE:
+        start += 1
+    while convolved[end - 1] < NEGLIGIBLE:
+        end -= 1
+    return offset + 1 + start, tuple(convolved[start:end])
+
+
+def warm_entry_totals(monsters: int) -> None:
+    """Build the checkpoints up to ``monsters`` regular monsters. Blocking, so run it in an executor."""
+    with _checkpoint_lock:
+        while len(_checkpoints) <= monsters // CHECKPOINT:
+            (offset, probabilities) = _checkpoints[-1]
+            for _ in range(CHECKPOINT):
+                (offset, probabilities) = _add_monster(offset, probabilities)
+            _checkpoints.append((offset, probabilities))
+
+
+@lru_cache(maxsize=32)
+def _entry_totals(monsters: int) -> Tuple[int, Tuple[float, ...]]:
+    """Distribution of the total number of draw entries held by ``monsters`` regular monsters.
+
+    Returns ``(offset, probabilities)`` where ``probabilities[i]`` is the chance the
+    total is ``offset + i``.
+    """
+    warm_entry_totals(monsters)
+    (offset, probabilities) = _checkpoints[monsters // CHECKPOINT]
+    for _ in range(monsters % CHECKPOINT):
+        (offset, probabilities) = _add_monster(offset, probabilities)
+    return offset, probabilities
+
+
+@lru_cache(maxsize=4096)
+def boss_chance(monsters: int, bosses: int) -> float:
+    """Chance that the draw lands on a boss when ``monsters`` regular monsters are eligible as well."""
+    if not bosses:
+        return 0.0
+    if not monsters:
+        return 1.0
+    offset, probabilities = _entry_totals(monsters)
+    return sum(p * bosses / (offset + i + bosses) for (i, p) in enumerate(probabilities))
+
+
+class _Band:
+    """Monsters sorted by one stat, split into regular monsters and bosses."""
+
+    __slots__ = ("regular_stats", "regular_names", "boss_stats", "boss_names")
+
+    def __init__(self, regular: List[Tuple[float, str]], bosses: List[Tuple[float, str]]):
+        regular.sort()
+        bosses.sort()
+        self.regular_stats = [stat for (stat, name) in regular]
+        self.regular_names = [name for (stat, name) in regular]
+        self.boss_stats = [stat for (stat, name) in bosses]
+        self.boss_names = [name for (stat, name) in bosses]
+
+    def choose(self, low: Optional[float], high: float) -> Optional[str]:
+        """Pick a monster whose stat is within ``low..high``, or None if there is none."""
+        regular_start = 0 if low is None else bisect_left(self.regular_stats, low)
+        regular_end = bisect_right(self.regular_stats, high)
+        boss_start = 0 if low is None else bisect_left(self.boss_stats, low)
+        boss_end = bisect_right(self.boss_stats, high)
+        regular = max(regular_end - regular_start, 0)
+        bosses = max(boss_end - boss_start, 0)
+        if not regular and not bosses:
+            return None
+        if random.random() < boss_chance(regular, bosses):
+            return self.boss_names[random.randrange(boss_start, boss_end)]
+        return self.regular_names[random.randrange(regular_start, regular_end)]
+
+
+class MonsterRoster(Mapping):
+    """Every monster a theme can spawn, with indexes for picking a challenge.
+
+    A challenge is drawn from the eligible monsters with regular monsters entered a
+    random 1 to 15 times and bosses once. Every regular monster is treated alike, so
+    the chance of a boss depends only on how many of each are eligible, and within
+    each group every monster is equally likely. The eligible monsters are always a
+    contiguous run of a sorted stat, so a draw is a few binary searches and a
+    memoised probability rather than a pass over the whole roster.
+    """
+
+    def __init__(self, *rosters: MutableMapping[str, dict]):
+        self._monsters: Dict[str, dict] = {}
+        for roster in rosters:
+            self._monsters.update(roster)
+        self._names = tuple(self._monsters)
+        stats: Dict[str, Tuple[list, list]] = {"hp": ([], []), "dipl": ([], []), "peak": ([], [])}
+        for (name, monster) in self._monsters.items():
+            group = 1 if monster["boss"] or monster["miniboss"] else 0
+            stats["hp"][group].append((monster["hp"], name))
+            stats["dipl"][group].append((monster["dipl"], name))
+            stats["peak"][group].append((max(monster["hp"], monster["dipl"]), name))
+        self._bands = {key: _Band(regular, bosses) for (key, (regular, bosses)) in stats.items()}
+        warm_entry_totals(len(stats["peak"][0]))
+
+    def __getitem__(self, name: str) -> dict:
+        return self._monsters[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._monsters)
+
+    def __len__(self) -> int:
+        return len(self._monsters)
+
+    def random(self) -> str:
+        return random.choice(self._names)
+
+    def choose(self, stat_range: MutableMapping, party_stat: int) -> str:
+        """Pick a challenge for the recent raid ``stat_range`` or, without one, the author's best stat."""
+        if stat_range["max_stat"] > 0:
+            band = self._bands["hp" if stat_range["stat_type"] == "attack" else "dipl"]
+            choice = band.choose(stat_range["min_stat"] * 0.75, stat_range["max_stat"] * 1.2)
+        else:
+            choice = self._bands["peak"].choose(None, party_stat * 5)
+        return choice if choice is not None else self.random()
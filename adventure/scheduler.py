@@ -0,0 +1,129 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Callable, List, MutableMapping, Optional, Tuple
+
+log = logging.getLogger("red.cogs.adventure.scheduler")
+
+
+class Timer:
+    """A callback waiting in a :class:`TimerScheduler`."""
+
+    __slots__ = ("when", "callback", "cancelled", "_scheduler")
+
+    def __init__(self, scheduler: "TimerScheduler", when: float, callback: Callable[[], Any]):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+        self._scheduler = scheduler
+
+    def cancel(self) -> None:
+        if not self.cancelled:
+            self.cancelled = True
+            self._scheduler._pending -= 1
+
+
+class TimerScheduler:
+    """Runs every timed callback of the cog from a single task.
+
+    Deadlines are readings of the monotonic :meth:`clock` kept in a heap, so
+    wall-clock jumps neither fire timers early nor stall them; the task sleeps
+    until the earliest one is due, so idle guilds cost nothing. Coroutine callbacks are run
+    as their own tasks so a slow Discord request can't hold up other deadlines.
+    Cancelled timers are dropped lazily when they reach the top of the heap.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Timer]] = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._pending = 0
+        self.fired = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+
+    def __len__(self) -> int:
+        return self._pending
+
+    @staticmethod
+    def clock() -> float:
+        """The monotonic clock that deadlines are measured on."""
+        return time.monotonic()
+
+    def call_at(self, when: float, callback: Callable[[], Any]) -> Timer:
+        """Run ``callback`` once :meth:`clock` reaches ``when``. It may return an awaitable."""
+        timer = Timer(self, when, callback)
+        self._pending += 1
+        if len(self._heap) > 2 * self._pending + 64:
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+        heapq.heappush(self._heap, (when, next(self._counter), timer))
+        if self._heap[0][2] is timer:
+            self._wakeup.set()
+        return timer
+
+    def call_later(self, delay: float, callback: Callable[[], Any]) -> Timer:
+        return self.call_at(self.clock() + delay, callback)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for (when, count, timer) in self._heap:
+            timer.cancel()
+        self._heap = []
+
+    async def _run(self) -> None:
+        with contextlib.suppress(asyncio.CancelledError):
+            while True:
+                self._wakeup.clear()
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    await self._wakeup.wait()
+                    continue
+                delay = self._heap[0][0] - self.clock()
+                if delay > 0:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                    continue
+                (when, count, timer) = heapq.heappop(self._heap)
+                self._fire(timer, self.clock() - when)
+
+    def _fire(self, timer: Timer, lag: float) -> None:
+        timer.cancel()
+        self.fired += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        try:
+            result = timer.callback()
+        except Exception as exc:
+            log.exception("Error in scheduled callback", exc_info=exc)
+            return
+        if asyncio.iscoroutine(result):
+            asyncio.get_event_loop().create_task(self._guard(result))
+
+    @staticmethod
+    async def _guard(coro) -> None:
+        try:
+            await coro
+        except asyncio.CancelledError:
+            pass
+        except Exception as exc:
+            log.exception("Error in scheduled callback", exc_info=exc)
+
+    def stats(self) -> MutableMapping[str, float]:
+        return {
+            "pending": len(self),
+            "fired": self.fired,
+            "avg_lag": self.total_lag / self.fired if self.fired else 0.0,
+            "max_lag": self.max_lag,
+        }
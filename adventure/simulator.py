@@ -0,0 +1,494 @@
+"""Headless Adventure simulator.
+
+Plays whole adventures through the cog, from picking the challenge to paying out
+rewards, without a Discord connection. Config is kept in memory and guilds,
+members and messages are small stand-ins, so nothing touches a real bot's data.
+The party reacts as soon as the adventure is posted instead of waiting out the
+countdown. It needs Red installed and is run from the repository root::
+
+    python -m adventure.simulator --adventures 2000 --party 4 --seed 1
+
+It reports adventures per second, Config and Discord calls per adventure, win
+rates and reward distributions. Save a ``--json`` report and pass it back with
+``--baseline`` to use a run as a regression check. The exit status is non-zero
+when a metric drifts past ``--tolerance`` or an adventure logs an error.
+"""
+import argparse
+import asyncio
+import contextlib
+import copy
+import itertools
+import json
+import logging
+import random
+import statistics
+import sys
+import tempfile
+import time
+import weakref
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, MutableMapping, Optional, Tuple
+from unittest import mock
+
+import discord
+from redbot.core import Config
+from redbot.core.drivers import BaseDriver, IdentifierData
+
+from . import bank
+from .adventure import Adventure
+
+log = logging.getLogger("red.cogs.adventure.simulator")
+
+DATA_PATH = Path(__file__).parent / "data"
+# Relative weight of each reaction picked for a simulated adventurer.
+ACTION_WEIGHTS = {"fight": 4, "magic": 3, "talk": 3, "pray": 2, "run": 1}
+# Metrics compared against a baseline report; True marks a relative tolerance,
+# False an absolute one (used for rates).
+REGRESSION_METRICS = {
+    "win_rate": False,
+    "gold.mean": True,
+    "xp.mean": True,
+    "config.per_adventure": True,
+    "discord.per_adventure": True,
+}
+
+
+class MemoryDriver(BaseDriver):
+    """Config driver that keeps everything in a dict and counts every call."""
+
+    ops: Counter = Counter()
+
+    def __init__(self, cog_name: str, identifier: str, **kwargs):
+        super().__init__(cog_name, identifier, **kwargs)
+        self.data: Dict[str, Any] = {}
+
+    @classmethod
+    async def initialize(cls, **storage_details) -> None:
+        pass
+
+    @classmethod
+    async def teardown(cls) -> None:
+        pass
+
+    @staticmethod
+    def get_config_details() -> Dict[str, Any]:
+        return {}
+
+    @classmethod
+    async def aiter_cogs(cls):
+        return
+        yield
+
+    async def get(self, identifier_data: IdentifierData):
+        self.ops["get"] += 1
+        partial = self.data
+        for key in identifier_data.to_tuple()[1:]:
+            partial = partial[key]
+        return copy.deepcopy(partial)
+
+    async def set(self, identifier_data: IdentifierData, value=None) -> None:
+        self.ops["set"] += 1
+        keys = identifier_data.to_tuple()[1:]
+        # Round trip through JSON so the stored data behaves like any other backend.
+        value = json.loads(json.dumps(value))
+        if not keys:
+            self.data = value
+            return
+        partial = self.data
+        for key in keys[:-1]:
+            partial = partial.setdefault(key, {})
+        partial[keys[-1]] = value
+
+    async def clear(self, identifier_data: IdentifierData) -> None:
+        self.ops["clear"] += 1
+        keys = identifier_data.to_tuple()[1:]
+        if not keys:
+            self.data = {}
+            return
+        partial = self.data
+        try:
+            for key in keys[:-1]:
+                partial = partial[key]
+            del partial[keys[-1]]
+        except KeyError:
+            pass
+
+
+def _memory_config(cog_instance, identifier: int, force_registration: bool = False, cog_name: str = None, **kwargs):
+    """Stand-in for :meth:`Config.get_conf` that backs every Config with a :class:`MemoryDriver`."""
+    cog_name = cog_name or type(cog_instance).__name__
+    driver = MemoryDriver(cog_name, str(identifier))
+    return Config(
+        cog_name=cog_name, unique_identifier=str(identifier), driver=driver, force_registration=force_registration
+    )
+
+
+class SimulatedGuild:
+    """Just enough of a guild, its members and its channel for the adventure game."""
+
+    def __init__(self, guild_id: int, size: int):
+        self.id = guild_id
+        self.name = "Simulation"
+        self.calls: Counter = Counter()
+        self._message_ids = itertools.count(guild_id + 1)
+        self.me = SimulatedMember(self, guild_id, "Adventure", bot=True)
+        self.channel = SimulatedChannel(self)
+        self.members = [SimulatedMember(self, guild_id + 10_000 + i, f"Adventurer {i}") for i in range(size)]
+        self._members = {m.id: m for m in (self.me, *self.members)}
+
+    def get_member(self, user_id: int) -> Optional["SimulatedMember"]:
+        return self._members.get(user_id)
+
+
+class SimulatedMember:
+    def __init__(self, guild: SimulatedGuild, user_id: int, name: str, bot: bool = False):
+        self.guild = guild
+        self.id = user_id
+        self.name = self.display_name = name
+        self.mention = f"<@{user_id}>"
+        self.bot = bot
+        self.roles = []
+
+    def __str__(self) -> str:
+        return self.name
+
+    async def send(self, *args, **kwargs) -> "SimulatedMessage":
+        self.guild.calls["dm"] += 1
+        return SimulatedMessage(self.guild.channel, *args, **kwargs)
+
+
+class SimulatedChannel:
+    def __init__(self, guild: SimulatedGuild):
+        self.guild = guild
+        self.id = guild.id
+
+    def permissions_for(self, member: SimulatedMember) -> discord.Permissions:
+        return discord.Permissions.all()
+
+    async def send(self, content: str = None, **kwargs) -> "SimulatedMessage":
+        self.guild.calls["send"] += 1
+        return SimulatedMessage(self, content, **kwargs)
+
+
+class SimulatedMessage:
+    def __init__(self, channel: SimulatedChannel, content: str = None, *, embed: discord.Embed = None, **kwargs):
+        self.channel = channel
+        self.guild = channel.guild
+        self.id = next(channel.guild._message_ids)
+        self.content = content
+        self.embeds = [embed] if embed else []
+        self.jump_url = f"https://discord.com/channels/{self.guild.id}/{channel.id}/{self.id}"
+        # Read by Red's reaction predicates to ignore the bot's own reactions.
+        self._state = SimpleNamespace(self_id=self.guild.me.id)
+
+    async def edit(self, **kwargs) -> None:
+        self.guild.calls["edit"] += 1
+
+    async def delete(self) -> None:
+        self.guild.calls["delete"] += 1
+
+    async def add_reaction(self, emoji) -> None:
+        self.guild.calls["add_reaction"] += 1
+
+    async def remove_reaction(self, emoji, member) -> None:
+        self.guild.calls["remove_reaction"] += 1
+
+    async def clear_reactions(self) -> None:
+        self.guild.calls["clear_reactions"] += 1
+
+
+class SimulatedContext:
+    """The parts of :class:`commands.Context` the adventure command uses."""
+
+    prefix = clean_prefix = "[p]"
+
+    def __init__(self, bot: "SimulatedBot", author: SimulatedMember):
+        self.bot = bot
+        self.cog = bot.cog
+        self.guild = author.guild
+        self.author = author
+        self.me = author.guild.me
+        self.channel = author.guild.channel
+        self.message = SimulatedMessage(self.channel, "[p]adventure")
+
+    async def send(self, content: str = None, **kwargs) -> SimulatedMessage:
+        return await self.channel.send(content, **kwargs)
+
+    async def embed_requested(self) -> bool:
+        return False
+
+    async def embed_colour(self) -> discord.Colour:
+        return discord.Colour.red()
+
+    async def tick(self) -> bool:
+        return True
+
+
+class SimulatedBot:
+    """Stand-in for Red with a single loaded cog that is always allowed to run."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.cog: Optional["SimulatedAdventure"] = None
+        self.guilds: Dict[int, SimulatedGuild] = {}
+
+    def get_cog(self, name: str):
+        return self.cog if name == "Adventure" else None
+
+    def get_guild(self, guild_id: int) -> Optional[SimulatedGuild]:
+        return self.guilds.get(guild_id)
+
+    async def wait_until_red_ready(self) -> None:
+        pass
+
+    async def wait_until_ready(self) -> None:
+        pass
+
+    async def is_owner(self, user) -> bool:
+        return False
+
+    async def allowed_by_whitelist_blacklist(self, user) -> bool:
+        return True
+
+    async def cog_disabled_in_guild(self, cog, guild) -> bool:
+        return False
+
+    def dispatch(self, event: str, *args) -> None:
+        pass
+
+    async def on_command_error(self, ctx, error: Exception, unhandled_by_cog: bool = False) -> None:
+        log.error("Command error", exc_info=error)
+
+
+class SimulatedAdventure(Adventure):
+    """Adventure cog whose party reacts the moment the adventure is posted."""
+
+    def __init__(self, bot: SimulatedBot):
+        super().__init__(bot)
+        self.party: List[Tuple[SimulatedMember, str]] = []
+        self.session = None
+
+    async def _adv_countdown(self, ctx, seconds, title) -> asyncio.Future:
+        await self._data_check(ctx)
+        self.session = session = self._sessions[ctx.guild.id]
+        for (member, action) in self.party:
+            reaction = SimpleNamespace(emoji=self._adventure_controls[action], message=session.message)
+            await self._handle_adventure(reaction, member)
+        finished = self.bot.loop.create_future()
+        finished.set_result(None)
+        return finished
+
+
+class _ErrorCounter(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.count += 1
+
+
+def _summary(values: List[float]) -> MutableMapping[str, float]:
+    if not values:
+        return {"mean": 0.0, "median": 0.0, "p10": 0.0, "p90": 0.0, "min": 0.0, "max": 0.0, "zero": 0.0}
+    ordered = sorted(values)
+    return {
+        "mean": statistics.mean(ordered),
+        "median": statistics.median(ordered),
+        "p10": ordered[int(0.1 * (len(ordered) - 1))],
+        "p90": ordered[int(0.9 * (len(ordered) - 1))],
+        "min": ordered[0],
+        "max": ordered[-1],
+        "zero": sum(1 for v in ordered if v == 0) / len(ordered),
+    }
+
+
+async def _snapshot(cog: SimulatedAdventure, member: SimulatedMember) -> Tuple[int, int, int]:
+    data = await cog._character_cache.get_data(member)
+    return await bank.get_balance(member), data["exp"], data["adventures"]["wins"]
+
+
+@contextlib.asynccontextmanager
+async def simulation(members: int, gold: int) -> AsyncIterator[Tuple[SimulatedBot, SimulatedAdventure, SimulatedGuild]]:
+    """Load the cog on in-memory Config, with a guild of ``members`` adventurers holding ``gold`` each.
+
+    Red hands out one Config per cog name and identifier while the last one is
+    alive, so its registry and the bank's Config are swapped out to start every
+    simulation from empty data.
+    """
+    with tempfile.TemporaryDirectory() as tmp, mock.patch.object(Config, "get_conf", _memory_config), mock.patch(
+        f"{Adventure.__module__}.bundled_data_path", return_value=DATA_PATH
+    ), mock.patch(f"{Adventure.__module__}.cog_data_path", return_value=Path(tmp)), mock.patch(
+        "redbot.core.config._config_cache", weakref.WeakValueDictionary()
+    ), mock.patch.object(
+        bank, "_config", None
+    ):
+        bot = SimulatedBot(asyncio.get_event_loop())
+        cog = bot.cog = SimulatedAdventure(bot)
+        await cog._ready_event.wait()
+        cog._separate_economy = True
+        guild = bot.guilds[10 ** 17] = SimulatedGuild(10 ** 17, members)
+        for member in guild.members:
+            await bank.set_balance(member, gold)
+        try:
+            yield bot, cog, guild
+        finally:
+            cog.cog_unload()
+            bot.cog = None
+
+
+async def simulate(adventures: int, members: int, party: int, gold: int, seed: Optional[int] = None) -> dict:
+    """Run ``adventures`` adventures and return the report."""
+    random.seed(seed)
+    errors = _ErrorCounter()
+    logging.getLogger("red.cogs.adventure").addHandler(errors)
+    actions, weights = zip(*ACTION_WEIGHTS.items())
+    async with simulation(members, gold) as (bot, cog, guild):
+        ops: Counter = Counter()
+        calls: Counter = Counter()
+        kinds: Counter = Counter()
+        kind_wins: Counter = Counter()
+        action_counts: Counter = Counter()
+        action_wins: Counter = Counter()
+        gold_deltas: List[float] = []
+        xp_deltas: List[float] = []
+        elapsed = 0.0
+        skipped = 0
+        for _ in range(adventures):
+            await cog.config.guild(guild).cooldown.set(0)
+            author = random.choice(guild.members)
+            others = random.sample([m for m in guild.members if m is not author], min(party, members) - 1)
+            cog.party = [(m, random.choices(actions, weights)[0]) for m in (author, *others)]
+            cog.session = None
+            before = {m.id: await _snapshot(cog, m) for (m, action) in cog.party}
+            ops_before, calls_before = MemoryDriver.ops.copy(), guild.calls.copy()
+
+            start = time.perf_counter()
+            await cog._adventure.callback(cog, SimulatedContext(bot, author))
+            elapsed += time.perf_counter() - start
+
+            ops.update(MemoryDriver.ops - ops_before)
+            calls.update(guild.calls - calls_before)
+            session = cog.session
+            if session is None:
+                skipped += 1
+                continue
+            # The scheduler would drop the finished session from the participant
+            # index six minutes later; the simulator gets there much sooner.
+            cog._expire_session(guild.id, session)
+            if session.no_monster:
+                kind = "no_monster"
+            else:
+                kind = "boss" if session.boss else "miniboss" if session.miniboss else "normal"
+            kinds[kind] += 1
+            won = False
+            for (member, action) in cog.party:
+                if session.action_of(member) is None:
+                    continue
+                (balance, exp, wins) = await _snapshot(cog, member)
+                (old_balance, old_exp, old_wins) = before[member.id]
+                gold_deltas.append(balance - old_balance)
+                xp_deltas.append(exp - old_exp)
+                action_counts[action] += 1
+                if wins > old_wins:
+                    action_wins[action] += 1
+                    won = True
+            kind_wins[kind] += won
+
+        ops_before = MemoryDriver.ops.copy()
+        await cog._character_cache.flush()
+        ops.update(MemoryDriver.ops - ops_before)
+    logging.getLogger("red.cogs.adventure").removeHandler(errors)
+
+    completed = adventures - skipped
+    return {
+        "adventures": adventures,
+        "completed": completed,
+        "skipped": skipped,
+        "errors": errors.count,
+        "party": party,
+        "seed": seed,
+        "seconds": elapsed,
+        "adventures_per_second": completed / elapsed if elapsed else 0.0,
+        "config": {**ops, "per_adventure": sum(ops.values()) / completed if completed else 0.0},
+        "discord": {**calls, "per_adventure": sum(calls.values()) / completed if completed else 0.0},
+        "win_rate": sum(kind_wins.values()) / completed if completed else 0.0,
+        "kinds": {k: {"count": n, "win_rate": kind_wins[k] / n} for (k, n) in sorted(kinds.items())},
+        "actions": {a: {"count": n, "win_rate": action_wins[a] / n} for (a, n) in sorted(action_counts.items())},
+        "gold": _summary(gold_deltas),
+        "xp": _summary(xp_deltas),
+    }
+
+
+def _metric(report: dict, name: str) -> float:
+    value = report
+    for key in name.split("."):
+        value = value[key]
+    return value
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Return a line for every regression metric that drifted past ``tolerance``."""
+    drift = []
+    if report["errors"]:
+        drift.append(f"errors: {report['errors']} logged")
+    for (name, relative) in REGRESSION_METRICS.items():
+        (new, old) = (_metric(report, name), _metric(baseline, name))
+        change = abs(new - old) / abs(old) if relative and old else abs(new - old)
+        if change > tolerance:
+            drift.append(f"{name}: {old:.4g} -> {new:.4g}")
+    return drift
+
+
+def _format(report: dict) -> str:
+    lines = [
+        f"{report['completed']} adventures in {report['seconds']:.2f}s "
+        f"({report['adventures_per_second']:.1f}/s), {report['skipped']} skipped, {report['errors']} errors",
+        f"Config calls per adventure:  {report['config']['per_adventure']:.1f}",
+        f"Discord calls per adventure: {report['discord']['per_adventure']:.1f}",
+        f"Win rate: {report['win_rate']:.1%}",
+    ]
+    for (group, results) in (("Challenge", report["kinds"]), ("Action", report["actions"])):
+        for (name, result) in results.items():
+            lines.append(f"  {group} {name:<10} {result['count']:>6}  {result['win_rate']:.1%}")
+    for (name, label) in (("gold", "Gold"), ("xp", "XP")):
+        s = report[name]
+        lines.append(
+            f"{label} per adventurer: mean {s['mean']:.1f}, median {s['median']:.0f}, "
+            f"p10 {s['p10']:.0f}, p90 {s['p90']:.0f}, min {s['min']:.0f}, max {s['max']:.0f}, none {s['zero']:.1%}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m adventure.simulator", description=__doc__.splitlines()[0])
+    parser.add_argument("--adventures", type=int, default=1000, help="number of adventures to play")
+    parser.add_argument("--members", type=int, default=20, help="number of adventurers in the guild")
+    parser.add_argument("--party", type=int, default=4, help="adventurers taking part in each adventure")
+    parser.add_argument("--gold", type=int, default=5000, help="starting balance of every adventurer")
+    parser.add_argument("--seed", type=int, default=None, help="random seed")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--baseline", type=Path, help="JSON report to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="allowed drift from the baseline, absolute for rates"
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    report = asyncio.get_event_loop().run_until_complete(
+        simulate(args.adventures, args.members, args.party, args.gold, args.seed)
+    )
+    print(json.dumps(report, indent=2) if args.json else _format(report))
+    if args.baseline is not None:
+        with args.baseline.open("r") as f:
+            drift = compare(report, json.load(f), args.tolerance)
+        for line in drift:
+            print(f"DRIFT {line}", file=sys.stderr)
+        return 1 if drift else 0
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, MutableMapping, Optional, Tuple
+
+log = logging.getLogger("red.cogs.adventure.themes")
+
+# Bump whenever the layout of a compiled bundle changes so stale caches are rebuilt.
+BUNDLE_VERSION = 2
+
+# Cog attribute -> theme file.
+THEME_FILES = {
+    "PETS": "pets.json",
+    "ATTRIBS": "attribs.json",
+    "MONSTERS": "monsters.json",
+    "AS_MONSTERS": "as_monsters.json",
+    "LOCATIONS": "locations.json",
+    "RAISINS": "raisins.json",
+    "THREATEE": "threatee.json",
+    "TR_GEAR_SET": "tr_set.json",
+    "PREFIXES": "prefixes.json",
+    "MATERIALS": "materials.json",
+    "EQUIPMENT": "equipment.json",
+    "SUFFIXES": "suffixes.json",
+    "SET_BONUSES": "set_bonuses.json",
+}
+# Every file except the ascended monsters has to have content for a theme to be usable.
+REQUIRED = [name for name in THEME_FILES if name != "AS_MONSTERS"]
+
+
+def resolve_theme_files(theme_path: Path, default_path: Path) -> Dict[str, Path]:
+    """Map each theme attribute to its file, falling back to the default theme's copy."""
+    files = {}
+    for (name, filename) in THEME_FILES.items():
+        file = theme_path / filename
+        files[name] = file if file.exists() else default_path / filename
+    return files
+
+
+def is_valid(data: MutableMapping[str, Any]) -> bool:
+    return all(len(data.get(name) or ()) > 0 for name in REQUIRED)
+
+
+def _signature(files: Dict[str, Path]) -> List[list]:
+    signature = []
+    for (name, file) in sorted(files.items()):
+        stat = file.stat()
+        signature.append([name, str(file), stat.st_mtime_ns, stat.st_size])
+    return signature
+
+
+def _read_bundle(bundle_path: Path, signature: List[list]) -> Optional[Dict[str, Any]]:
+    """Return the bundle's theme data, or None if it is stale or damaged."""
+    with bundle_path.open("rb") as f:
+        raw = f.read()
+    (header, _, payload) = raw.partition(b"\n")
+    header = json.loads(header)
+    if header.get("version") != BUNDLE_VERSION or header.get("signature") != signature:
+        return None
+    if header.get("sha256") != hashlib.sha256(payload).hexdigest():
+        log.warning("Theme bundle %s does not match its checksum; loading the theme files.", bundle_path)
+        return None
+    return json.loads(payload)
+
+
+def _write_bundle(bundle_path: Path, signature: List[list], data: Dict[str, Any]) -> None:
+    payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    header = {"version": BUNDLE_VERSION, "signature": signature, "sha256": hashlib.sha256(payload).hexdigest()}
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = bundle_path.with_suffix(".tmp")
+    with tmp_path.open("wb") as f:
+        f.write(json.dumps(header).encode("utf-8") + b"\n" + payload)
+    os.replace(tmp_path, bundle_path)
+
+
+def load_bundle(files: Dict[str, Path], bundle_path: Path) -> Tuple[Dict[str, Any], bool, float]:
+    """Load a theme, preferring its compiled bundle.
+
+    The bundle is a single JSON document of every theme file. A header line holds
+    the format version, the paths, modification times and sizes of the sources,
+    and a SHA-256 of the document; if any of them doesn't match, the theme files
+    are read instead and the bundle is recompiled. Only valid themes are compiled.
+    This does blocking IO, so run it in an executor.
+
+    Returns the theme data, whether the bundle was used and the load time in seconds.
+    """
+    start = time.perf_counter()
+    signature = _signature(files)
+    try:
+        data = _read_bundle(bundle_path, signature)
+        if data is not None:
+            return data, True, time.perf_counter() - start
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        log.warning("Ignoring unreadable theme bundle %s: %s", bundle_path, exc)
+
+    data = {}
+    for (name, file) in files.items():
+        with file.open("r") as f:
+            data[name] = json.load(f)
+    if is_valid(data):
+        try:
+            _write_bundle(bundle_path, signature, data)
+        except OSError as exc:
+            log.warning("Could not write theme bundle %s: %s", bundle_path, exc)
+    return data, False, time.perf_counter() - start
+
+
+class AffixTables:
+    """Item generation tables for a loaded theme.
+
+    Built once when a theme loads, so generating an item only has to pick from
+    prebuilt tuples instead of listing the theme dictionaries on every draw.
+    """
+
+    __slots__ = ("prefixes", "materials", "equipment", "suffixes", "set_items", "_set_items_by_slot")
+
+    def __init__(
+        self,
+        prefixes: Mapping[str, dict],
+        materials: Mapping[str, Mapping[str, int]],
+        equipment: Mapping[str, Mapping[str, dict]],
+        suffixes: Mapping[str, dict],
+        set_items: Mapping[str, dict],
+    ):
+        self.prefixes: Tuple[Tuple[str, dict], ...] = tuple(prefixes.items())
+        self.materials = MappingProxyType({rarity: tuple(table.items()) for (rarity, table) in materials.items()})
+        self.equipment = MappingProxyType({slot: tuple(table.items()) for (slot, table) in equipment.items()})
+        self.suffixes: Tuple[Tuple[str, dict], ...] = tuple(suffixes.items())
+        self.set_items: Tuple[Tuple[str, dict], ...] = tuple(set_items.items())
+        self._set_items_by_slot: Dict[str, Tuple[Tuple[str, dict], ...]] = {}
+
+    def set_items_for(self, slot: str = None) -> Tuple[Tuple[str, dict], ...]:
+        """Set items that fit ``slot``; every set item if no slot is given."""
+        if not slot:
+            return self.set_items
+        if slot not in self._set_items_by_slot:
+            self._set_items_by_slot[slot] = tuple(
+                i
+                for i in self.set_items
+                if i[1]["slot"] == [slot] or (slot == "two handed" and i[1]["slot"] == ["left", "right"])
+            )
+        return self._set_items_by_slot[slot]
@@ -0,0 +1,74 @@
+"""Time to load an adventure party's sheets, one after another and preloaded.
+
+Gives every member of a ``--party``-member guild a ``--backpack``-item backpack,
+then slows Config down: every read of the cog's Config waits ``--config-delay``
+milliseconds and every bank read ``--bank-delay``, standing in for a real
+database. The serial run loads each sheet through AdventureSettlement.get() in
+turn, as the resolvers did before preloading; the preloaded run calls
+AdventureSettlement.preload() first. The character cache is emptied before each
+run. It needs Red installed and is run from the repository root::
+
+    python -m benchmarks.adventure_preload --party 5 --party 20 --party 50 --party 100
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import List
+from unittest import mock
+
+from adventure.cache import AdventureSettlement
+from adventure.charsheet import Backpack, Item
+from adventure.simulator import MemoryDriver, simulation
+
+from .items import item_pool
+
+
+async def run(party: int, backpack: int, config_delay: float, bank_delay: float) -> None:
+    rng = random.Random(party)
+    async with simulation(members=party, gold=1000) as (bot, cog, guild):
+        for member in guild.members:
+            c = await cog.get_character(member)
+            c.backpack = Backpack(
+                {name: Item.from_json({name: data}) for (name, data) in item_pool(backpack, rng).items()}
+            )
+            await cog.save_character(member, c)
+        await cog._character_cache.flush()
+        get = MemoryDriver.get
+
+        async def slow_get(driver, identifier_data):
+            await asyncio.sleep(bank_delay if identifier_data.cog_name == "AdventureBank" else config_delay)
+            return await get(driver, identifier_data)
+
+        timings = []
+        with mock.patch.object(MemoryDriver, "get", slow_get):
+            for preload in (False, True):
+                for member in guild.members:
+                    cog._character_cache.invalidate(member.id)
+                settlement = AdventureSettlement(cog._character_cache, {}, cog.get_lock)
+                began = time.perf_counter()
+                if preload:
+                    await settlement.preload(guild.members)
+                for member in guild.members:
+                    await settlement.get(member)
+                timings.append((time.perf_counter() - began) * 1000)
+        print(f"party of {party:3}: {timings[0]:7.0f}ms serial, {timings[1]:6.0f}ms preloaded")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.adventure_preload", description=__doc__.splitlines()[0])
+    parser.add_argument("--party", type=int, action="append", default=None, help="party size (repeatable)")
+    parser.add_argument("--backpack", type=int, default=200, help="items in each backpack")
+    parser.add_argument("--config-delay", type=float, default=20, help="milliseconds each Config read waits")
+    parser.add_argument("--bank-delay", type=float, default=10, help="milliseconds each bank read waits")
+    args = parser.parse_args(argv)
+    for party in args.party or [5, 20, 50, 100]:
+        asyncio.get_event_loop().run_until_complete(
+            run(party, args.backpack, args.config_delay / 1000, args.bank_delay / 1000)
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
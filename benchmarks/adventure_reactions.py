@@ -0,0 +1,97 @@
+"""Reaction handling with many adventures running at once, in restricted mode.
+
+Starts ``sessions`` adventures of ``users`` players each. Every player reacts
+twice in their own guild, then 1,000 of them try to join another guild's
+adventure and are turned away. Reports reactions handled per second, and the
+time of the "already in an adventure" check through the participant index
+against scanning every session's action lists, as the cog did before the index.
+Balance checks are answered without reading the bank, so the numbers are the
+handler's own cost. It needs Red installed and is run from the repository root::
+
+    python -m benchmarks.adventure_reactions --shape 10x5 --shape 100x10 --shape 1000x5
+"""
+import argparse
+import asyncio
+import itertools
+import sys
+import time
+from types import SimpleNamespace
+from typing import List, Tuple
+from unittest import mock
+
+from adventure.charsheet import GameSession
+from adventure.simulator import SimulatedGuild, simulation
+
+# Players who try to join a second adventure in each run.
+INTRUDERS = 1000
+ACTIONS = ("fight", "magic", "talk", "pray", "run")
+
+
+async def always_funded(user, cost) -> bool:
+    return True
+
+
+def scanned_in_adventure(cog, user) -> bool:
+    participants = set(
+        player.id
+        for session in cog._sessions.values()
+        for player in [*session.fight, *session.magic, *session.pray, *session.talk, *session.run]
+    )
+    return user.id in participants
+
+
+async def run(sessions: int, users: int) -> None:
+    with mock.patch("adventure.adventure.has_funds", always_funded):
+        async with simulation(members=0, gold=0) as (bot, cog, guild):
+            await cog.config.restrict.set(True)
+            cog._settings.forget("restrict")
+            guilds = [SimulatedGuild(10 ** 15 * (i + 1), users) for i in range(sessions)]
+            for g in guilds:
+                cog._sessions[g.id] = GameSession(
+                    challenge="Ogre", attribute="", guild=g, boss=False, miniboss={}, timer=60, monster={}
+                )
+            reactions: List[Tuple[object, object]] = []
+            for g in guilds:
+                message = await g.channel.send("adventure")
+                for (member, action) in itertools.product(g.members, ACTIONS[:2]):
+                    reactions.append((SimpleNamespace(emoji=cog._adventure_controls[action], message=message), member))
+            players = itertools.cycle([member for g in guilds for member in g.members])
+            for (g, player) in zip(itertools.cycle(guilds[1:] + guilds[:1]), itertools.islice(players, INTRUDERS)):
+                # The same player, reacting in another guild's adventure.
+                member = SimpleNamespace(**{**vars(player), "guild": g})
+                message = await g.channel.send("adventure")
+                reactions.append((SimpleNamespace(emoji=cog._adventure_controls["fight"], message=message), member))
+
+            began = time.perf_counter()
+            for (reaction, member) in reactions:
+                await cog._handle_adventure(reaction, member)
+            elapsed = time.perf_counter() - began
+            checked = [member for (reaction, member) in reactions[-INTRUDERS:]]
+            timings = []
+            for check in (lambda user: cog.in_adventure(user=user), lambda user: scanned_in_adventure(cog, user)):
+                began = time.perf_counter()
+                for user in checked:
+                    check(user)
+                timings.append((time.perf_counter() - began) / len(checked) * 10 ** 6)
+            print(
+                f"{sessions:5} sessions x {users:3} players: {len(reactions) / elapsed:8.0f} reactions/s, "
+                f"check {timings[0]:7.1f} us indexed, {timings[1]:9.1f} us scanning every session"
+            )
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.adventure_reactions", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument(
+        "--shape", action="append", default=None, help="sessions x players per session, e.g. 100x10 (repeatable)"
+    )
+    args = parser.parse_args(argv)
+    for shape in args.shape or ["10x5", "100x10", "1000x5"]:
+        (sessions, users) = map(int, shape.split("x"))
+        asyncio.get_event_loop().run_until_complete(run(sessions, users))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
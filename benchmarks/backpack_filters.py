@@ -0,0 +1,68 @@
+"""Time of filtered backpack queries, with and without the backpack indexes.
+
+Runs ``--queries`` selective queries (one slot and one rarity each) through
+Character.get_sorted_backpack_arg_parse on a ``--backpack``-item backpack. The
+indexed run passes the character's Backpack; the scan run passes a plain dict
+copy, which makes the same method filter every item as it did before the indexes.
+It needs Red installed and is run from the repository root::
+
+    python -m benchmarks.backpack_filters --backpack 10000 --queries 80
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import List
+
+from adventure.charsheet import ORDER, Backpack, Item
+from adventure.simulator import simulation
+
+from .items import MARKERS, item_pool
+
+
+async def run(backpack: int, queries: int, seed: int) -> None:
+    rng = random.Random(seed)
+    items = [Item.from_json({name: data}) for (name, data) in item_pool(backpack, rng).items()]
+    async with simulation(members=1, gold=0) as (bot, cog, guild):
+        c = await cog.get_character(guild.members[0])
+        c.backpack = Backpack({item.name: item for item in items})
+        filters = [{"slots": [rng.choice(ORDER)], "rarities": [rng.choice(list(MARKERS))]} for _ in range(queries)]
+        for (label, backpack) in (("indexed", c.backpack), ("scan", dict(c.backpack))):
+            began = time.perf_counter()
+            matched = 0
+            for query in filters:
+                result = await c.get_sorted_backpack_arg_parse(
+                    backpack,
+                    equippable=False,
+                    _except=False,
+                    sets=[],
+                    strength={},
+                    intelligence={},
+                    charisma={},
+                    luck={},
+                    dexterity={},
+                    level={},
+                    degrade={},
+                    ignore_case=False,
+                    match=None,
+                    no_match=None,
+                    **query,
+                )
+                matched += sum(len(entries) for (slot, entries) in result)
+            elapsed = time.perf_counter() - began
+            print(f"{label:8} {elapsed:.3f}s for {queries} queries, {matched / queries:.0f} items matched on average")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.backpack_filters", description=__doc__.splitlines()[0])
+    parser.add_argument("--backpack", type=int, default=10000, help="items in the backpack")
+    parser.add_argument("--queries", type=int, default=80, help="number of queries to time")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    args = parser.parse_args(argv)
+    asyncio.get_event_loop().run_until_complete(run(args.backpack, args.queries, args.seed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
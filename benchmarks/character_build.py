@@ -0,0 +1,67 @@
+"""Time to build a Character from its loaded sheet, by rebirths and backpack size.
+
+Gives one adventurer an item in every slot, ``rebirths`` rebirths and a
+``backpack``-item backpack, captures the arguments Character.from_json passes
+to Character, and times ``--repeat`` constructions from them. Reading the
+sheet and the balance isn't timed. Building the same character again is what
+the cog does on every load, so gear stats come from their cache after the
+first build. It needs Red installed and is run from the repository root::
+
+    python -m benchmarks.character_build --shape 10x0 --shape 60x0 --shape 200x0 --shape 60x1000
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import List
+
+from adventure.charsheet import ORDER, Character, Item
+from adventure.simulator import simulation
+
+from .items import item_pool
+
+
+class Captured(Character):
+    """Keeps the arguments from_json builds a Character with instead of building it."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+
+async def run(rebirths: int, backpack: int, repeat: int) -> None:
+    rng = random.Random(f"{rebirths}x{backpack}")
+    async with simulation(members=1, gold=1000) as (bot, cog, guild):
+        (member,) = guild.members
+        c = await cog.get_character(member)
+        pool = [Item.from_json({name: data}) for (name, data) in item_pool(backpack + 500, rng).items()]
+        for slot in ORDER:
+            if slot != "two handed":
+                setattr(c, slot, next(item for item in pool if item.slot == [slot]))
+        c.backpack = {item.name: item for item in pool[-backpack:]} if backpack else {}
+        c.rebirths = rebirths
+        data = await c.to_json(cog.config)
+        kwargs = (await Captured.from_json(cog.config, member, {}, data=data)).kwargs
+        began = time.perf_counter()
+        for _ in range(repeat):
+            Character(**kwargs)
+        elapsed = (time.perf_counter() - began) / repeat
+        size = f"{elapsed * 10 ** 6:.0f} us" if elapsed < 0.001 else f"{elapsed * 1000:.1f} ms"
+        print(f"{rebirths:4} rebirths, {backpack:5} items: {size} per Character")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.character_build", description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--shape", action="append", default=None, help="rebirths x backpack items, e.g. 60x1000 (repeatable)"
+    )
+    parser.add_argument("--repeat", type=int, default=200, help="constructions to time per shape")
+    args = parser.parse_args(argv)
+    for shape in args.shape or ["10x0", "60x0", "200x0", "60x1000", "200x1000"]:
+        (rebirths, backpack) = map(int, shape.split("x"))
+        asyncio.get_event_loop().run_until_complete(run(rebirths, backpack, args.repeat))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
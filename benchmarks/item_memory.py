@@ -0,0 +1,56 @@
+"""Memory taken by loaded backpacks.
+
+Builds ``--characters`` backpacks of ``--backpack`` items each, drawn from a pool of
+``--pool`` distinct items, the way Config hands them to Item.from_json: every
+backpack is a fresh copy of its stored JSON. Reports the memory the loaded items
+hold, measured with tracemalloc, and the time to load one backpack. It only uses
+Item.from_json, so it runs on older revisions too. Run it from the repository root::
+
+    python -m benchmarks.item_memory --characters 1000 --backpack 500 --pool 5000
+"""
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from typing import List
+
+from adventure.charsheet import Item
+
+from .items import item_pool
+
+
+def load_backpacks(characters: int, backpack: int, pool: dict, rng: random.Random) -> List[dict]:
+    names = list(pool)
+    backpacks = []
+    for _ in range(characters):
+        stored = json.loads(json.dumps({name: pool[name] for name in rng.sample(names, backpack)}))
+        backpacks.append({name: Item.from_json({name: data}) for (name, data) in stored.items()})
+    return backpacks
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.item_memory", description=__doc__.splitlines()[0])
+    parser.add_argument("--characters", type=int, default=1000, help="number of backpacks to load")
+    parser.add_argument("--backpack", type=int, default=500, help="items in each backpack")
+    parser.add_argument("--pool", type=int, default=5000, help="distinct items the backpacks are drawn from")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    pool = item_pool(args.pool, rng)
+    tracemalloc.start()
+    began = time.perf_counter()
+    backpacks = load_backpacks(args.characters, args.backpack, pool, rng)
+    elapsed = time.perf_counter() - began
+    (held, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{len(backpacks)} backpacks of {args.backpack} items from a pool of {args.pool}")
+    print(f"  held {held / 2 ** 20:.1f} MiB, peak {peak / 2 ** 20:.1f} MiB")
+    print(f"  {elapsed / len(backpacks) * 1000:.2f} ms per backpack (under tracemalloc)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
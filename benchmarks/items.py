@@ -0,0 +1,50 @@
+"""Stored item data for the benchmarks, generated from the bundled item tables."""
+import json
+import random
+from pathlib import Path
+from typing import Dict
+
+from adventure.charsheet import ORDER
+
+DATA = Path(__file__).parents[1] / "adventure" / "data" / "default"
+# Rarities a generated item can have, and the marker its stored name carries.
+MARKERS = {
+    "normal": "{}",
+    "rare": ".{}",
+    "epic": "[{}]",
+    "legendary": "{{Legendary:'{}'}}",
+    "ascended": "{{Ascended:'{}'}}",
+}
+# Stored slot lists, as _genitems writes them.
+SLOTS = [[slot] if slot != "two handed" else ["left", "right"] for slot in ORDER]
+
+
+def _load(name: str) -> dict:
+    with (DATA / f"{name}.json").open() as f:
+        return json.load(f)
+
+
+def stored_name(name: str, rarity: str) -> str:
+    """The backpack key the cog stores an item of ``rarity`` under."""
+    if rarity == "rare":
+        name = name.replace(" ", "_")
+    return MARKERS[rarity].format(name)
+
+
+def item_pool(size: int, rng: random.Random) -> Dict[str, dict]:
+    """``size`` distinct stored items, as ``{backpack key: item data}``."""
+    materials = [name for names in _load("materials").values() for name in names]
+    equipment = [name for names in _load("equipment").values() for name in names]
+    (prefixes, suffixes) = (list(_load("prefixes")), list(_load("suffixes")))
+    pool = {}
+    while len(pool) < size:
+        rarity = rng.choice(list(MARKERS))
+        name = f"{rng.choice(materials)} {rng.choice(equipment)}"
+        if rarity != "normal":
+            name = f"{rng.choice(prefixes)} {name}"
+        if rarity in ("epic", "legendary", "ascended"):
+            name = f"{name} of {rng.choice(suffixes)}"
+        data = {stat: rng.randint(-5, 30) for stat in ("att", "int", "cha", "dex", "luck")}
+        data.update(slot=rng.choice(SLOTS), rarity=rarity, owned=rng.randint(1, 5), degrade=rng.randint(1, 3))
+        pool[stored_name(name, rarity)] = data
+    return pool
@@ -0,0 +1,76 @@
+"""Stored size of loadouts as item copies and as references, and time to switch loadouts.
+
+Gives one adventurer a ``--backpack``-item backpack and saves ``loadouts``
+loadouts, changing ``--changed`` of the eleven gear slots between them. Reports
+the JSON size of the loadouts stored the legacy way (a copy of every item) and
+as references, the size of the whole sheet each way, and the time
+Character.equip_loadout takes per switch. It needs Red installed and is run
+from the repository root::
+
+    python -m benchmarks.loadout_sizes --loadouts 1 --loadouts 10 --loadouts 50
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import List
+
+from adventure.charsheet import GEAR_SLOTS, Character, Item
+from adventure.simulator import simulation
+
+from .items import item_pool
+
+# Loadout switches timed per run.
+SWITCHES = 500
+
+
+def size(value) -> str:
+    return f"{len(json.dumps(value)) / 1024:6.1f} KiB"
+
+
+async def run(loadouts: int, backpack: int, changed: int) -> None:
+    rng = random.Random(loadouts)
+    async with simulation(members=1, gold=0) as (bot, cog, guild):
+        (member,) = guild.members
+        c = await cog.get_character(member)
+        c.lvl = 10000
+        items = [Item.from_json({name: data}) for (name, data) in item_pool(backpack, rng).items()]
+        c.backpack = {item.name: item for item in items}
+        by_slot = {slot: [item for item in c.backpack.values() if item.slot == [slot]] for slot in GEAR_SLOTS}
+        legacy = {}
+        for index in range(loadouts):
+            for slot in rng.sample([slot for slot in GEAR_SLOTS if by_slot[slot]], changed):
+                item = rng.choice(by_slot[slot])
+                if item.name in c.backpack:
+                    await c.equip_item(item, True)
+            c.loadouts[f"loadout {index}"] = await Character.save_loadout(c)
+            legacy[f"loadout {index}"] = {
+                slot: item.to_json() if (item := getattr(c, slot)) else {} for slot in GEAR_SLOTS
+            }
+        sheet = await c.to_json(cog.config)
+        print(
+            f"{loadouts:3} loadouts: legacy {size(legacy)}, references {size(c.loadouts)}; "
+            f"whole sheet {size({**sheet, 'loadouts': legacy})} -> {size(sheet)}"
+        )
+        names = [rng.choice(list(c.loadouts)) for _ in range(SWITCHES)]
+        began = time.perf_counter()
+        for name in names:
+            await c.equip_loadout(name)
+        print(f"{'':14}equip_loadout {(time.perf_counter() - began) / SWITCHES * 10 ** 6:.0f} us per switch")
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadout_sizes", description=__doc__.splitlines()[0])
+    parser.add_argument("--loadouts", type=int, action="append", default=None, help="loadouts saved (repeatable)")
+    parser.add_argument("--backpack", type=int, default=200, help="items in the backpack")
+    parser.add_argument("--changed", type=int, default=6, help="gear slots changed between loadouts")
+    args = parser.parse_args(argv)
+    for loadouts in args.loadouts or [1, 10, 50]:
+        asyncio.get_event_loop().run_until_complete(run(loadouts, args.backpack, args.changed))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Time and Config reads of a full load against a projected load, by backpack size.
+
+Gives one adventurer 60 rebirths, an item in every slot, five loadouts and a
+``backpack``-item backpack, then loads it ``--repeat`` times through
+CharacterCache.load() and CharacterCache.load_projected(), first on a cache miss
+and then on a hit. Reads are the JSON size of what Config hands back. It needs Red installed and is run
+from the repository root::
+
+    python -m benchmarks.projected_loads --backpack 0 --backpack 200 --backpack 1000
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import List
+from unittest import mock
+
+from adventure.charsheet import ORDER, Character, Item
+from adventure.simulator import MemoryDriver, simulation
+
+from .items import item_pool
+
+# Loadouts saved on the sheet, each naming the item equipped in every slot.
+LOADOUTS = 5
+
+
+async def run(backpack: int, repeat: int) -> None:
+    rng = random.Random(backpack)
+    async with simulation(members=1, gold=1000) as (bot, cog, guild):
+        (member,) = guild.members
+        cache = cog._character_cache
+        c = await cache.load(member, {})
+        c.rebirths = 60
+        pool = [Item.from_json({name: data}) for (name, data) in item_pool(backpack + 500, rng).items()]
+        for slot in ORDER:
+            if slot != "two handed":
+                setattr(c, slot, next(item for item in pool if item.slot == [slot]))
+        c.backpack = {item.name: item for item in pool[-backpack:]} if backpack else {}
+        for index in range(LOADOUTS):
+            c.loadouts[f"loadout {index}"] = await Character.save_loadout(c)
+        await cache.save(member, c)
+        await cache.flush(member.id)
+        read = {"bytes": 0}
+        get = MemoryDriver.get
+
+        async def counting_get(driver, identifier_data):
+            value = await get(driver, identifier_data)
+            read["bytes"] += len(json.dumps(value))
+            return value
+
+        line = [f"backpack {backpack:5}:"]
+        with mock.patch.object(MemoryDriver, "get", counting_get):
+            for hit in (False, True):
+                for (label, load) in (("full", cache.load), ("projected", cache.load_projected)):
+                    read["bytes"] = 0
+                    elapsed = 0.0
+                    for _ in range(repeat):
+                        if not hit:
+                            cache.invalidate(member.id)
+                        began = time.perf_counter()
+                        await load(member, {})
+                        elapsed += time.perf_counter() - began
+                    cost = f"{elapsed / repeat * 1000:6.2f} ms"
+                    if not hit:
+                        cost += f" / {read['bytes'] / repeat / 1024:5.1f} KiB"
+                    line.append(f"{'hit' if hit else 'miss'} {label} {cost}")
+                if not hit:
+                    await cache.load(member, {})
+        print(line[0], ", ".join(line[1:]))
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.projected_loads", description=__doc__.splitlines()[0])
+    parser.add_argument("--backpack", type=int, action="append", default=None, help="backpack size (repeatable)")
+    parser.add_argument("--repeat", type=int, default=50, help="loads to time per case")
+    args = parser.parse_args(argv)
+    for backpack in args.backpack or [0, 200, 1000]:
+        asyncio.get_event_loop().run_until_complete(run(backpack, args.repeat))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Time of a scoreboard button switch: fetch a stat's ranking and read its first page.
+
+Ranks ``--users`` adventurers, ``--members`` of whom are in the guild, and
+switches between the eight adventure stats on the global and the guild board.
+The list run builds the whole ranking with RankedIndex.top(), as every switch
+did before the orderings were cached. The cached run asks for
+RankedIndex.ranking() once every stat's ordering is cached, and the reordered
+run does the same right after a save has moved someone. The first page is read
+through ScoreboardSource the way the menu reads it. It needs Red installed and is run from the repository root::
+
+    python -m benchmarks.scoreboard_switch --users 100000 --members 5000
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+from typing import List
+
+from adventure.leaderboard import ADVENTURE_STATS, Leaderboards
+from adventure.menus import ScoreboardSource
+
+# Switches timed for each kind of run; rebuilding the whole list is far slower.
+SWITCHES = 200
+LIST_SWITCHES = 16
+
+
+class Guild:
+    def __init__(self, guild_id: int, members: List[int]):
+        self.id = guild_id
+        self.chunked = True
+        self._members = set(members)
+
+    def get_member(self, user_id: int):
+        return user_id if user_id in self._members else None
+
+
+def random_sheet(rng: random.Random) -> dict:
+    adventures = {stat: rng.randint(0, 5000) for stat in ADVENTURE_STATS}
+    return {"lvl": rng.randint(1, 500), "rebirths": rng.randint(0, 60), "adventures": adventures}
+
+
+async def run(users: int, members: int) -> None:
+    rng = random.Random(users)
+    leaderboards = Leaderboards()
+    await leaderboards.build({user_id: random_sheet(rng) for user_id in range(1, users + 1)})
+    guild = Guild(1, rng.sample(range(1, users + 1), members))
+    check = lambda user_id, data: guild.get_member(user_id) is not None
+    for (board, board_check) in (("global", None), ("guild", check)):
+        key = leaderboards.guild_key(guild) if board_check is not None else None
+        timings = {}
+        for kind in ("list", "cached", "reordered"):
+            if kind == "cached":
+                for index in leaderboards.adventures.values():
+                    index.ranking(board_check, key)
+            elapsed = 0.0
+            switches = LIST_SWITCHES if kind == "list" else SWITCHES
+            for switch in range(switches):
+                stat = ADVENTURE_STATS[switch % len(ADVENTURE_STATS)]
+                index = leaderboards.adventures[stat]
+                if kind == "reordered":
+                    leaderboards.update(rng.randint(1, users), random_sheet(rng))
+                began = time.perf_counter()
+                if kind == "list":
+                    entries = index.top(check=board_check)
+                else:
+                    entries = index.ranking(board_check, key)
+                await ScoreboardSource(entries, stat).get_page(0)
+                elapsed += time.perf_counter() - began
+            timings[kind] = elapsed / switches * 1000
+        print(
+            f"{board:6} board: {timings['list']:8.3f} ms rebuilding the list, {timings['cached']:8.3f} ms cached, "
+            f"{timings['reordered']:8.3f} ms after a save reorders"
+        )
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.scoreboard_switch", description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100000, help="ranked adventurers")
+    parser.add_argument("--members", type=int, default=5000, help="of them in the guild")
+    args = parser.parse_args(argv)
+    asyncio.get_event_loop().run_until_complete(run(args.users, args.members))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
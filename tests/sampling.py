@@ -0,0 +1,31 @@
+from collections import Counter
+
+# Standard normal quantile for the p = 0.001 upper tail. The checks are seeded, so
+# they either always pass or always fail; the margin is for reseeding.
+Z_CRITICAL = 3.090
+
+
+def chi_square(first: Counter, second: Counter) -> float:
+    """Chi-square statistic for whether two samples come from the same distribution."""
+    total_first = sum(first.values())
+    total_second = sum(second.values())
+    statistic = 0.0
+    for key in set(first) | set(second):
+        pooled = first[key] + second[key]
+        for (observed, total) in ((first[key], total_first), (second[key], total_second)):
+            expected = pooled * total / (total_first + total_second)
+            statistic += (observed - expected) ** 2 / expected
+    return statistic
+
+
+def chi_square_critical(degrees: int) -> float:
+    """Critical chi-square value at p = 0.001, by the Wilson-Hilferty approximation."""
+    scale = 2 / (9 * degrees)
+    return degrees * (1 - scale + Z_CRITICAL * scale**0.5) ** 3
+
+
+def assert_same_distribution(first: Counter, second: Counter) -> None:
+    """Check that two samples are consistent with one distribution."""
+    degrees = len(set(first) | set(second)) - 1
+    if degrees:
+        assert chi_square(first, second) < chi_square_critical(degrees)
@@ -0,0 +1,75 @@
+import asyncio
+import random
+
+from adventure.charsheet import ORDER, RARITIES, Backpack, Item
+from adventure.simulator import simulation
+
+# Queries compared, and the backpack changes made between them.
+QUERIES = 400
+CHANGES = 5
+STATS = ("strength", "intelligence", "charisma", "luck", "dexterity", "level", "degrade")
+WORDS = ["iron", "Ruby", "of", "the", "Dragon", "ring"]
+
+
+async def random_items(cog, rng: random.Random, count: int) -> list:
+    items = []
+    for _ in range(count):
+        rarity = rng.choice([*RARITIES, "set"])
+        if rarity == "event":
+            (slot,) = rng.choice([["head"], ["ring"], ["charm"]])
+            name = f"Event {rng.choice(WORDS)} {rng.randint(1, 10 ** 6)}"
+            data = {"slot": [slot], "rarity": "event", "lvl": rng.randint(1, 120), "degrade": rng.randint(-1, 5)}
+            items.append(Item.from_json({name: data}))
+        else:
+            items.append(await cog._genitem(rarity))
+    return items
+
+
+def random_range(rng: random.Random, low: int, high: int) -> dict:
+    if rng.random() < 0.6:
+        return {}
+    if rng.random() < 0.3:
+        return {"equal": rng.randint(low, high)}
+    (bottom, top) = sorted(rng.randint(low, high) for _ in range(2))
+    return {"min": bottom, "max": top}
+
+
+def random_query(rng: random.Random, sets: list) -> dict:
+    query = {
+        "slots": ORDER if rng.random() < 0.1 else rng.sample(ORDER, rng.randint(0, 3)),
+        "rarities": list(RARITIES) if rng.random() < 0.1 else rng.sample(RARITIES, rng.randint(0, 2)),
+        "sets": rng.sample(sets, min(len(sets), rng.randint(1, 2))) if rng.random() < 0.15 else [],
+        "equippable": rng.random() < 0.3,
+        "_except": rng.random() < 0.3,
+        "ignore_case": rng.random() < 0.5,
+        "match": rng.choice(WORDS) if rng.random() < 0.2 else None,
+        "no_match": rng.choice(WORDS) if rng.random() < 0.2 else None,
+        "rarity_exclude": rng.sample(RARITIES, 1) if rng.random() < 0.2 else None,
+    }
+    for stat in STATS:
+        query[stat] = random_range(rng, -5, 5 if stat == "degrade" else 120)
+    return query
+
+
+async def compare_with_full_scan():
+    rng = random.Random(9)
+    random.seed(9)
+    async with simulation(members=1, gold=0) as (bot, cog, guild):
+        c = await cog.get_character(guild.members[0])
+        c.backpack = Backpack({item.name: item for item in await random_items(cog, rng, 300)})
+        for _ in range(QUERIES):
+            for item in await random_items(cog, rng, CHANGES):
+                c.backpack[item.name] = item
+            for name in rng.sample(list(c.backpack), CHANGES):
+                del c.backpack[name]
+            c.lvl = rng.randint(1, 120)
+            sets = sorted({item.set for item in c.backpack.values() if item.set})
+            query = random_query(rng, sets)
+            indexed = await c.get_sorted_backpack_arg_parse(c.backpack, **query)
+            # A plain dict skips the indexes and filters every item.
+            scanned = await c.get_sorted_backpack_arg_parse(dict(c.backpack), **query)
+            assert indexed == scanned, query
+
+
+def test_indexed_backpack_filters_match_full_scan():
+    asyncio.run(compare_with_full_scan())
@@ -0,0 +1,115 @@
+import random
+from collections import Counter
+from statistics import mean, pvariance, variance
+
+import pytest
+
+from adventure import bulk
+from adventure.bulk import (
+    CHEST_ODDS,
+    EXACT_LIMIT,
+    INITIAL_MAX_ROLL,
+    MAX_CHEST_LUCK,
+    chest_rarities,
+    chest_rarity,
+    chest_weights,
+    disassemble,
+    sell_price_moments,
+    sell_total,
+    unit_sell_price,
+)
+from sampling import assert_same_distribution
+
+# Sample moments must be within this many standard errors of the exact ones.
+TOLERANCE = 4
+# Lowest and highest top of the chest roll range a character can have.
+TOP_RANGES = (INITIAL_MAX_ROLL - MAX_CHEST_LUCK, 350, INITIAL_MAX_ROLL)
+
+
+def assert_moments(samples, expected_mean, expected_variance):
+    """Check the sample mean and variance against the exact moments of the distribution."""
+    count = len(samples)
+    assert abs(mean(samples) - expected_mean) <= TOLERANCE * (expected_variance / count) ** 0.5
+    assert abs(variance(samples) - expected_variance) <= TOLERANCE * expected_variance * (2 / (count - 1)) ** 0.5
+
+
+@pytest.mark.parametrize("top_range", TOP_RANGES)
+@pytest.mark.parametrize("chest_type", [*CHEST_ODDS, "unknown"])
+def test_chest_weights_count_every_roll(chest_type, top_range):
+    per_roll = Counter(chest_rarity(chest_type, roll) for roll in range(1, top_range + 1))
+    (rarities, cum_weights) = chest_weights(chest_type, top_range)
+    weights = [high - low for (low, high) in zip([0, *cum_weights], cum_weights)]
+    assert Counter({rarity: weight for (rarity, weight) in zip(rarities, weights) if weight}) == per_roll
+
+
+@pytest.mark.parametrize("top_range", TOP_RANGES)
+@pytest.mark.parametrize("chest_type", list(CHEST_ODDS))
+def test_bulk_opening_matches_single_chests(chest_type, top_range):
+    opens = 20000
+    random.seed(f"{chest_type}-{top_range}")
+    single = Counter(chest_rarity(chest_type, random.randint(1, top_range)) for _ in range(opens))
+    bulk = Counter(chest_rarities(chest_type, top_range, opens))
+    assert sum(bulk.values()) == opens
+    assert set(bulk) <= {rarity for (threshold, rarity) in CHEST_ODDS[chest_type]}
+    assert_same_distribution(single, bulk)
+
+
+# (low, high, stat, cha_bonus, luck, rebirths) as _sell passes them.
+SELL_ARGS = [
+    (10, 100, 12, 0, 0, 0),
+    (250, 500, 40, 2, 350, 10),
+    (5000, 10000, 95, -1, -120, 100),
+]
+
+
+@pytest.mark.parametrize("args", SELL_ARGS)
+def test_sell_price_moments_are_exact(args):
+    (low, high, *rest) = args
+    prices = [unit_sell_price(roll, low, *rest) for roll in range(low, high + 1)]
+    expected = (mean(prices), pvariance(prices), min(prices), max(prices))
+    assert sell_price_moments(*args) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("args", SELL_ARGS)
+def test_bulk_sell_total_matches_copy_by_copy(args):
+    amount = 3 * EXACT_LIMIT
+    runs = 300
+    random.seed(repr(args))
+    (unit_mean, unit_variance, cheapest, dearest) = sell_price_moments(*args)
+    exact = [sum(sell_total(*args, EXACT_LIMIT) for _ in range(3)) for _ in range(runs)]
+    approximated = [sell_total(*args, amount) for _ in range(runs)]
+    for samples in (exact, approximated):
+        assert_moments(samples, amount * unit_mean, amount * unit_variance)
+    assert all(amount * cheapest <= total <= amount * dearest for total in approximated)
+
+
+@pytest.mark.parametrize("draw", [-1e12, 1e12])
+def test_bulk_sell_total_stays_within_bounds(monkeypatch, draw):
+    monkeypatch.setattr(random, "gauss", lambda mu, sigma: draw)
+    amount = EXACT_LIMIT + 1
+    for args in SELL_ARGS:
+        (unit_mean, unit_variance, cheapest, dearest) = sell_price_moments(*args)
+        assert 0 <= amount * cheapest <= sell_total(*args, amount) <= amount * dearest
+    assert 0 <= bulk.binomial(amount, 1 / 6) <= amount
+
+
+@pytest.mark.parametrize("native", [True, False])
+@pytest.mark.parametrize("tinkerer", [True, False])
+def test_bulk_disassemble_matches_copy_by_copy(monkeypatch, native, tinkerer):
+    if not native:
+        monkeypatch.delattr(random, "binomialvariate", raising=False)
+    elif not hasattr(random, "binomialvariate"):
+        pytest.skip("random.binomialvariate needs Python 3.12")
+    amount = 3 * EXACT_LIMIT
+    runs = 300
+    random.seed(f"{native}-{tinkerer}")
+    chance = 1 / 4 if tinkerer else 1 / 6
+    success_variance = amount * chance * (1 - chance)
+    # Tinkerers get one chest per success and a second one half the time.
+    chests_mean = amount * chance * (1.5 if tinkerer else 1)
+    chests_variance = 2.25 * success_variance + amount * chance / 4 if tinkerer else success_variance
+    exact = [tuple(map(sum, zip(*(disassemble(EXACT_LIMIT, tinkerer) for _ in range(3))))) for _ in range(runs)]
+    approximated = [disassemble(amount, tinkerer) for _ in range(runs)]
+    for (succeeded, chests) in (zip(*exact), zip(*approximated)):
+        assert_moments(succeeded, amount * chance, success_variance)
+        assert_moments(chests, chests_mean, chests_variance)
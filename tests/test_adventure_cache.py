@@ -0,0 +1,190 @@
+import asyncio
+import json
+import random
+from collections import Counter
+from unittest import mock
+
+import pytest
+
+from adventure import compact
+from adventure.charsheet import Character
+from adventure.compact import decode_backpack, is_compact
+from adventure.simulator import MemoryDriver, simulation
+
+# Changes applied to a character between saves, as the commands make them.
+CHANGES = ("reward", "sell", "sell_all", "equip", "degrade", "stats")
+# Backpack size the round trips store compact, so they cross the layout switch both ways.
+COMPACT_THRESHOLD = 24
+# Saves per round trip and per measured change.
+STEPS = 150
+SAMPLES = 20
+
+
+async def change(cog, character, rng: random.Random, kind: str) -> None:
+    backpack = character.backpack
+    if kind == "reward":
+        character.exp += rng.randint(1, 500)
+        character.adventures["wins"] = character.adventures.get("wins", 0) + 1
+        for item in await cog._genitems(rng.choice(["normal", "rare", "epic", "legendary"]), rng.randint(1, 3)):
+            if item.name in backpack:
+                backpack[item.name].owned += 1
+            else:
+                backpack[item.name] = item
+    elif kind == "sell" and backpack:
+        name = rng.choice(list(backpack))
+        if backpack[name].owned > 1:
+            backpack[name].owned -= 1
+        else:
+            del backpack[name]
+    elif kind == "sell_all" and backpack:
+        for name in rng.sample(list(backpack), rng.randint(1, min(len(backpack), 20))):
+            del backpack[name]
+    elif kind == "equip" and backpack:
+        item = backpack.pop(rng.choice(list(backpack)))
+        slot = item.slot[0] if len(item.slot) == 1 else "right"
+        old = getattr(character, slot)
+        setattr(character, slot, item)
+        if old is not None:
+            backpack[old.name] = old
+    elif kind == "degrade" and backpack:
+        backpack[rng.choice(list(backpack))].degrade -= 1
+    elif kind == "stats":
+        character.skill["pool"] += 1
+        character.treasure[0] += 1
+
+
+def stored_sheet(cog, member) -> dict:
+    """The sheet as the driver holds it, without Config's defaults filled in."""
+    data = dict(cog.config.driver.data[cog.config.unique_identifier][cog.config.USER][str(member.id)])
+    if is_compact(data.get("backpack", {})):
+        data["backpack"] = decode_backpack(data["backpack"])
+    return data
+
+
+async def round_trip(partial: bool, seed: int) -> dict:
+    """Save randomly changed characters and check Config ends up holding exactly what was saved."""
+    rng = random.Random(seed)
+    random.seed(seed)
+    async with simulation(members=1, gold=0) as (bot, cog, guild):
+        (member,) = guild.members
+        cache = cog._character_cache
+        cache.partial = partial
+        for step in range(STEPS):
+            character = await cache.load(member, {})
+            for _ in range(rng.randint(1, 3)):
+                await change(cog, character, rng, rng.choice(CHANGES))
+            await cache.save(member, character)
+            expected = json.loads(json.dumps(await character.to_json(cog.config)))
+            if rng.random() < 0.5:
+                await cache.flush(member.id)
+                if rng.random() < 0.3:
+                    # Reload from Config next time, with whatever layout the backpack was stored in.
+                    cache.evict(idle=0)
+            await cache.flush(member.id)
+            assert not cache.is_dirty(member.id)
+            stored = stored_sheet(cog, member)
+            for (key, value) in expected.items():
+                assert stored[key] == value, (step, key)
+        return cache.stats()
+
+
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("partial", [True, False], ids=["partial", "json"])
+def test_delta_writes_reproduce_saved_sheet(partial, seed):
+    with mock.patch.object(compact, "COMPACT_THRESHOLD", COMPACT_THRESHOLD):
+        stats = asyncio.run(round_trip(partial, seed))
+    assert (stats["partial_writes"] > 0) == partial
+
+
+async def bytes_per_change(partial: bool, kind: str, backpack: int) -> float:
+    """Average bytes a flush hands the driver after one ``kind`` change to a character."""
+    written = Counter()
+    (set_, clear) = (MemoryDriver.set, MemoryDriver.clear)
+
+    async def counting_set(self, identifier_data, value=None):
+        written["bytes"] += len(json.dumps(value)) + len(json.dumps(identifier_data.to_tuple()))
+        await set_(self, identifier_data, value)
+
+    async def counting_clear(self, identifier_data):
+        written["bytes"] += len(json.dumps(identifier_data.to_tuple()))
+        await clear(self, identifier_data)
+
+    rng = random.Random(kind)
+    random.seed(kind)
+    async with simulation(members=1, gold=0) as (bot, cog, guild):
+        (member,) = guild.members
+        cache = cog._character_cache
+        cache.partial = partial
+        character = await cache.load(member, {})
+        for item in await cog._genitems("rare", backpack):
+            character.backpack[item.name] = item
+        await cache.save(member, character)
+        await cache.flush(member.id)
+        with mock.patch.object(MemoryDriver, "set", counting_set), mock.patch.object(
+            MemoryDriver, "clear", counting_clear
+        ):
+            for _ in range(SAMPLES):
+                character = await cache.load(member, {})
+                await change(cog, character, rng, kind)
+                await cache.save(member, character)
+                await cache.flush(member.id)
+    return written["bytes"] / SAMPLES
+
+
+@pytest.mark.parametrize("backpack", [50, 500])
+def test_delta_writes_fewer_bytes_per_change(backpack):
+    """Bytes written per change on each path; run with ``-s`` to see the table."""
+    for kind in CHANGES:
+        (delta, full) = (asyncio.run(bytes_per_change(partial, kind, backpack)) for partial in (True, False))
+        print(f"backpack {backpack:4} {kind:9} delta {delta:8.0f} B   whole sheet {full:8.0f} B")
+        assert delta <= full
+        if kind in ("sell", "degrade", "stats"):
+            assert delta * 5 < full
+
+
+async def projected_save(partial: bool, cached: bool, gain: int) -> tuple:
+    """Save a projected load of a sheet with a backpack and a loadout, after adding ``gain`` experience."""
+    random.seed(gain)
+    async with simulation(members=1, gold=0) as (bot, cog, guild):
+        (member,) = guild.members
+        cache = cog._character_cache
+        cache.partial = partial
+        character = await cache.load(member, {})
+        for item in await cog._genitems("rare", 30):
+            character.backpack[item.name] = item
+        await character.equip_item(next(iter(character.backpack.values())), from_backpack=True)
+        character.loadouts["main"] = await Character.save_loadout(character)
+        await cache.save(member, character)
+        # The stored base stats are worked out when a Character is built, so save a fresh load once more.
+        await cache.save(member, await cache.load(member, {}))
+        await cache.flush(member.id)
+        before = stored_sheet(cog, member)
+        if not cached:
+            cache.invalidate(member.id)
+        projected = await cache.load_projected(member, {})
+        projected.exp += gain
+        ops = Counter(MemoryDriver.ops)
+        await cache.save(member, projected)
+        queued = cache.is_dirty(member.id)
+        await cache.flush(member.id)
+        ops = MemoryDriver.ops - ops
+        return before, stored_sheet(cog, member), queued, ops
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+@pytest.mark.parametrize("partial", [True, False], ids=["partial", "json"])
+def test_projected_saves_write_only_what_changed(partial, cached):
+    (before, after, queued, ops) = asyncio.run(projected_save(partial, cached, gain=100))
+    assert before["backpack"] and before["loadouts"]
+    # A whole-sheet write may also store defaults Config filled in; none of the stored fields change.
+    assert {key: after[key] for key in before} == {**before, "exp": before["exp"] + 100}
+    assert queued
+    assert (ops["set"], ops["clear"]) == (1, 0)
+
+
+@pytest.mark.parametrize("cached", [True, False], ids=["cached", "uncached"])
+def test_unchanged_projected_save_queues_nothing(cached):
+    (before, after, queued, ops) = asyncio.run(projected_save(False, cached, gain=0))
+    assert after == before
+    assert not queued
+    assert (ops["set"], ops["clear"]) == (0, 0)
@@ -0,0 +1,94 @@
+import itertools
+import json
+from pathlib import Path
+
+from adventure.charsheet import ITEM_NAME_MARKERS, parse_item_name
+
+DATA = Path(__file__).parents[1] / "adventure" / "data" / "default"
+# Endings a stored key can close its marker with, matching its own or not.
+CLOSERS = ("'}", "''}", "':.}", "")
+
+
+def startswith_chain(name: str):
+    """The parsing Item.from_json did before the marker table."""
+    rarity = "normal"
+    if name.startswith("."):
+        name = name.replace("_", " ").replace(".", "")
+        rarity = "rare"
+    elif name.startswith("["):
+        name = name.replace("[", "").replace("]", "")
+        rarity = "epic"
+    elif name.startswith("{Legendary:'"):
+        name = name.replace("{Legendary:'", "").replace("'}", "")
+        rarity = "legendary"
+    elif name.startswith("{legendary:'"):
+        name = name.replace("{legendary:'", "").replace("'}", "")
+        rarity = "legendary"
+    elif name.startswith("{Ascended:'"):
+        name = name.replace("{Ascended:'", "").replace("'}", "")
+        rarity = "ascended"
+    elif name.startswith("{ascended:'"):
+        name = name.replace("{ascended:'", "").replace("'}", "")
+        rarity = "ascended"
+    elif name.startswith("{Gear_Set:'"):
+        name = name.replace("{Gear_Set:'", "").replace("'}", "")
+        rarity = "set"
+    elif name.startswith("{Gear Set:'"):
+        name = name.replace("{Gear Set:'", "").replace("'}", "")
+        rarity = "set"
+    elif name.startswith("{gear_set:'"):
+        name = name.replace("{gear_set:'", "").replace("'}", "")
+        rarity = "set"
+    elif name.startswith("{Set:'"):
+        name = name.replace("{Set:''", "").replace("''}", "")
+        rarity = "set"
+    elif name.startswith("{set:'"):
+        name = name.replace("{set:''", "").replace("''}", "")
+        rarity = "set"
+    elif name.startswith("{.:'"):
+        name = name.replace("{.:'", "").replace("':.}", "")
+        rarity = "forged"
+    elif name.startswith("{Event:'"):
+        name = name.replace("{Event:'", "").replace("''}", "")
+        rarity = "event"
+    return name, rarity
+
+
+def load(name: str) -> dict:
+    with (DATA / f"{name}.json").open() as f:
+        return json.load(f)
+
+
+def item_names() -> list:
+    """Every set item, and every material and piece of equipment with each prefix and suffix in turn."""
+    materials = [name for names in load("materials").values() for name in names]
+    equipment = [name for names in load("equipment").values() for name in names]
+    (prefixes, suffixes) = (itertools.cycle(load("prefixes")), itertools.cycle(load("suffixes")))
+    names = list(load("tr_set"))
+    for (material, piece) in itertools.product(materials, equipment):
+        names.append(f"{material} {piece}")
+        names.append(f"{next(prefixes)} {material} {piece} of {next(suffixes)}")
+    return names
+
+
+def stored_keys(name: str):
+    """``name`` under every marker, closed every way, plus keys no marker matches."""
+    yield name
+    yield "." + name.replace(" ", "_")
+    yield f"[{name}]"
+    for marker in ITEM_NAME_MARKERS:
+        if marker.startswith("{"):
+            for closer in CLOSERS:
+                yield f"{marker}{name}{closer}"
+                yield f"{marker}'{name}{closer}"
+    yield f"{{Rare:'{name}'}}"
+    yield f"{{Legendary'{name}'}}"
+    yield "{" + name
+
+
+def test_parse_item_name_matches_startswith_chain():
+    names = item_names()
+    assert len(names) > 7000
+    for name in names:
+        for key in stored_keys(name):
+            assert parse_item_name(key) == startswith_chain(key), key
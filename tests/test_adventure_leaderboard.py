@@ -0,0 +1,151 @@
+import asyncio
+import random
+from datetime import date
+
+import pytest
+
+from adventure.leaderboard import ADVENTURE_STATS, Leaderboards, RankedIndex
+
+
+def make_index(users: int = 5) -> RankedIndex:
+    index = RankedIndex()
+    for user_id in range(1, users + 1):
+        index.update(user_id, (user_id,), {"wins": user_id, "loses": 0})
+    return index
+
+
+def test_ranking_keeps_removed_users_in_place():
+    index = make_index()
+    ranking = index.ranking()
+    index.remove(3)
+    assert len(ranking) == 5
+    assert [user_id for (user_id, data) in ranking] == [5, 4, 3, 2, 1]
+    assert ranking[2] == (3, {})
+    assert ranking[2][1]["wins"] == 0
+    assert ranking[1:4] == [(4, {"wins": 4, "loses": 0}), (3, {}), (2, {"wins": 2, "loses": 0})]
+    assert index.ranking()[:] == [(user_id, {"wins": user_id, "loses": 0}) for user_id in (5, 4, 2, 1)]
+
+
+def random_sheet(rng: random.Random, week: int) -> dict:
+    sheet = {"lvl": rng.randint(1, 50), "rebirths": rng.randint(0, 5), "set_items": rng.randint(0, 3)}
+    for field in ("lvl", "set_items"):
+        if rng.random() < 0.1:
+            del sheet[field]
+    if rng.random() < 0.8:
+        sheet["adventures"] = {stat: rng.randint(0, 20) for stat in ADVENTURE_STATS if rng.random() < 0.8}
+    if rng.random() < 0.6:
+        sheet["nega"] = {"wins": rng.randint(0, 5), "loses": rng.randint(0, 5)} if rng.random() < 0.8 else {}
+    if rng.random() < 0.7:
+        sheet["weekly_score"] = {"adventures": rng.randint(0, 30), "rebirths": rng.randint(0, 5)}
+        sheet["weekly_score"]["week"] = week if rng.random() < 0.7 else week - 1
+    return sheet
+
+
+def sorted_board(boards: dict, key) -> list:
+    """What the scoreboards returned before the indexes, with ties broken by user ID as the indexes do."""
+    return sorted(boards.items(), key=lambda entry: (key(entry[1]), entry[0]), reverse=True)
+
+
+def full_scan(sheets: dict, board: str, week: int) -> list:
+    """Build a scoreboard by reading every sheet, the way the cog did before the indexes."""
+    entries = {}
+    for (user_id, sheet) in sheets.items():
+        if board == "rebirths":
+            entries[user_id] = {field: sheet.get(field, 0) for field in ("lvl", "rebirths", "set_items")}
+        elif board == "negaverse":
+            if sheet.get("nega"):
+                entries[user_id] = dict(sheet["nega"])
+        elif board == "weekly":
+            weekly = sheet.get("weekly_score", {})
+            if weekly.get("week", -1) == week and "adventures" in weekly:
+                entries[user_id] = dict(weekly)
+        else:
+            adventures = sheet.get("adventures", {board: 0})
+            entries[user_id] = {"rebirths": sheet.get("rebirths", 0), **(adventures if board in adventures else {})}
+    keys = {
+        "rebirths": lambda data: (data["rebirths"], data["lvl"], data["set_items"]),
+        "negaverse": lambda data: (data.get("wins", 0), data.get("loses", 0)),
+        "weekly": lambda data: (data.get("adventures", 0), data.get("rebirths", 0)),
+    }
+    return sorted_board(entries, keys.get(board, lambda data: (data.get(board, 0), data.get("rebirths", 0))))
+
+
+def indexed(leaderboards: Leaderboards, board: str) -> list:
+    if board == "weekly":
+        return leaderboards.weekly.top(check=Leaderboards.current_week_check())
+    index = getattr(leaderboards, board, None) or leaderboards.adventures[board]
+    return list(index.ranking())
+
+
+@pytest.mark.parametrize("board", ["rebirths", "negaverse", "weekly", *ADVENTURE_STATS])
+def test_indexes_match_a_full_scan(board):
+    rng = random.Random(board)
+    week = date.today().isocalendar()[1]
+    sheets = {user_id: random_sheet(rng, week) for user_id in range(1, 301)}
+    leaderboards = Leaderboards()
+    asyncio.run(leaderboards.build(sheets))
+    for _ in range(300):
+        user_id = rng.randint(1, 400)
+        if rng.random() < 0.1:
+            sheets.pop(user_id, None)
+            leaderboards.remove(user_id)
+        else:
+            sheets[user_id] = random_sheet(rng, week)
+            leaderboards.update(user_id, sheets[user_id])
+        expected = full_scan(sheets, board, week)
+        assert indexed(leaderboards, board) == expected
+    if board == "rebirths":
+        for (position, (user_id, data)) in enumerate(expected, 1):
+            assert leaderboards.rebirths.rank(user_id) == position
+
+
+class Guild:
+    def __init__(self, members):
+        self.id = 1
+        self.chunked = True
+        self.members = set(members)
+
+    def get_member(self, user_id):
+        return user_id if user_id in self.members else None
+
+
+def test_guild_orderings_follow_membership_changes():
+    leaderboards = Leaderboards()
+    asyncio.run(leaderboards.build({user_id: {"rebirths": user_id} for user_id in range(1, 6)}))
+    guild = Guild([1, 2, 3])
+
+    def guild_board():
+        check = lambda user_id, data: guild.get_member(user_id) is not None
+        return [user_id for (user_id, data) in leaderboards.rebirths.ranking(check, leaderboards.guild_key(guild))]
+
+    assert guild_board() == [3, 2, 1]
+    guild.members.add(5)
+    leaderboards.members_changed(guild)
+    assert guild_board() == [5, 3, 2, 1]
+    guild.members.discard(2)
+    leaderboards.members_changed(guild)
+    assert guild_board() == [5, 3, 1]
+
+
+def test_rankings_match_top_for_every_stat():
+    rng = random.Random("rankings")
+    week = date.today().isocalendar()[1]
+    leaderboards = Leaderboards()
+    asyncio.run(leaderboards.build({user_id: random_sheet(rng, week) for user_id in range(1, 301)}))
+    guild = Guild(rng.sample(range(1, 401), 150))
+    check = lambda user_id, data: guild.get_member(user_id) is not None
+    indexes = {"rebirths": leaderboards.rebirths, "negaverse": leaderboards.negaverse, **leaderboards.adventures}
+    for step in range(200):
+        user_id = rng.randint(1, 400)
+        if rng.random() < 0.1:
+            leaderboards.remove(user_id)
+        elif rng.random() < 0.1:
+            guild.members ^= {user_id}
+            leaderboards.members_changed(guild)
+        else:
+            leaderboards.update(user_id, random_sheet(rng, week))
+        for (stat, index) in indexes.items():
+            (everyone, members) = (index.ranking(), index.ranking(check, leaderboards.guild_key(guild)))
+            assert list(everyone) == index.top(), (step, stat)
+            assert list(members) == index.top(check=check), (step, stat)
+            assert everyone[10:20] == index.top()[10:20], (step, stat)
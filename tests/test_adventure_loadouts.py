@@ -0,0 +1,81 @@
+import asyncio
+import copy
+import random
+
+from adventure.charsheet import GEAR_SLOTS, Character
+from adventure.migration import normalise_sheet
+from adventure.simulator import simulation
+
+# Loadouts saved and switched between, and the items in the backpack they are made from.
+LOADOUTS = 8
+SWITCHES = 40
+ITEMS = 40
+# How old sheets marked each rarity in item names.
+MARKUP = {
+    "rare": lambda name: "." + name.replace(" ", "_"),
+    "epic": "[{}]".format,
+    "legendary": "{{Legendary:'{}'}}".format,
+}
+
+
+def legacy_loadout(c) -> dict:
+    """How Character.save_loadout stored a loadout before references: a copy of every item."""
+    loadout = {}
+    for slot in GEAR_SLOTS:
+        item = getattr(c, slot)
+        if item is None:
+            loadout[slot] = {}
+            continue
+        ((name, data),) = item.to_json().items()
+        loadout[slot] = {MARKUP.get(item.rarity, str)(name): data}
+    return loadout
+
+
+def equipped(c) -> dict:
+    return {slot: item.name if (item := getattr(c, slot)) else None for slot in GEAR_SLOTS}
+
+
+async def save_and_switch_loadouts():
+    rng = random.Random(24)
+    random.seed(24)
+    async with simulation(members=1, gold=0) as (bot, cog, guild):
+        (member,) = guild.members
+        c = await cog.get_character(member)
+        c.lvl = 10000
+        for rarity in ("normal", "rare", "epic", "legendary"):
+            for item in await cog._genitems(rarity, ITEMS // 4):
+                await c.add_to_backpack(item)
+        legacy = {}
+        for index in range(LOADOUTS):
+            for item in rng.sample(list(c.backpack.values()), rng.randint(0, 6)):
+                await c.equip_item(item, True)
+            c.loadouts[f"loadout {index}"] = await Character.save_loadout(c)
+            legacy[f"loadout {index}"] = legacy_loadout(c)
+        references = copy.deepcopy(c.loadouts)
+        sheet = await c.to_json(cog.config)
+        sheet["loadouts"] = copy.deepcopy(legacy)
+        loaded = await Character.from_json(cog.config, member, {}, data=copy.deepcopy(sheet))
+        normalised = normalise_sheet(sheet)
+        renormalised = normalise_sheet(copy.deepcopy(sheet))
+        for name in rng.choices(list(references), k=SWITCHES):
+            await c.equip_loadout(name)
+            assert equipped(c) == references[name], name
+        # Equipping a loadout whose item was sold leaves that slot empty.
+        (name, sold) = next(
+            (name, item)
+            for (name, loadout) in references.items()
+            for item in loadout.values()
+            if item in c.backpack and item not in equipped(c).values()
+        )
+        del c.backpack[sold]
+        await c.equip_loadout(name)
+        assert equipped(c) == {slot: None if item == sold else item for (slot, item) in references[name].items()}
+        return references, loaded.loadouts, sheet["loadouts"], normalised, renormalised
+
+
+def test_legacy_loadouts_become_references_and_equip_the_named_items():
+    (references, loaded, normalised_loadouts, normalised, renormalised) = asyncio.run(save_and_switch_loadouts())
+    assert any(name for loadout in references.values() for name in loadout.values())
+    assert loaded == references
+    assert normalised and normalised_loadouts == references
+    assert not renormalised
@@ -0,0 +1,42 @@
+import asyncio
+
+from adventure.simulator import simulation
+
+
+class Erasing:
+    """A user group whose reads let a data deletion request start right after them."""
+
+    def __init__(self, group, cog, user_id: int):
+        self._group = group
+        self._cog = cog
+        self._user_id = user_id
+        self.erasure = None
+
+    async def get_raw(self, *path):
+        value = await self._group.get_raw(*path)
+        if self.erasure is None:
+            self.erasure = asyncio.ensure_future(
+                self._cog.red_delete_data_for_user(requester="user", user_id=self._user_id)
+            )
+            for _ in range(5):
+                await asyncio.sleep(0)
+        return value
+
+    async def set_raw(self, *path, value):
+        await self._group.set_raw(*path, value=value)
+
+
+async def migrate_while_erasing():
+    async with simulation(members=1, gold=0) as (bot, cog, guild):
+        (member,) = guild.members
+        await cog.config.user(member).exp.set(-5)
+        group = Erasing(cog.config._get_base_group(cog.config.USER), cog, member.id)
+        await cog._migration._migrate_user(group, member.id)
+        await group.erasure
+        return await cog.config.user(member).all(), member.id in await cog.config.all_users()
+
+
+def test_migration_does_not_bring_back_erased_sheets():
+    (sheet, stored) = asyncio.run(migrate_while_erasing())
+    assert not stored
+    assert sheet["exp"] == 0
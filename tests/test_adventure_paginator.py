@@ -0,0 +1,59 @@
+import random
+
+import pytest
+from beautifultable import ALIGN_LEFT, BeautifulTable
+from redbot.core.utils.chat_formatting import box
+
+from adventure.paginator import TablePaginator
+
+HEADERS = ["Name", "Slot", "ATT", "CHA", "INT", "DEX", "LUC", "LVL", "QTY", "DEG", "SET"]
+WORDS = ["Iron", "Sword", "of", "the", "Dragon", "Mithril", "Helm", "Ruby", "Ring", "Ancient", "Cloak", "Boots"]
+# Cells BeautifulTable measures differently from their length: wide characters, a
+# line break, and one cell wider than the table's maxwidth.
+ODD_CELLS = ["竜の剣", "Two\nlines", "Endless " * 80]
+
+
+def render_each_row(rows, prefix: str = "", sort_by: str = None, reverse: bool = False) -> list:
+    """How the cog paginated before TablePaginator: render the whole table again after every row."""
+
+    def new_table() -> BeautifulTable:
+        table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
+        table.set_style(BeautifulTable.STYLE_RST)
+        table.columns.header = HEADERS
+        return table
+
+    def cut(table) -> None:
+        if sort_by is not None:
+            table.rows.sort(sort_by, reverse=reverse)
+        msgs.append(box(prefix + str(table) + f"\nPage {len(msgs) + 1}", lang="css"))
+
+    table = new_table()
+    msgs = []
+    for (index, row) in enumerate(rows, start=1):
+        if len(str(table)) > 1500:
+            cut(table)
+            table = new_table()
+        table.rows.append(row)
+        if index == len(rows):
+            cut(table)
+    return msgs
+
+
+def random_row(rng: random.Random, odd: bool) -> tuple:
+    name = " ".join(rng.choices(WORDS, k=rng.randint(1, 6)))
+    if odd and rng.random() < 0.05:
+        name = rng.choice(ODD_CELLS)
+    stats = [rng.randint(-10, 10 ** rng.randint(1, 4)) for _ in range(8)]
+    return (name, rng.choice(["head", "ring", "two handed", "charm"]), *stats, rng.choice(["N/A", "Ancient Set"]))
+
+
+@pytest.mark.parametrize("odd", [False, True], ids=["plain", "odd"])
+@pytest.mark.parametrize("sort_by", [None, "LVL"])
+def test_pages_match_rendering_after_every_row(sort_by, odd):
+    rng = random.Random(f"{sort_by}-{odd}")
+    for rows in (0, 1, 7, 20, rng.randint(30, 80), rng.randint(80, 120)):
+        table = [random_row(rng, odd) for _ in range(rows)]
+        paginator = TablePaginator(HEADERS, prefix="Backpack\n\n", sort_by=sort_by, reverse=True)
+        for row in table:
+            paginator.add_row(row)
+        assert paginator.pages() == render_each_row(table, "Backpack\n\n", sort_by, reverse=True)
@@ -0,0 +1,73 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+from adventure import bank
+from adventure.charsheet import GameSession
+from adventure.simulator import SimulatedGuild, SimulatedMember, simulation
+
+# Guilds with an adventure running, players reacting in them, and reactions made.
+GUILDS = 4
+PLAYERS = 12
+REACTIONS = 600
+ACTIONS = ("fight", "magic", "talk", "pray", "run")
+
+
+def new_session(guild) -> GameSession:
+    return GameSession(challenge="Ogre", attribute="", guild=guild, boss=False, miniboss={}, timer=60, monster={})
+
+
+def scanned_in_adventure(cog, user) -> bool:
+    """The check the cog made before the participant index: every session's action lists, concatenated."""
+    return any(
+        user.id == player.id
+        for session in cog._sessions.values()
+        for player in [*session.fight, *session.magic, *session.talk, *session.pray, *session.run]
+    )
+
+
+async def react_in_many_guilds(restrict: bool):
+    rng = random.Random(f"participants-{restrict}")
+    async with simulation(members=0, gold=0) as (bot, cog, guild):
+        await cog.config.restrict.set(restrict)
+        cog._settings.forget("restrict")
+        guilds = [SimulatedGuild(10 ** 15 * (i + 1), 0) for i in range(GUILDS)]
+        # The same people are members of every guild.
+        players = {g.id: [SimulatedMember(g, 10 ** 14 + i, f"Player {i}") for i in range(PLAYERS)] for g in guilds}
+        for g in guilds:
+            bot.guilds[g.id] = g
+            cog._sessions[g.id] = new_session(g)
+            for member in players[g.id]:
+                await bank.set_balance(member, 1000)
+        for step in range(REACTIONS):
+            g = rng.choice(guilds)
+            if rng.random() < 0.03:
+                if rng.random() < 0.5:
+                    cog._expire_session(g.id, cog._sessions[g.id])
+                cog._sessions[g.id] = new_session(g)
+            member = rng.choice(players[g.id])
+            emoji = cog._adventure_controls[rng.choice(ACTIONS)]
+            reaction = SimpleNamespace(emoji=emoji, message=await g.channel.send("adventure"))
+            await cog._handle_adventure(reaction, member)
+            for user in players[g.id]:
+                assert cog.in_adventure(user=user) == scanned_in_adventure(cog, user), (step, user.id)
+        joined = [
+            sorted(player.id for action in ACTIONS for player in getattr(session, action))
+            for session in cog._sessions.values()
+            if session.guild in guilds
+        ]
+        refused = len(cog._react_messaged)
+    return joined, refused
+
+
+def test_participant_index_matches_scanning_every_session():
+    (joined, refused) = asyncio.run(react_in_many_guilds(restrict=False))
+    assert max(len(ids) for ids in joined) > 1
+    assert refused == 0
+
+
+def test_restricted_players_join_one_adventure_at_a_time():
+    (joined, refused) = asyncio.run(react_in_many_guilds(restrict=True))
+    players = [player for ids in joined for player in ids]
+    assert len(players) == len(set(players))
+    assert refused > 0
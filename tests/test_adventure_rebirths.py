@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+from adventure import charsheet
+from adventure.charsheet import Character, rebirth_stat_points
+
+# Rebirth counts compared, past the 10000 level cap at the default step.
+REBIRTHS = range(-20, 1200)
+
+
+def looped_stat_points(rebirths: int) -> int:
+    """How get_stat_value counted rebirth points before the closed form: once per rebirth."""
+    extrapoints = rebirths // 10 * 5
+    for _loop_counter in range(rebirths):
+        if rebirths >= 30:
+            extrapoints += 3
+        elif rebirths >= 20:
+            extrapoints += 5
+        elif rebirths >= 10:
+            extrapoints += 1
+        elif rebirths < 10:
+            extrapoints += 2
+        rebirths -= 1
+    return int(extrapoints)
+
+
+def looped_max_level(rebirths: int) -> int:
+    """get_max_level before the closed form."""
+    rebirths = max(rebirths, 0)
+    if rebirths == 0:
+        maxlevel = 5
+    else:
+        maxlevel = charsheet.REBIRTH_LVL
+    for _loop_counter in range(rebirths):
+        if rebirths >= 20:
+            maxlevel += charsheet.REBIRTH_STEP
+        elif rebirths >= 10:
+            maxlevel += 10
+        elif rebirths < 10:
+            maxlevel += 5
+        rebirths -= 1
+    return min(maxlevel, 10000)
+
+
+def test_rebirth_stat_points_match_the_loop():
+    for rebirths in REBIRTHS:
+        assert rebirth_stat_points(rebirths) == looped_stat_points(rebirths), rebirths
+
+
+# Themes set their own starting level and step; the defaults come first.
+@pytest.mark.parametrize("lvl, step", [(20, 10), (1, 1), (50, 25), (100, 0)])
+def test_max_level_matches_the_loop(lvl, step):
+    with mock.patch.object(charsheet, "REBIRTH_LVL", lvl), mock.patch.object(charsheet, "REBIRTH_STEP", step):
+        for rebirths in REBIRTHS:
+            character = SimpleNamespace(rebirths=rebirths)
+            assert Character.get_max_level(character) == looped_max_level(rebirths), rebirths
@@ -0,0 +1,83 @@
+import random
+from collections import Counter
+from itertools import product
+
+import pytest
+
+from adventure.roster import MAX_ENTRIES, MonsterRoster, boss_chance
+from sampling import assert_same_distribution
+
+# Draws per side of each comparison.
+DRAWS = 20000
+# (stat_range, party_stat) cases: an attack and a talk raid window, no raid history,
+# and a window no monster fits, which falls back to the whole roster.
+CASES = [
+    ({"stat_type": "attack", "min_stat": 100, "max_stat": 200}, 0),
+    ({"stat_type": "talk", "min_stat": 40, "max_stat": 125}, 0),
+    ({"stat_type": "hp", "min_stat": 0, "max_stat": 0}, 40),
+    ({"stat_type": "attack", "min_stat": 1000, "max_stat": 2000}, 0),
+]
+
+
+def make_monsters(count: int = 40) -> dict:
+    rng = random.Random("roster")
+    monsters = {}
+    for number in range(count):
+        kind = rng.choice(["boss", "miniboss", None, None, None])
+        monsters[f"monster {number}"] = {
+            # Multiples of five so some stats land exactly on the window edges.
+            "hp": 5 * rng.randint(2, 80),
+            "dipl": 5 * rng.randint(2, 80),
+            "boss": kind == "boss",
+            "miniboss": kind == "miniboss",
+        }
+    return monsters
+
+
+def linear_scan(monsters: dict, stat_range: dict, party_stat: int) -> str:
+    """The selection from before the roster: a weighted list built by scanning every monster."""
+    possible_monsters = []
+    for (m, stats) in monsters.items():
+        appropriate_range = max(stats["hp"], stats["dipl"]) <= party_stat * 5
+        if stat_range["max_stat"] > 0:
+            main_stat = stats["hp"] if (stat_range["stat_type"] == "attack") else stats["dipl"]
+            appropriate_range = (stat_range["min_stat"] * 0.75) <= main_stat <= (stat_range["max_stat"] * 1.2)
+        if not appropriate_range:
+            continue
+        if not stats["boss"] and not stats["miniboss"]:
+            possible_monsters.extend([m] * random.randint(1, 15))
+        else:
+            possible_monsters.append(m)
+    if len(possible_monsters) == 0:
+        return random.choice(list(monsters.keys()) * 3)
+    return random.choice(possible_monsters)
+
+
+def boss_picks(monsters: dict, picks: Counter) -> Counter:
+    """Split ``picks`` into boss or miniboss draws and regular monster draws."""
+    split = Counter()
+    for (name, count) in picks.items():
+        split[monsters[name]["boss"] or monsters[name]["miniboss"]] += count
+    return split
+
+
+@pytest.mark.parametrize("monsters", range(4))
+@pytest.mark.parametrize("bosses", range(4))
+def test_boss_chance_is_exact(monsters, bosses):
+    expected = 0.0 if not bosses else 1.0
+    if bosses and monsters:
+        totals = [sum(entries) for entries in product(range(1, MAX_ENTRIES + 1), repeat=monsters)]
+        expected = sum(bosses / (total + bosses) for total in totals) / len(totals)
+    assert boss_chance(monsters, bosses) == pytest.approx(expected, rel=1e-12)
+
+
+@pytest.mark.parametrize(("stat_range", "party_stat"), CASES)
+def test_roster_matches_linear_scan(stat_range, party_stat):
+    monsters = make_monsters()
+    roster = MonsterRoster(monsters)
+    random.seed(repr(stat_range) + str(party_stat))
+    scanned = Counter(linear_scan(monsters, stat_range, party_stat) for _ in range(DRAWS))
+    banded = Counter(roster.choose(stat_range, party_stat) for _ in range(DRAWS))
+    assert set(banded) <= set(scanned)
+    assert_same_distribution(scanned, banded)
+    assert_same_distribution(boss_picks(monsters, scanned), boss_picks(monsters, banded))
@@ -0,0 +1,50 @@
+import asyncio
+import random
+
+from adventure.simulator import SimulatedGuild, simulation
+
+# Guilds counting down at once, and the longest countdown in seconds. Countdowns over
+# five seconds are refreshed once before they end.
+GUILDS = 1000
+LONGEST = 6
+
+
+async def count_down(cog, guilds, seconds):
+    return await asyncio.gather(
+        *(
+            cog._countdown(guild.channel, length, "Time remaining", cog._adventure_countdown, guild.id)
+            for (guild, length) in zip(guilds, seconds)
+        )
+    )
+
+
+async def concurrent_countdowns():
+    rng = random.Random(GUILDS)
+    async with simulation(members=1, gold=0) as (bot, cog, guild):
+        scheduler = cog._scheduler
+        guilds = [SimulatedGuild(1_000_000 * (i + 1), 0) for i in range(GUILDS + 100)]
+        (guilds, stopped) = (guilds[:GUILDS], guilds[GUILDS:])
+        seconds = [rng.randint(1, LONGEST) for _ in guilds]
+        finished = await count_down(cog, guilds, seconds)
+        await asyncio.wait_for(asyncio.gather(*finished), timeout=LONGEST + 5)
+        # Let the callbacks that resolved the last futures finish their own work.
+        await asyncio.sleep(0.1)
+        after_run = scheduler.stats()
+        # Countdowns still running when the scheduler stops leave nothing pending either.
+        await count_down(cog, stopped, [LONGEST] * len(stopped))
+        before_stop = scheduler.stats()
+        scheduler.stop()
+        after_stop = scheduler.stats()
+    return guilds, seconds, after_run, before_stop, after_stop
+
+
+def test_every_countdown_finishes_and_deletes_its_message():
+    (guilds, seconds, after_run, before_stop, after_stop) = asyncio.run(concurrent_countdowns())
+    for (guild, length) in zip(guilds, seconds):
+        assert guild.calls["send"] == 1
+        assert guild.calls["delete"] == 1
+        assert guild.calls["edit"] == (1 if length > 5 else 0)
+    assert after_run["pending"] == 0
+    assert after_run["max_lag"] < 1
+    assert before_stop["pending"] == 100
+    assert after_stop["pending"] == 0
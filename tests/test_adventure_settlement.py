@@ -0,0 +1,99 @@
+import asyncio
+
+from adventure.cache import AdventureSettlement
+from adventure.simulator import simulation
+
+# Experience the settlement grants each participant, and what a command run during it adds.
+REWARD = 100
+COMMAND_EXP = 1000
+
+
+async def sell_first_item(cog, member) -> str:
+    async with cog.get_lock(member):
+        c = await cog.get_character(member)
+        name = next(iter(c.backpack))
+        del c.backpack[name]
+        c.exp += 1
+        await cog.save_character(member, c)
+    return name
+
+
+async def settle_while_playing():
+    """Settle an adventure whose party sells items and runs a command before the commit."""
+    async with simulation(members=5, gold=0) as (bot, cog, guild):
+        before = {}
+        for member in guild.members:
+            c = await cog.get_character(member)
+            for item in await cog._genitems("rare", 3):
+                c.backpack[item.name] = item
+            await cog.save_character(member, c)
+            before[member.id] = c.exp
+        settlement = AdventureSettlement(cog._character_cache, {}, cog.get_lock)
+        await settlement.preload(guild.members)
+        sold = {member.id: await sell_first_item(cog, member) for member in guild.members}
+
+        def grant(c):
+            c.exp += REWARD
+
+        def count(c):
+            c.adventures["wins"] = c.adventures.get("wins", 0) + 1
+
+        for member in guild.members:
+            await settlement.update(member, grant)
+            await settlement.update(member, count)
+
+        async def command(member):
+            async with cog.get_lock(member):
+                await asyncio.sleep(0.05)
+                c = await cog.get_character(member)
+                c.exp += COMMAND_EXP
+                await cog.save_character(member, c)
+
+        (busy, *_) = guild.members
+        running = asyncio.ensure_future(command(busy))
+        await asyncio.sleep(0)
+        written = await settlement.commit()
+        await running
+        after = {}
+        for member in guild.members:
+            cog._character_cache.invalidate(member.id)
+            after[member.id] = await cog.get_character(member)
+        return busy.id, before, sold, after, written, settlement.loads
+
+
+def test_settlement_keeps_changes_made_during_the_adventure():
+    (busy, before, sold, after, written, loads) = asyncio.run(settle_while_playing())
+    for (uid, c) in after.items():
+        assert sold[uid] not in c.backpack
+        assert c.exp == before[uid] + 1 + REWARD + (COMMAND_EXP if uid == busy else 0)
+        assert c.adventures["wins"] == 1
+    assert loads == len(after)
+    assert written == len(after)
+
+
+async def preload_during_a_command():
+    """Preload a party while one member's command is halfway through changing their sheet."""
+    async with simulation(members=5, gold=0) as (bot, cog, guild):
+        (busy, *_) = guild.members
+        started = asyncio.Event()
+
+        async def command():
+            async with cog.get_lock(busy):
+                c = await cog.get_character(busy)
+                started.set()
+                await asyncio.sleep(0.05)
+                c.exp += COMMAND_EXP
+                await cog.save_character(busy, c)
+
+        running = asyncio.ensure_future(command())
+        await started.wait()
+        settlement = AdventureSettlement(cog._character_cache, {}, cog.get_lock)
+        loaded = await settlement.preload(guild.members)
+        await running
+        return loaded, settlement.loads, await settlement.get(busy)
+
+
+def test_preload_waits_for_a_command_holding_the_lock():
+    (loaded, loads, c) = asyncio.run(preload_during_a_command())
+    assert loaded == loads == 5
+    assert c.exp == COMMAND_EXP
@@ -0,0 +1,19 @@
+import asyncio
+
+from adventure.simulator import simulate
+
+# Seeded run of the headless simulator and the ranges its report has to stay in.
+# Win rate is 40.7% and a run makes 46 Config and 11 Discord calls per adventure.
+RUN = {"adventures": 300, "members": 20, "party": 4, "gold": 5000, "seed": 7}
+WIN_RATE = (0.33, 0.48)
+MAX_CONFIG_CALLS = 50
+MAX_DISCORD_CALLS = 12.5
+
+
+def test_simulated_adventures_stay_within_bounds():
+    report = asyncio.run(simulate(**RUN))
+    assert report["errors"] == 0
+    assert report["completed"] == RUN["adventures"]
+    assert WIN_RATE[0] <= report["win_rate"] <= WIN_RATE[1]
+    assert report["config"]["per_adventure"] <= MAX_CONFIG_CALLS
+    assert report["discord"]["per_adventure"] <= MAX_DISCORD_CALLS
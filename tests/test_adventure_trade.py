@@ -0,0 +1,67 @@
+import asyncio
+
+from adventure import bank
+from adventure.simulator import SimulatedContext, simulation
+
+PRICE = 100
+
+
+async def trade(during_prompt, accept: bool = True):
+    """Offer an item from one member to another; ``during_prompt`` runs while the buyer decides."""
+    async with simulation(members=2, gold=1000) as (bot, cog, guild):
+        (seller, buyer) = guild.members
+        c = await cog.get_character(seller)
+        item = await cog._genitem("rare")
+        await c.add_to_backpack(item)
+        await cog.save_character(seller, c)
+
+        async def wait_for(event, check, timeout):
+            assert cog.get_lock(seller).locked()
+            assert not cog.get_lock(buyer).locked()
+            await during_prompt(cog, seller, buyer)
+            check.result = accept
+
+        bot.wait_for = wait_for
+        ctx = SimulatedContext(bot, seller)
+        await cog.backpack_trade.callback(cog, ctx, buyer, PRICE, item=item)
+        seller_sheet = await cog.get_character(seller)
+        buyer_sheet = await cog.get_character(buyer)
+        balances = (await bank.get_balance(seller), await bank.get_balance(buyer))
+        return item.name, seller_sheet, buyer_sheet, balances
+
+
+async def gain_exp(cog, seller, buyer):
+    async with cog.get_lock(buyer):
+        c = await cog.get_character(buyer)
+        c.exp += 500
+        await cog.save_character(buyer, c)
+
+
+async def spend_gold(cog, seller, buyer):
+    await bank.withdraw_credits(buyer, await bank.get_balance(buyer) - PRICE + 1)
+
+
+async def nothing(cog, seller, buyer):
+    pass
+
+
+def test_trade_keeps_changes_made_while_the_buyer_decides():
+    (name, seller, buyer, balances) = asyncio.run(trade(gain_exp))
+    assert name not in seller.backpack
+    assert buyer.backpack[name].owned == 1
+    assert buyer.exp == 500
+    assert balances == (1000 + PRICE, 1000 - PRICE)
+
+
+def test_trade_checks_the_balance_after_the_buyer_accepts():
+    (name, seller, buyer, balances) = asyncio.run(trade(spend_gold))
+    assert seller.backpack[name].owned == 1
+    assert name not in buyer.backpack
+    assert balances == (1000, PRICE - 1)
+
+
+def test_declined_trade_changes_nothing():
+    (name, seller, buyer, balances) = asyncio.run(trade(nothing, accept=False))
+    assert seller.backpack[name].owned == 1
+    assert name not in buyer.backpack
+    assert balances == (1000, 1000)